@@ -0,0 +1,144 @@
+"""
+Benchmark: concurrent read latency while a bulk writer is running
+File: benchmarks/bench_engine_profile.py
+
+Runs one writer thread that inserts HealthRecords in batches (like a
+smartwatch sync) while several reader threads run the dashboard query.
+Compares the legacy SQLite profile (rollback journal) with the default
+WAL profile used by init_database().
+
+Run: python benchmarks/bench_engine_profile.py [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database.engine import (  # noqa: E402
+    DEFAULT_ENGINE_PROFILE, LEGACY_ENGINE_PROFILE, create_sqlite_engine
+)
+from database.models import Base, User, HealthRecord  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_profile(name, profile, seconds, readers, batch_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        engine = create_sqlite_engine(url, profile)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            user = User(full_name="Bench User", email="bench@example.com")
+            db.add(user)
+            db.commit()
+            user_id = user.id
+
+        stop = threading.Event()
+        latencies = []
+        errors = []
+        written = [0]
+        lock = threading.Lock()
+        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0)
+
+        def writer():
+            ts = datetime.now() - timedelta(days=20)
+            while not stop.is_set():
+                rows = []
+                for _ in range(batch_size):
+                    ts += timedelta(seconds=60)
+                    rows.append({
+                        "user_id": user_id,
+                        "recorded_at": ts,
+                        "steps": 80,
+                        "heart_rate": 72,
+                    })
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(insert(HealthRecord), rows)
+                    written[0] += len(rows)
+                except Exception as e:
+                    errors.append(f"writer: {e}")
+
+        def reader():
+            local = []
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    with Session() as db:
+                        db.execute(
+                            select(HealthRecord)
+                            .where(HealthRecord.user_id == user_id)
+                            .order_by(HealthRecord.recorded_at.desc())
+                            .limit(1)
+                        ).first()
+                        db.execute(
+                            select(func.sum(HealthRecord.steps), func.count())
+                            .where(HealthRecord.user_id == user_id,
+                                   HealthRecord.recorded_at >= month_start)
+                        ).one()
+                    local.append((time.perf_counter() - start) * 1000.0)
+                except Exception as e:
+                    errors.append(f"reader: {e}")
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+
+    print(f"\n[{name}]")
+    print(f"   rows written     : {written[0]:,} ({written[0] / seconds:,.0f} rows/s)")
+    print(f"   reads completed  : {len(latencies):,}")
+    if latencies:
+        print(f"   read p50 / p95   : {statistics.median(latencies):.2f} ms / "
+              f"{percentile(latencies, 95):.2f} ms")
+        print(f"   read max         : {max(latencies):.2f} ms")
+    print(f"   errors           : {len(errors)}")
+    if errors:
+        print(f"   first error      : {errors[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SQLite engine profile benchmark")
+    print(f"{args.readers} readers, 1 writer, batch {args.batch_size}, {args.seconds}s each")
+    print("=" * 60)
+
+    run_profile("legacy (DELETE journal, synchronous=FULL)", LEGACY_ENGINE_PROFILE,
+                args.seconds, args.readers, args.batch_size)
+    run_profile("default (WAL, synchronous=NORMAL)", DEFAULT_ENGINE_PROFILE,
+                args.seconds, args.readers, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
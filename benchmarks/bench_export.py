@@ -0,0 +1,115 @@
+"""
+Benchmark: streaming export/import throughput and memory
+File: benchmarks/bench_export.py
+
+Fills a temporary database with per-minute device samples, then exports
+it in every format and imports each export into a fresh database. RSS is
+sampled after every chunk; with streaming it stays flat however many
+rows are exported (try --rows 10000000).
+
+Run: python benchmarks/bench_export.py [--rows 500000] [--chunk-rows 10000] [--no-import]
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database import connection  # noqa: E402
+from database.export import EXPORT_FORMATS, export_data, import_data  # noqa: E402
+from database.ingest import ingest_health_samples  # noqa: E402
+from database.models import User  # noqa: E402
+
+START = datetime(2024, 1, 1)
+FILL_BATCH = 100000
+
+
+def rss_mb():
+    """
+    Current anonymous RSS on Linux, peak RSS elsewhere
+
+    File-backed pages are left out: SQLite's mmap of the database file
+    counts towards RSS but is page cache the OS can drop, not heap.
+    """
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def fill(rows):
+    with connection.session_scope() as db:
+        user = User(full_name="Bench User", email="bench@example.com")
+        db.add(user)
+        db.flush()
+        user_id = user.id
+    for begin in range(0, rows, FILL_BATCH):
+        samples = [
+            {"timestamp": START + timedelta(minutes=i), "steps": i % 120,
+             "calories_burned": i % 7, "heart_rate": 55 + i % 60}
+            for i in range(begin, min(begin + FILL_BATCH, rows))
+        ]
+        ingest_health_samples(user_id, "bench-watch", samples, upsert=False)
+
+
+class RssSampler:
+    def __init__(self):
+        self.baseline = rss_mb()
+        self.peak = self.baseline
+
+    def __call__(self, table, rows):
+        self.peak = max(self.peak, rss_mb())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--chunk-rows", type=int, default=10000)
+    parser.add_argument("--formats", default=",".join(EXPORT_FORMATS))
+    parser.add_argument("--no-import", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = f"sqlite:///{tmp / 'source.db'}"
+        connection.init_database(source)
+        print(f"Filling {args.rows:,} health_records rows...")
+        fill(args.rows)
+
+        for fmt in args.formats.split(","):
+            connection.init_database(source)
+            sampler = RssSampler()
+            result = export_data(tmp / fmt, fmt, chunk_rows=args.chunk_rows, progress=sampler)
+            results.append((result, sampler))
+            connection.engine.dispose()
+
+            if not args.no_import:
+                connection.init_database(f"sqlite:///{tmp / f'import-{fmt}.db'}")
+                sampler = RssSampler()
+                result = import_data(tmp / fmt, chunk_rows=args.chunk_rows, progress=sampler)
+                results.append((result, sampler))
+                connection.engine.dispose()
+
+    print(f"\n{args.rows:,} rows, {args.chunk_rows:,} per chunk\n")
+    header = (f"{'run':<18}{'seconds':>10}{'rows/s':>12}{'MB':>10}{'MB/s':>8}"
+              f"{'RSS start':>12}{'RSS peak':>11}")
+    print(header)
+    print("-" * len(header))
+    for result, sampler in results:
+        print(f"{result.direction + ' ' + result.format:<18}{result.seconds:>10.1f}"
+              f"{result.rows_per_second:>12,.0f}{result.bytes / 1e6:>10.1f}"
+              f"{result.megabytes_per_second:>8.1f}{sampler.baseline:>11.0f}M{sampler.peak:>10.0f}M")
+
+
+if __name__ == "__main__":
+    main()
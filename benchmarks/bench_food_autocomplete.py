@@ -0,0 +1,72 @@
+"""
+Benchmark: type-ahead food autocomplete latency
+File: benchmarks/bench_food_autocomplete.py
+
+Builds a catalog of --foods synthetic foods (names made of words from
+the built-in foods, e.g. "Ayam Bakar Madu"), gives the user --used
+logged foods with random counts and dates, and times
+FoodAutocomplete.complete() for every prefix of a few typed queries,
+as the food dialogs do on each keystroke.
+
+Run: python benchmarks/bench_food_autocomplete.py [--foods 500000] [--used 500] [--limit 10]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.food_autocomplete import FoodAutocomplete, FoodUsage  # noqa: E402
+from database.food_catalog import FoodCatalog  # noqa: E402
+from food_benchmarks import synthetic_foods  # noqa: E402
+
+QUERIES = ["nasi goreng", "goreng", "a", "ayam", "greek yog", "zzz"]
+REPEAT = 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=500000)
+    parser.add_argument("--used", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    catalog = FoodCatalog(synthetic_foods(args.foods, rng))
+
+    started = time.perf_counter()
+    autocomplete = FoodAutocomplete(catalog)
+    print(f"Indexed {len(catalog):,} foods in {time.perf_counter() - started:.1f}s")
+
+    now = datetime(2026, 10, 17)
+    usage = FoodUsage(catalog)
+    foods = list(catalog)
+    for food in rng.sample(foods, args.used):
+        usage.record(food.name, now - timedelta(days=rng.uniform(0, 365)), rng.randint(1, 40))
+
+    print(f"\nµs per keystroke over the prefixes of each query, top {args.limit}, "
+          f"{len(usage)} foods in the user's log\n")
+    header = f"{'query':<14}{'median':>10}{'p95':>10}{'max':>10}  top suggestion"
+    print(header)
+    print("-" * (len(header) + 10))
+    for query in QUERIES:
+        timings = []
+        for length in range(1, len(query) + 1):
+            prefix = query[:length]
+            for _ in range(REPEAT):
+                t0 = time.perf_counter()
+                suggestions = autocomplete.complete(prefix, args.limit, usage, now)
+                timings.append((time.perf_counter() - t0) * 1e6)
+        timings.sort()
+        top = suggestions[0].name if suggestions else "-"
+        print(f"{query:<14}{statistics.median(timings):>10.1f}"
+              f"{timings[int(len(timings) * 0.95) - 1]:>10.1f}{timings[-1]:>10.1f}  {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: memory-mapped catalog file vs the in-memory FoodCatalog
+File: benchmarks/bench_food_catalog_file.py
+
+Builds --foods synthetic foods (names made of words from the built-in
+foods), compiles them to a catalog file, then compares, each in a fresh
+process: the time to get a usable catalog (FoodCatalog built from the
+foods vs MappedFoodCatalog opening the file), the latency of get(),
+search() and autocomplete on both, and the memory each process ends up
+with, private vs file pages shared with other processes.
+
+Run: python benchmarks/bench_food_catalog_file.py [--foods 500000]
+"""
+
+import argparse
+import json
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.food_autocomplete import FoodAutocomplete  # noqa: E402
+from database.food_catalog import FoodCatalog  # noqa: E402
+from database.food_catalog_file import MappedFoodCatalog, compile_catalog  # noqa: E402
+from food_benchmarks import synthetic_foods  # noqa: E402
+
+QUERIES = ["nasi goreng", "ayam", "greek yog", "zzz"]
+REPEAT = 200
+
+
+def rss_mb():
+    """
+    (private, file-backed) RSS on Linux; (peak RSS, 0) elsewhere
+
+    Mapped catalog pages are file-backed: page cache shared by every
+    process that maps the file, which the OS can drop again.
+    """
+    rss = {}
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith(("RssAnon:", "RssFile:")):
+                    rss[line.split(":")[0]] = int(line.split()[1]) / 1e3
+        return rss["RssAnon"], rss["RssFile"]
+    except (OSError, KeyError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return (peak / 1e6 if sys.platform == "darwin" else peak / 1e3), 0.0
+
+
+def median_us(func, args):
+    timings = []
+    for arg in args:
+        for _ in range(REPEAT // len(args)):
+            t0 = time.perf_counter()
+            func(arg)
+            timings.append((time.perf_counter() - t0) * 1e6)
+    return statistics.median(timings)
+
+
+def measure(kind, path, foods):
+    """Runs in a child process: load one kind of catalog, print JSON results"""
+    ids = [f"food_{i}" for i in random.Random(1).sample(range(foods - 100), 20)]
+    before_private, before_shared = rss_mb()
+    started = time.perf_counter()
+    if kind == "mapped":
+        catalog = MappedFoodCatalog(path)
+    else:
+        # Without the file every food is a Python object plus its indexes;
+        # decoding them from the file stands in for loading them from source
+        records = list(MappedFoodCatalog(path))
+        started = time.perf_counter()
+        catalog = FoodCatalog(records)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    autocomplete = FoodAutocomplete(catalog)
+    autocomplete_seconds = time.perf_counter() - started
+
+    results = {
+        "load_ms": load_seconds * 1000,
+        "autocomplete_ms": autocomplete_seconds * 1000,
+        "get_us": median_us(catalog.get, ids),
+        "search_us": median_us(lambda q: catalog.search(q, 10), QUERIES),
+        "complete_us": median_us(lambda q: autocomplete.complete(q, 10), QUERIES),
+    }
+    private, shared = rss_mb()
+    results["private_mb"] = private - before_private
+    results["shared_mb"] = shared - before_shared
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=500000)
+    parser.add_argument("--measure", choices=("dict", "mapped"), help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.path, args.foods)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "food_catalog.bin"
+        foods = synthetic_foods(args.foods, random.Random(42))
+        started = time.perf_counter()
+        compile_catalog(foods, path)
+        print(f"Compiled {len(foods):,} foods to {path.stat().st_size / 1e6:.1f} MB "
+              f"in {time.perf_counter() - started:.1f}s")
+        del foods
+
+        results = {}
+        for kind in ("dict", "mapped"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--foods", str(args.foods),
+                 "--measure", kind, "--path", str(path)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results[kind] = json.loads(output.splitlines()[-1])
+
+    rows = [
+        ("catalog ready (ms)", "load_ms", ".1f"),
+        ("autocomplete ready (ms)", "autocomplete_ms", ".1f"),
+        ("get() (µs)", "get_us", ".1f"),
+        ("search() top 10 (µs)", "search_us", ".1f"),
+        ("complete() top 10 (µs)", "complete_us", ".1f"),
+        ("private memory (MB)", "private_mb", ".0f"),
+        ("shared file pages (MB)", "shared_mb", ".0f"),
+    ]
+    header = f"{'':<26}{'FoodCatalog':>14}{'mapped file':>14}"
+    print(f"\n{header}")
+    print("-" * len(header))
+    for label, key, fmt in rows:
+        print(f"{label:<26}{results['dict'][key]:>14{fmt}}{results['mapped'][key]:>14{fmt}}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: fuzzy, bilingual food search latency
+File: benchmarks/bench_food_fuzzy.py
+
+Builds a catalog of --foods synthetic foods whose names mix words of the
+built-in foods with --vocabulary made-up words (a large catalog has a
+large vocabulary, which is what the trigram lookup scales with), then
+times FuzzyFoodIndex.search() for misspelt and English/Indonesian
+queries.
+
+Run: python benchmarks/bench_food_fuzzy.py [--foods 200000] [--vocabulary 20000] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.food_catalog import FoodCatalog  # noqa: E402
+from database.food_fuzzy import FuzzyFoodIndex  # noqa: E402
+from food_benchmarks import synthetic_foods  # noqa: E402
+
+QUERIES = ["rendag", "sate ayam", "satay", "nasi goremg", "chicken", "telur", "fried rice", "qwxz"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=200000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = FoodCatalog(synthetic_foods(args.foods, random.Random(42), args.vocabulary))
+    started = time.perf_counter()
+    index = FuzzyFoodIndex(catalog)
+    print(f"Indexed {len(catalog):,} foods ({len(index._vocabulary):,} distinct words) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    header = f"{'query':<14}{'median ms':>11}{'p95 ms':>9}  top matches"
+    print(f"\n{header}")
+    print("-" * (len(header) + 40))
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            matches = index.search(query, args.limit)
+            timings.append((time.perf_counter() - t0) * 1000)
+        timings.sort()
+        top = ", ".join(f"{m.food.name} ({m.score:.2f})" for m in matches[:2]) or "-"
+        print(f"{query:<14}{statistics.median(timings):>11.2f}"
+              f"{timings[int(len(timings) * 0.95) - 1]:>9.2f}  {top}")
+
+
+if __name__ == "__main__":
+    main()
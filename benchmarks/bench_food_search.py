@@ -0,0 +1,91 @@
+"""
+Benchmark: per-keystroke food search cost
+File: benchmarks/bench_food_search.py
+
+Types each query one character at a time and times the search for every
+prefix, as an as-you-type search box would. The old lookup (copy the
+food list, lowercase every name, substring test) is timed next to
+FoodCatalog.search() over the same foods, both for all matches and for
+the first --limit matches as dicts (what a suggestion list shows).
+--foods grows the catalog with numbered copies of the built-in foods to
+see how both scale.
+
+Run: python benchmarks/bench_food_search.py [--foods 50000] [--limit 20] [--repeat 20]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.food_catalog import FoodCatalog, get_catalog  # noqa: E402
+
+QUERIES = ["nasi goreng", "ayam", "greek yogurt", "jus", "zzz"]
+
+
+def scaled_foods(count):
+    base = list(get_catalog())
+    foods = list(base)
+    copy = 1
+    while len(foods) < count:
+        for food in base[:count - len(foods)]:
+            foods.append(replace(food, id=f"{food.id}_{copy}", name=f"{food.name} {copy}"))
+        copy += 1
+    return foods
+
+
+def legacy_search(food_dicts, query):
+    """The old search_food(): rebuild a copied list and lowercase every name"""
+    query = query.lower()
+    return [{"id": food_id, **food} for food_id, food in food_dicts.items()
+            if query in food["name"].lower()]
+
+
+def per_keystroke_us(search, query, repeat):
+    timings = []
+    for length in range(1, len(query) + 1):
+        prefix = query[:length]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            search(prefix)
+        timings.append((time.perf_counter() - started) / repeat * 1e6)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=len(get_catalog()))
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    foods = scaled_foods(args.foods)
+    food_dicts = {food.id: food.to_dict() for food in foods}
+
+    started = time.perf_counter()
+    catalog = FoodCatalog(foods)
+    print(f"Built catalog of {len(catalog):,} foods in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    print("\nMicroseconds per keystroke (median / max over the prefixes of each query)\n")
+    header = (f"{'query':<14}{'hits':>7}{'old search_food':>20}{'catalog.search':>20}"
+              f"{f'catalog top {args.limit}':>20}")
+    print(header)
+    print("-" * len(header))
+    for query in QUERIES:
+        runs = [
+            per_keystroke_us(lambda q: legacy_search(food_dicts, q), query, args.repeat),
+            per_keystroke_us(catalog.search, query, args.repeat),
+            per_keystroke_us(lambda q: [food.to_dict() for food in catalog.search(q, args.limit)],
+                             query, args.repeat),
+        ]
+        hits = len(catalog.search(query))
+        print(f"{query:<14}{hits:>7}" + "".join(
+            f"{f'{statistics.median(run):,.1f} / {max(run):,.1f}':>20}" for run in runs))
+
+
+if __name__ == "__main__":
+    main()
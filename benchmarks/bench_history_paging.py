@@ -0,0 +1,94 @@
+"""
+Benchmark: history paging, OFFSET vs keyset
+File: benchmarks/bench_history_paging.py
+
+Fills years of per-minute activity logs for one user and times fetching
+a page near the start, middle and end of the history with LIMIT/OFFSET
+and with HistoryRepository.fetch_page() (keyset on (timestamp, id)).
+
+Run: python benchmarks/bench_history_paging.py [--rows 1000000] [--page-size 50]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import select  # noqa: E402
+
+from database import connection  # noqa: E402
+from database.history_repository import HistoryRepository, PageCursor  # noqa: E402
+from database.ingest import ingest_activity_samples  # noqa: E402
+from database.models import ActivityLog  # noqa: E402
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    start = datetime(2020, 1, 1)
+    samples = (
+        {
+            "timestamp": start + timedelta(minutes=i),
+            "activity_type": "walking",
+            "duration_minutes": 1,
+            "steps": i % 120,
+        }
+        for i in range(args.rows)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.init_database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        repo = HistoryRepository()
+        ingest_activity_samples(repo.user_id, "bench-watch", samples)
+
+        columns = ActivityLog.__table__.columns
+        base = (
+            select(*columns)
+            .where(ActivityLog.user_id == repo.user_id)
+            .order_by(ActivityLog.activity_date.desc(), ActivityLog.id.desc())
+            .limit(args.page_size)
+        )
+
+        print(f"\n{'page':>10}{'OFFSET ms':>12}{'keyset ms':>12}")
+        print("-" * 34)
+        for page_number in (1, args.rows // args.page_size // 2, args.rows // args.page_size - 1):
+            offset = (page_number - 1) * args.page_size
+
+            def by_offset():
+                with connection.engine.connect() as conn:
+                    conn.execute(base.offset(offset)).all()
+
+            # Cursor of the row just before this page, as the UI would hold it
+            cursor = None
+            if offset:
+                with connection.engine.connect() as conn:
+                    row = conn.execute(base.offset(offset - 1).limit(1)).one()
+                cursor = PageCursor(row.activity_date, row.id)
+
+            offset_ms = best_of(by_offset)
+            keyset_ms = best_of(lambda: repo.fetch_page("activity", cursor, args.page_size))
+            print(f"{page_number:>10,}{offset_ms:>12.2f}{keyset_ms:>12.2f}")
+
+        repo.close()
+        connection.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
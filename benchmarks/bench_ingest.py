@@ -0,0 +1,65 @@
+"""
+Benchmark: bulk device sample ingestion
+File: benchmarks/bench_ingest.py
+
+Ingests N per-minute smartwatch samples into health_records through
+database.ingest, then re-ingests the same window to measure the
+idempotent upsert path. Target: >= 50k rows/s on a laptop-class CPU.
+
+Run: python benchmarks/bench_ingest.py [--samples 200000]
+"""
+
+import argparse
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database import connection  # noqa: E402
+from database.ingest import ingest_health_samples  # noqa: E402
+from database.models import User  # noqa: E402
+
+
+def make_samples(count):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "timestamp": start + timedelta(minutes=i),
+            "steps": i % 150,
+            "heart_rate": 55 + i % 60,
+            "calories_burned": i % 9,
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=200000)
+    args = parser.parse_args()
+
+    samples = make_samples(args.samples)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.init_database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        with connection.session_scope() as db:
+            user = User(full_name="Bench User", email="bench@example.com")
+            db.add(user)
+            db.flush()
+            user_id = user.id
+
+        first = ingest_health_samples(user_id, "bench-watch", samples)
+        again = ingest_health_samples(user_id, "bench-watch", samples)
+        connection.engine.dispose()
+
+    print(f"\n{'pass':<22}{'rows':>12}{'seconds':>10}{'rows/s':>12}")
+    print("-" * 56)
+    for name, result in (("initial insert", first), ("re-sync (upsert)", again)):
+        print(f"{name:<22}{result.written:>12,}{result.seconds:>10.2f}"
+              f"{result.rows_per_second:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: full-text search over logged history
+File: benchmarks/bench_log_search.py
+
+Logs N meals (names and descriptions drawn from the food database) plus
+health notes through the FTS5 sync triggers, then times
+database.search.search_logs() for common, rare and prefix queries.
+
+Run: python benchmarks/bench_log_search.py [--rows 1000000] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import insert  # noqa: E402
+
+from database import connection  # noqa: E402
+from database.food_data import get_all_foods  # noqa: E402
+from database.models import User, NutritionLog, HealthRecord  # noqa: E402
+from database.search import search_logs  # noqa: E402
+
+DESCRIPTIONS = [
+    "home cooked", "from the canteen", "extra spicy", "with sambal",
+    "shared with friends", "late night", "after gym", "leftovers",
+]
+NOTES = [
+    "slight headache in the afternoon", "felt great", "sore legs",
+    "pusing setelah makan siang", "tidur kurang nyenyak", "stress at work",
+    "fasting day", "kopi terlalu banyak",
+]
+QUERIES = ["rendang", "nasi goreng", "headache", "sambal", "ayam", "kop", "zzzz"]
+BATCH = 50000
+
+
+def seed(user_id, rows):
+    rng = random.Random(42)
+    foods = [food["name"] for food in get_all_foods()]
+    start = datetime(2020, 1, 1)
+
+    with connection.engine.begin() as conn:
+        for offset in range(0, rows, BATCH):
+            count = min(BATCH, rows - offset)
+            meals = [
+                {
+                    "user_id": user_id,
+                    "logged_at": start + timedelta(minutes=3 * (offset + i)),
+                    "meal_type": "lunch",
+                    "food_name": rng.choice(foods),
+                    "food_description": rng.choice(DESCRIPTIONS),
+                    "calories": 300,
+                }
+                for i in range(count)
+            ]
+            conn.execute(insert(NutritionLog), meals)
+            notes = [
+                {
+                    "user_id": user_id,
+                    "recorded_at": start + timedelta(minutes=3 * (offset + i)),
+                    "notes": rng.choice(NOTES),
+                }
+                for i in range(0, count, 10)
+            ]
+            conn.execute(insert(HealthRecord), notes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.init_database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        with connection.session_scope() as db:
+            user = User(full_name="Bench User", email="bench@example.com")
+            db.add(user)
+            db.flush()
+            user_id = user.id
+
+        started = time.perf_counter()
+        seed(user_id, args.rows)
+        print(f"Seeded {args.rows:,} meals (+{args.rows // 10:,} notes) "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        print(f"\n{'query':<14}{'hits':>6}{'median ms':>12}{'p95 ms':>10}")
+        print("-" * 42)
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                hits = search_logs(query, user_id=user_id, limit=20)
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{query:<14}{len(hits):>6}{statistics.median(timings):>12.2f}{p95:>10.2f}")
+
+        connection.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
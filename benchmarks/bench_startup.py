@@ -0,0 +1,89 @@
+"""
+Benchmark: import cost of the food modules
+File: benchmarks/bench_startup.py
+
+Imports each module in a fresh interpreter under `python -X importtime`
+and reports its cumulative import time (median of --repeat runs), the
+modules that weigh most in it, and what the first use then costs:
+building the quick access lists, the catalog and the fuzzy index.
+
+Run: python benchmarks/bench_startup.py [--repeat 7] [--top 5]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+MODULES = ["database.food_data", "data.food_database", "database.food_autocomplete"]
+
+# (label, setup, timed statement) run after importing database.food_data
+FIRST_USE = [
+    ("INDONESIAN_FOODS", "", "database.food_data.INDONESIAN_FOODS"),
+    ("all 8 quick access lists", "",
+     "[getattr(database.food_data, name) for name in database.food_data._QUICK_ACCESS]"),
+    ("search_food('nasi')", "", "database.food_data.search_food('nasi')"),
+    ("search_food_fuzzy('rendag')", "database.food_data.search_food('nasi')",
+     "database.food_data.search_food_fuzzy('rendag')"),
+]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_times(module):
+    """{module: (self µs, cumulative µs)} of one fresh `import module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=str(SRC)),
+    )
+    times = {}
+    for match in _LINE.finditer(result.stderr):
+        times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def first_use_ms(setup, statement):
+    code = (
+        "import time, database.food_data\n"
+        f"{setup}\n"
+        "t0 = time.perf_counter()\n"
+        f"{statement}\n"
+        "print((time.perf_counter() - t0) * 1000)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                            text=True, env=dict(os.environ, PYTHONPATH=str(SRC)))
+    return float(result.stdout.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports shown per module")
+    args = parser.parse_args()
+
+    for module in MODULES:
+        import_times(module)  # compile .pyc files outside the timed runs
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total = statistics.median(run[module][1] for run in runs) / 1000
+        print(f"\nimport {module}: {total:.1f} ms (median of {args.repeat})")
+
+        # Heaviest modules by self time, from the median run
+        run = sorted(runs, key=lambda r: r[module][1])[len(runs) // 2]
+        heaviest = sorted(run.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, cumulative_us) in heaviest[:args.top]:
+            print(f"  {name:<40}{self_us / 1000:>8.1f} ms self{cumulative_us / 1000:>8.1f} ms total")
+
+    print(f"\nFirst use after `import database.food_data` (median of {args.repeat})")
+    for label, setup, statement in FIRST_USE:
+        timings = [first_use_ms(setup, statement) for _ in range(args.repeat)]
+        print(f"  {label:<40}{statistics.median(timings):>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: per-call overhead of the hot dashboard/history queries
+File: benchmarks/bench_statement_cache.py
+
+Compares building the statement on every call (how the repository
+functions used to work) with the pre-built statements they use now, on a
+small database so Python-side overhead dominates the SQLite work.
+
+Run: python benchmarks/bench_statement_cache.py [--calls 2000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import func, insert, select, tuple_  # noqa: E402
+
+from database import connection  # noqa: E402
+from database.history_repository import HistoryRepository  # noqa: E402
+from database.models import DailySummary, HealthRecord, NutritionLog, User  # noqa: E402
+from database.rollups import get_daily_summaries  # noqa: E402
+from database.stats import _aggregate_columns, get_period_stats  # noqa: E402
+
+METRICS = ('steps', 'calories_burned', 'heart_rate')
+
+
+# Per-call statement construction, as before the pre-built statements ----
+
+def inline_daily_summaries(user_id, start_date, end_date):
+    with connection.session_scope() as db:
+        return db.query(DailySummary).filter(
+            DailySummary.user_id == user_id,
+            DailySummary.local_date >= start_date,
+            DailySummary.local_date <= end_date
+        ).order_by(DailySummary.local_date).all()
+
+
+def inline_period_stats(user_id, start, end):
+    stmt = select(*_aggregate_columns(METRICS)).where(
+        HealthRecord.user_id == user_id,
+        HealthRecord.recorded_at >= start,
+        HealthRecord.recorded_at < end
+    )
+    with connection.session_scope() as db:
+        return db.execute(stmt).one()
+
+
+def inline_user_stats(user_id, month_start):
+    with connection.session_scope() as db:
+        user = db.query(User).filter_by(id=user_id).first()
+        latest = db.query(HealthRecord).filter_by(user_id=user_id).order_by(
+            HealthRecord.recorded_at.desc()
+        ).first()
+        totals = db.query(
+            func.coalesce(func.sum(HealthRecord.steps), 0),
+            func.count(HealthRecord.id)
+        ).filter(
+            HealthRecord.user_id == user_id,
+            HealthRecord.recorded_at >= month_start
+        ).one()
+        return user, latest, totals
+
+
+def inline_history_page(conn, user_id, cursor, page_size=50):
+    table = NutritionLog.__table__
+    stmt = select(*table.columns).where(NutritionLog.user_id == user_id)
+    stmt = stmt.where(tuple_(NutritionLog.logged_at, NutritionLog.id)
+                      < tuple_(cursor.timestamp, cursor.id))
+    stmt = stmt.order_by(NutritionLog.logged_at.desc(), NutritionLog.id.desc()).limit(page_size + 1)
+    with conn.begin():
+        return conn.execute(stmt).all()
+
+
+def seed(days):
+    with connection.session_scope() as db:
+        user = User(full_name="Bench User", email="bench@example.com")
+        db.add(user)
+        db.flush()
+        user_id = user.id
+
+    start = datetime(2024, 1, 1)
+    health, meals = [], []
+    for hour in range(days * 24):
+        ts = start + timedelta(hours=hour)
+        health.append({"user_id": user_id, "recorded_at": ts,
+                       "steps": hour % 900, "calories_burned": hour % 40,
+                       "heart_rate": 60 + hour % 40})
+        if hour % 6 == 0:
+            meals.append({"user_id": user_id, "logged_at": ts, "food_name": "Nasi Goreng",
+                          "meal_type": "Lunch", "calories": 450})
+    with connection.engine.begin() as conn:
+        conn.execute(insert(HealthRecord), health)
+        conn.execute(insert(NutritionLog), meals)
+    return user_id, start
+
+
+def per_call_us(fn, calls):
+    fn()  # warm the compiled cache
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.init_database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        user_id, start = seed(args.days)
+        week = (date(2024, 1, 1), date(2024, 1, 7))
+        day = (start, start + timedelta(days=1))
+        history = HistoryRepository(user_id)
+        cursor = history.fetch_page('nutrition', page_size=5).next_cursor
+
+        cases = [
+            ("weekly summaries (rollups)",
+             lambda: inline_daily_summaries(user_id, *week),
+             lambda: get_daily_summaries(user_id, *week)),
+            ("today's totals (period stats)",
+             lambda: inline_period_stats(user_id, *day),
+             lambda: get_period_stats(user_id, METRICS, start=day[0], end=day[1])),
+            ("user stats card",
+             lambda: inline_user_stats(user_id, start),
+             lambda: connection.get_user_stats(user_id)),
+            ("history next page",
+             lambda: inline_history_page(history._conn, user_id, cursor),
+             lambda: history.fetch_page('nutrition', cursor)),
+        ]
+
+        print(f"\n{args.calls:,} calls each, microseconds per call\n")
+        print(f"{'query':<32}{'per-call build':>16}{'pre-built':>12}{'speed-up':>10}")
+        print("-" * 70)
+        for name, inline, cached in cases:
+            inline_us = per_call_us(inline, args.calls)
+            cached_us = per_call_us(cached, args.calls)
+            print(f"{name:<32}{inline_us:>16.1f}{cached_us:>12.1f}{inline_us / cached_us:>9.1f}x")
+
+        history.close()
+        connection.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: 1 Hz heart rate in health_records vs the sample chunk store
+File: benchmarks/bench_timeseries.py
+
+Writes a month of per-second heart rate for one user twice - as one
+health_records row per sample through database.ingest, and as hourly
+delta-encoded chunks through database.timeseries - each into its own
+database, then compares file size, write time and range-read latency
+(returning NumPy arrays in both cases).
+
+Run: python benchmarks/bench_timeseries.py [--days 30] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database import connection  # noqa: E402
+from database.ingest import ingest_health_samples  # noqa: E402
+from database.models import User  # noqa: E402
+from database.timeseries import append_samples, read_samples  # noqa: E402
+
+START = datetime(2024, 5, 1)
+
+
+def make_heart_rate(days, seed=7):
+    """Bounded random walk around a daily rhythm, one sample per second"""
+    rng = np.random.default_rng(seed)
+    seconds = days * 86400
+    timestamps = np.datetime64(START, 's') + np.arange(seconds)
+    rhythm = 68 + 12 * np.sin(np.arange(seconds) * 2 * np.pi / 86400)
+    noise = np.cumsum(rng.integers(-1, 2, seconds)) % 9
+    return timestamps, (rhythm + noise).astype(np.int64)
+
+
+def create_user():
+    with connection.session_scope() as db:
+        user = User(full_name="Bench User", email="bench@example.com")
+        db.add(user)
+        db.flush()
+        return user.id
+
+
+def read_table(user_id, metric, start, end):
+    """health_records range as (datetime64[s], int64) arrays, like read_samples()"""
+    with connection.engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            f"SELECT recorded_at, {metric} FROM health_records "
+            "WHERE user_id = ? AND recorded_at >= ? AND recorded_at < ? ORDER BY recorded_at",
+            (user_id, str(start), str(end))
+        ).all()
+    if not rows:
+        return np.empty(0, dtype='datetime64[s]'), np.empty(0, dtype=np.int64)
+    stamps, values = zip(*rows)
+    return np.array(stamps, dtype='datetime64[s]'), np.array(values, dtype=np.int64)
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def load(path, store, timestamps, values):
+    connection.init_database(f"sqlite:///{path}")
+    user_id = create_user()
+    empty_size = path.stat().st_size
+    started = time.perf_counter()
+    if store == "table":
+        samples = [{"timestamp": ts, "heart_rate": int(hr)}
+                   for ts, hr in zip(timestamps.astype(datetime), values)]
+        ingest_health_samples(user_id, "bench-watch", samples, upsert=False)
+    else:
+        # Hourly calls, like a watch syncing its buffer
+        for begin in range(0, len(timestamps), 3600):
+            append_samples(user_id, "heart_rate", timestamps[begin:begin + 3600],
+                           values[begin:begin + 3600])
+    seconds = time.perf_counter() - started
+    with connection.engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    return user_id, seconds, path.stat().st_size - empty_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    timestamps, values = make_heart_rate(args.days)
+    ranges = [
+        ("1 hour", START + timedelta(days=args.days // 2), timedelta(hours=1)),
+        ("1 day", START + timedelta(days=args.days // 2), timedelta(days=1)),
+        (f"{args.days} days", START, timedelta(days=args.days)),
+    ]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for store, reader in (("table", read_table), ("chunks", read_samples)):
+            user_id, seconds, size = load(Path(tmp) / f"{store}.db", store, timestamps, values)
+            reads = []
+            for _, start, length in ranges:
+                query = (user_id, "heart_rate", start, start + length)
+                ts, vs = reader(*query)
+                assert len(ts) == int(length.total_seconds()), (store, len(ts))
+                assert (vs == values[(ts - timestamps[0]).astype(np.int64)]).all()
+                reads.append(median_ms(lambda: reader(*query), args.repeat))
+            results[store] = (seconds, size, reads)
+            connection.engine.dispose()
+
+    print(f"\n{len(timestamps):,} samples ({args.days} days at 1 Hz)\n")
+    header = f"{'store':<16}{'write s':>10}{'size MB':>10}{'bytes/sample':>14}"
+    header += "".join(f"{name + ' ms':>14}" for name, _, _ in ranges)
+    print(header)
+    print("-" * len(header))
+    for store, (seconds, size, reads) in results.items():
+        line = f"{store:<16}{seconds:>10.1f}{size / 1e6:>10.1f}{size / len(timestamps):>14.2f}"
+        line += "".join(f"{ms:>14.2f}" for ms in reads)
+        print(line)
+
+    table, chunks = results["table"], results["chunks"]
+    print(f"\nChunks: {table[1] / chunks[1]:.0f}x smaller, "
+          f"{table[2][-1] / chunks[2][-1]:.0f}x faster full-range read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: monthly stats, ORM row loading vs SQL-side aggregation
+File: benchmarks/bench_user_stats.py
+
+Fills a month of per-minute HealthRecords and compares the original
+get_user_stats() approach (load every row, sum in Python) with the
+current get_user_stats() and database.stats.get_period_stats().
+
+Run: python benchmarks/bench_user_stats.py [--days 30] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import insert  # noqa: E402
+
+from database import connection  # noqa: E402
+from database.models import User, HealthRecord  # noqa: E402
+from database.stats import get_period_stats  # noqa: E402
+
+
+def legacy_user_stats(user_id):
+    """get_user_stats() as it was before the SQL aggregation rewrite"""
+    db = connection.get_db()
+    try:
+        user = db.query(User).filter_by(id=user_id).first()
+        latest_health = db.query(HealthRecord).filter_by(user_id=user_id).order_by(
+            HealthRecord.recorded_at.desc()
+        ).first()
+        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0)
+        monthly_records = db.query(HealthRecord).filter(
+            HealthRecord.user_id == user_id,
+            HealthRecord.recorded_at >= month_start
+        ).all()
+        return {
+            'user': user,
+            'latest_health': latest_health,
+            'monthly_steps': sum(record.steps for record in monthly_records),
+            'monthly_records_count': len(monthly_records)
+        }
+    finally:
+        db.close()
+
+
+def seed(days):
+    with connection.session_scope() as db:
+        user = User(full_name="Bench User", email="bench@example.com")
+        db.add(user)
+        db.flush()
+        user_id = user.id
+
+    month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    rows = []
+    for minute in range(days * 24 * 60):
+        rows.append({
+            "user_id": user_id,
+            "recorded_at": month_start + timedelta(minutes=minute + 1),
+            "steps": minute % 120,
+            "calories_burned": minute % 7,
+            "heart_rate": 60 + minute % 40,
+        })
+    with connection.engine.begin() as conn:
+        conn.execute(insert(HealthRecord), rows)
+    return user_id, len(rows)
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.init_database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        user_id, count = seed(args.days)
+        print(f"\nSeeded {count:,} per-minute health records\n")
+
+        legacy_ms, legacy = timed(lambda: legacy_user_stats(user_id), args.repeat)
+        current_ms, current = timed(lambda: connection.get_user_stats(user_id), args.repeat)
+        multi_ms, multi = timed(
+            lambda: get_period_stats(
+                user_id, ('steps', 'calories_burned', 'heart_rate'), period='month'
+            ),
+            args.repeat
+        )
+        connection.engine.dispose()
+
+    assert legacy['monthly_steps'] == current['monthly_steps']
+    assert legacy['monthly_records_count'] == current['monthly_records_count']
+
+    print(f"{'implementation':<44}{'median ms':>12}")
+    print("-" * 56)
+    print(f"{'legacy get_user_stats (ORM rows + Python sum)':<44}{legacy_ms:>12.2f}")
+    print(f"{'get_user_stats (SQL SUM/COUNT)':<44}{current_ms:>12.2f}")
+    print(f"{'get_period_stats (3 metrics, 5 aggregates)':<44}{multi_ms:>12.2f}")
+    print(f"\nSpeed-up: {legacy_ms / current_ms:.1f}x "
+          f"(monthly steps {current['monthly_steps']:,}, "
+          f"avg HR {multi['heart_rate'].average:.1f})")
+
+
+if __name__ == "__main__":
+    main()
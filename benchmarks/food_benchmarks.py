@@ -0,0 +1,34 @@
+"""
+Shared helpers for the food catalog benchmarks
+File: benchmarks/food_benchmarks.py
+
+Imported by the bench_food_*.py scripts, which run with this directory
+on sys.path.
+"""
+
+from dataclasses import replace
+
+from database.food_catalog import get_catalog
+
+SYLLABLES = ["ba", "ka", "la", "ma", "na", "pa", "ra", "sa", "ta", "ke", "li", "mo", "ng", "ri", "su", "to"]
+
+
+def synthetic_foods(count, rng, vocabulary=0):
+    """
+    The built-in foods plus synthetic ones, count in total
+
+    Names are 2-4 words of the built-in food names (e.g. "Ayam Bakar
+    Madu"), mixed with up to vocabulary made-up words when given. The
+    other fields are copied from a random built-in food.
+    """
+    base = list(get_catalog())
+    words = sorted({word for food in base for word in food.name.split() if word.isalpha()})
+    if vocabulary:
+        made_up = {"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+                   for _ in range(vocabulary)}
+        words += sorted(made_up)
+    foods = list(base)
+    for i in range(count - len(base)):
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(2, 4)))
+        foods.append(replace(rng.choice(base), id=f"food_{i}", name=name))
+    return foods
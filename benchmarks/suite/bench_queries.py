@@ -0,0 +1,90 @@
+"""
+Database benchmark suite
+File: benchmarks/suite/bench_queries.py
+
+pytest-benchmark timings of the repository and query functions the pages
+use, against synthetic data at 1, 10 and 100 user-years (see conftest).
+
+Run:     pytest benchmarks/suite [--user-years 1,10]
+Compare: pytest benchmarks/suite --benchmark-compare --benchmark-compare-fail=median:25%
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.connection import get_user_stats
+from database.health_repository import HealthRepository
+from database.history_repository import HistoryRepository, PageCursor
+from database.rollups import get_daily_summaries, get_daily_summary
+from database.search import search_logs
+from database.stats import get_bucketed_stats, get_period_stats
+
+
+@pytest.fixture
+def history(dataset):
+    repository = HistoryRepository(dataset.user_id)
+    yield repository
+    repository.close()
+
+
+def test_dashboard_load(benchmark, dataset):
+    """Today's rollup, today's vitals aggregates and the user summary card"""
+
+    def load():
+        get_daily_summary(dataset.user_id, dataset.last_day)
+        get_period_stats(dataset.user_id, ('steps', 'calories_burned', 'heart_rate'),
+                         period='day', reference=dataset.now)
+        get_user_stats(dataset.user_id)
+
+    benchmark(load)
+
+
+def test_weekly_chart_rollup(benchmark, dataset):
+    start = dataset.last_day - timedelta(days=6)
+    rows = benchmark(get_daily_summaries, dataset.user_id, start, dataset.last_day)
+    assert len(rows) == 7
+
+
+def test_weekly_chart_raw(benchmark, dataset):
+    end = datetime.combine(dataset.last_day, datetime.min.time()) + timedelta(days=1)
+    buckets = benchmark(get_bucketed_stats, dataset.user_id, end - timedelta(days=7), end,
+                        ('steps', 'heart_rate'), 'day')
+    assert len(buckets) == 7
+
+
+def test_monthly_stats(benchmark, dataset):
+    stats = benchmark(get_period_stats, dataset.user_id,
+                      ('steps', 'calories_burned', 'distance_km', 'heart_rate'),
+                      'month', reference=dataset.now)
+    assert stats.record_count > 0
+
+
+@pytest.mark.parametrize("kind", ["health", "nutrition", "activity", "sleep"])
+def test_history_first_page(benchmark, history, kind):
+    page = benchmark(history.fetch_page, kind)
+    assert page.rows
+
+
+@pytest.mark.parametrize("kind", ["health", "nutrition", "activity", "sleep"])
+def test_history_deep_page(benchmark, dataset, history, kind):
+    """A page from the middle of the user's history"""
+    middle = dataset.now - timedelta(days=365 * dataset.years / 2)
+    cursor = PageCursor(middle, 2 ** 62)
+    page = benchmark(history.fetch_page, kind, cursor)
+    assert page.rows
+
+
+def test_vitals_page(benchmark, dataset):
+    repository = HealthRepository(dataset.user_id)
+    try:
+        page = benchmark(repository.vitals_page)
+    finally:
+        repository.close()
+    assert page.rows
+
+
+@pytest.mark.parametrize("query", ["headache", "nasi"])
+def test_search_logs(benchmark, dataset, query):
+    hits = benchmark(search_logs, query, dataset.user_id)
+    assert hits
@@ -0,0 +1,92 @@
+"""
+Database benchmark suite fixtures
+File: benchmarks/suite/conftest.py
+
+Builds (once) and caches synthetic databases at 1, 10 and 100 user-years
+with database.synthetic, and stores pytest-benchmark results next to the
+suite so runs can be compared with --benchmark-compare.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+SUITE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SUITE_DIR.parent.parent / "src"))
+
+from database import connection  # noqa: E402
+from database.schema import get_head_revision  # noqa: E402
+from database.synthetic import DEFAULT_END, generate_dataset  # noqa: E402
+
+DATA_DIR = SUITE_DIR / ".data"
+RESULTS_DIR = SUITE_DIR / ".results"
+SEED = 42
+
+# user-years -> (users, years per user)
+SCALES = {
+    1: (1, 1),
+    10: (2, 5),
+    100: (10, 10),
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--user-years", default="1,10,100",
+        help="comma separated dataset sizes to run (keys of SCALES)",
+    )
+
+
+def pytest_configure(config):
+    # Runs before pytest-benchmark's own configure (trylast)
+    if config.getoption("benchmark_storage", None) == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{RESULTS_DIR}"
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset" in metafunc.fixturenames:
+        scales = [int(s) for s in metafunc.config.getoption("user_years").split(",")]
+        unknown = [s for s in scales if s not in SCALES]
+        if unknown:
+            raise pytest.UsageError(f"Unknown --user-years {unknown}, expected {sorted(SCALES)}")
+        metafunc.parametrize("dataset", scales, ids=[f"{s}uy" for s in scales],
+                             indirect=True, scope="session")
+
+
+class Dataset:
+    """A generated database and the reference point queries are run at"""
+
+    def __init__(self, path: Path, user_years: int, years: int):
+        self.path = path
+        self.user_years = user_years
+        self.years = years  # history length per user
+        self.user_id = 1  # first synthetic user
+        self.last_day = DEFAULT_END - timedelta(days=1)
+        self.now = datetime.combine(self.last_day, datetime.min.time()) + timedelta(hours=20)
+
+
+def _build(path: Path, users: int, years: int):
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+    connection.init_database(f"sqlite:///{partial}")
+    result = generate_dataset(users=users, years=years, seed=SEED, end=DEFAULT_END)
+    connection.engine.dispose()
+    print(f"\nGenerated {result.total_rows:,} rows in {result.seconds:.0f}s -> {path.name}")
+    os.replace(partial, path)
+
+
+@pytest.fixture(scope="session")
+def dataset(request):
+    users, years = SCALES[request.param]
+    DATA_DIR.mkdir(exist_ok=True)
+    # Schema head in the name so a new migration triggers a rebuild
+    path = DATA_DIR / f"synthetic-{users}u-{years}y-s{SEED}-r{get_head_revision()}.db"
+    if not path.exists():
+        _build(path, users, years)
+
+    connection.init_database(f"sqlite:///{path}")
+    yield Dataset(path, request.param, years)
+    connection.engine.dispose()
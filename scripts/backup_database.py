@@ -0,0 +1,62 @@
+"""
+Back up, list, prune and restore database backups
+File: scripts/backup_database.py
+
+Backups are made online with the SQLite backup API, so the app may keep
+running. Restore replaces the database contents; close the app first.
+
+Run: python scripts/backup_database.py create|list|prune
+     python scripts/backup_database.py restore data/backups/healthtrack-20241231-020000.db
+"""
+
+import argparse
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.backup import (create_backup, list_backups,  # noqa: E402
+                             policy_from_env, prune_backups, restore_backup)
+from database.connection import init_database  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online database backups")
+    parser.add_argument("command", choices=("create", "list", "prune", "restore"))
+    parser.add_argument("backup", nargs="?", type=Path, help="backup file to restore")
+    parser.add_argument("--backup-dir", type=Path, default=None,
+                        help="defaults to BACKUP_DIR or data/backups")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if not init_database(args.database_url):
+        sys.exit(1)
+
+    policy = policy_from_env()
+    if args.backup_dir:
+        policy = replace(policy, directory=args.backup_dir)
+
+    try:
+        if args.command == "create":
+            print(f"✓ Backup created: {create_backup(policy)}")
+            removed = prune_backups(policy)
+            print(f"✓ {len(removed)} old backup(s) removed")
+        elif args.command == "list":
+            for backup in list_backups(policy):
+                print(f"  {backup.created_at:%Y-%m-%d %H:%M:%S}  {backup}")
+        elif args.command == "prune":
+            removed = prune_backups(policy)
+            print(f"✓ {len(removed)} old backup(s) removed")
+        else:
+            if args.backup is None:
+                parser.error("restore needs the backup file")
+            safety = restore_backup(args.backup, policy=policy)
+            print(f"✓ Restored {args.backup.name} (previous database saved as {safety.path.name})")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
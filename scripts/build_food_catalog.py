@@ -0,0 +1,70 @@
+"""
+Compile a food catalog into a memory-mapped catalog file
+File: scripts/build_food_catalog.py
+
+Compiles the built-in foods, or a CSV export of a large nutrition
+database, into the binary file read by database/food_catalog_file.py.
+Set FOOD_CATALOG_FILE to the output to have the app use it.
+
+CSV columns: id, name, category, meal_type (e.g. "lunch/dinner"),
+calories, protein, carbs, fat, fiber, sugar (may be empty), serving.
+
+Run: python scripts/build_food_catalog.py [--csv foods.csv] [--output data/food_catalog.bin]
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.connection import DATABASE_DIR  # noqa: E402
+from database.food_catalog import Food, get_catalog, parse_meal_types  # noqa: E402
+from database.food_catalog_file import MappedFoodCatalog, compile_catalog  # noqa: E402
+
+NUTRIENTS = ("calories", "protein", "carbs", "fat", "fiber")
+
+
+def read_csv(path: Path):
+    """Foods of a CSV file, one per row"""
+    with open(path, newline="", encoding="utf-8") as handle:
+        for line, row in enumerate(csv.DictReader(handle), start=2):
+            try:
+                yield Food(
+                    id=row["id"], name=row["name"], category=row["category"],
+                    meal_types=parse_meal_types(row["meal_type"]),
+                    serving=row["serving"],
+                    sugar=float(row["sugar"]) if row.get("sugar") else None,
+                    source=path.stem,
+                    **{nutrient: float(row[nutrient]) for nutrient in NUTRIENTS},
+                )
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"{path.name} line {line}: {e}") from e
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a memory-mapped food catalog file")
+    parser.add_argument("--csv", type=Path, default=None,
+                        help="foods to compile (default: the built-in foods)")
+    parser.add_argument("--output", type=Path, default=DATABASE_DIR / "food_catalog.bin")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        foods = read_csv(args.csv) if args.csv else get_catalog()
+        count = compile_catalog(foods, args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    catalog = MappedFoodCatalog(args.output)
+    size_mb = args.output.stat().st_size / 1e6
+    print(f"✓ {count:,} foods in {len(catalog.categories)} categories compiled to "
+          f"{args.output} ({size_mb:.1f} MB) in {time.perf_counter() - started:.1f}s")
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compact old device samples into 5-minute and hourly aggregates
+File: scripts/compact_data.py
+
+Safe to interrupt (Ctrl+C): finished days stay compacted and the next
+run continues with the rest.
+
+Run: python scripts/compact_data.py [--raw-days 90] [--five-minute-days 365] [--archive-dir data/archive]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.connection import init_database  # noqa: E402
+from database.retention import RetentionPolicy, compact  # noqa: E402
+
+
+def main():
+    defaults = RetentionPolicy()
+    parser = argparse.ArgumentParser(description="Compact old raw device samples")
+    parser.add_argument("--raw-days", type=int, default=defaults.raw_days,
+                        help="keep raw samples for this many days")
+    parser.add_argument("--five-minute-days", type=int, default=defaults.five_minute_days,
+                        help="keep 5-minute aggregates for this many days, hourly after that")
+    parser.add_argument("--archive-dir", type=Path, default=None,
+                        help="write compacted raw rows to gzip CSV files here first")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if not init_database(args.database_url):
+        sys.exit(1)
+
+    policy = RetentionPolicy(args.raw_days, args.five_minute_days, args.archive_dir)
+    try:
+        result = compact(policy)
+    except KeyboardInterrupt:
+        print("⚠️ Interrupted; the current day was rolled back, run again to continue")
+        sys.exit(1)
+    print(f"✓ {result}")
+
+
+if __name__ == "__main__":
+    main()
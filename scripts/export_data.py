@@ -0,0 +1,41 @@
+"""
+Export all tables to CSV, JSON Lines or Parquet files
+File: scripts/export_data.py
+
+Run: python scripts/export_data.py data/export [--format csv|jsonl|parquet] [--user-id 1]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.connection import init_database  # noqa: E402
+from database.export import DEFAULT_CHUNK_ROWS, EXPORT_FORMATS, export_data  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export user data with bounded memory")
+    parser.add_argument("directory", type=Path, help="output directory (one file per table)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--user-id", type=int, default=None, help="only this user's data")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if not init_database(args.database_url):
+        sys.exit(1)
+
+    try:
+        result = export_data(args.directory, args.format, args.user_id, args.chunk_rows)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for table, rows in result.tables.items():
+        print(f"  {table:<20}{rows:>12,}")
+    print(f"✓ Exported to {args.directory}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Import a directory written by scripts/export_data.py
+File: scripts/import_data.py
+
+Rows keep their ids, so the database must not have logged data yet.
+--mode resume finishes an interrupted import of the same export (rows
+already imported are skipped); --mode merge adds the export as new users.
+
+Run: python scripts/import_data.py data/export [--mode new|resume|merge] [--database-url sqlite:///data/restored.db]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.connection import init_database  # noqa: E402
+from database.export import DEFAULT_CHUNK_ROWS, IMPORT_MODES, import_data  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import exported user data in batches")
+    parser.add_argument("directory", type=Path, help="directory containing manifest.json")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--mode", choices=IMPORT_MODES, default="new")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if not init_database(args.database_url):
+        sys.exit(1)
+
+    try:
+        result = import_data(args.directory, args.chunk_rows, mode=args.mode)
+    except ValueError as e:
+        print(f"❌ Import stopped: {e}")
+        sys.exit(1)
+    for table, rows in result.tables.items():
+        print(f"  {table:<20}{rows:>12,}")
+    print(f"✓ Imported from {args.directory}: {result}")
+    if result.skipped:
+        print(f"⚠️ {result.skipped:,} rows were already in the database and were not imported")
+
+
+if __name__ == "__main__":
+    main()
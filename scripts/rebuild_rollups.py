@@ -0,0 +1,40 @@
+"""
+Rebuild daily_summaries from the raw log tables
+File: scripts/rebuild_rollups.py
+
+Run: python scripts/rebuild_rollups.py [--user-id 1] [--start 2024-01-01] [--end 2024-12-31]
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.connection import init_database  # noqa: E402
+from database.rollups import rebuild_daily_summaries  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily summary rollups")
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="first day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="last day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if not init_database(args.database_url):
+        sys.exit(1)
+
+    started = time.perf_counter()
+    rows = rebuild_daily_summaries(args.user_id, args.start, args.end)
+    elapsed = time.perf_counter() - started
+    print(f"✓ Rebuilt {rows} daily summaries in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
 """
 Common Foods Database
 Pre-defined nutrition data for common foods
+
+The functions below are served by the unified FoodCatalog
+(database/food_catalog.py) in this module's format ('fats', meal labels).
 """
 
+from database.food_catalog import get_catalog
+
+# Catalog meal type -> meal label used here
+MEAL_LABELS = {
+    "breakfast": "Breakfast",
+    "lunch": "Lunch",
+    "dinner": "Dinner",
+    "snack": "Snacks",
+}
+
 COMMON_FOODS = {
     "Breakfast": [
         {
@@ -327,31 +340,28 @@ INDONESIAN_FOODS = {
     ]
 }
 
+def _food_dict(food):
+    """Catalog food in this module's format"""
+    return {
+        "name": food.name,
+        "serving": food.serving,
+        "calories": food.calories,
+        "protein": food.protein,
+        "carbs": food.carbs,
+        "fats": food.fat,
+        "fiber": food.fiber,
+        "sugar": food.sugar,
+        "meal_type": MEAL_LABELS[food.meal_type],
+    }
+
 def get_all_foods():
     """Get all foods in a flat list"""
-    all_foods = []
-    
-    for meal_type, foods in COMMON_FOODS.items():
-        for food in foods:
-            food_copy = food.copy()
-            food_copy['meal_type'] = meal_type
-            all_foods.append(food_copy)
-    
-    return all_foods
+    return [_food_dict(food) for food in get_catalog()]
 
 def search_foods(query):
     """Search foods by name"""
-    query = query.lower()
-    results = []
-    
-    all_foods = get_all_foods()
-    
-    for food in all_foods:
-        if query in food['name'].lower():
-            results.append(food)
-    
-    return results
+    return [_food_dict(food) for food in get_catalog().search(query)]
 
 def get_foods_by_meal_type(meal_type):
     """Get foods for specific meal type"""
-    return COMMON_FOODS.get(meal_type, [])
\ No newline at end of file
+    return [_food_dict(food) for food in get_catalog().by_meal_type(meal_type)]
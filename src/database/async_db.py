@@ -0,0 +1,129 @@
+"""
+Async Database Access
+File: src/database/async_db.py
+
+Awaitable access to the synchronous data layer for asyncio services
+(device connectors, AI context building, reports). Every call runs on one
+dedicated database thread, so an event loop never blocks on SQLite, and
+writes from async services are serialized the way SQLite wants them
+instead of contending for the write lock.
+
+    repo = await AsyncRepository.open(DeviceRepository)
+    since = await repo.sync_since(device_id)
+    await run_db(ingest_health_samples, user_id, device_id, samples)
+    await repo.save_sync_state(device_id, 'health', last_sample_at)
+    await repo.close()
+
+AsyncRepository exposes the wrapped repository's methods unchanged,
+only awaitable. Non-asyncio callers (Qt) can use DatabaseExecutor.submit(),
+which returns a concurrent.futures.Future. The caller's query context
+(query_stats) carries over to the database thread.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from . import connection
+
+
+class DatabaseExecutor:
+    """
+    A single database thread running submitted calls in order
+
+    One thread, because repositories hold a connection that must stay on
+    the thread that opened it and SQLite allows one writer at a time.
+    """
+
+    def __init__(self, name: str = "database"):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Run func(*args, **kwargs) on the database thread"""
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, functools.partial(func, *args, **kwargs))
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) run on the database thread"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        """Finish queued calls and stop the thread"""
+        self._executor.shutdown(wait=wait)
+
+
+_executor: Optional[DatabaseExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _init_engine():
+    if connection.engine is None:
+        connection.init_database()
+
+
+def get_executor() -> DatabaseExecutor:
+    """The shared database executor, started on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DatabaseExecutor()
+            _executor.submit(_init_engine)
+        return _executor
+
+
+def shutdown_executor(wait: bool = True):
+    """Stop the shared executor; the next get_executor() starts a new one"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait)
+
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """Await any data layer function (ingest, stats, search...) on the database thread"""
+    return await get_executor().run(func, *args, **kwargs)
+
+
+class AsyncRepository:
+    """
+    Awaitable proxy for a repository living on the database thread
+
+    Methods keep their names and arguments and return coroutines.
+    Generator methods (iter_pages) are not proxied since they would be
+    consumed off the thread; page with fetch_page() and next_cursor.
+    """
+
+    def __init__(self, repository, executor: Optional[DatabaseExecutor] = None):
+        self._repository = repository
+        self._executor = executor or get_executor()
+
+    @classmethod
+    async def open(cls, repository_class, *args,
+                   executor: Optional[DatabaseExecutor] = None, **kwargs) -> "AsyncRepository":
+        """Create repository_class(*args, **kwargs) on the database thread"""
+        executor = executor or get_executor()
+        repository = await executor.run(repository_class, *args, **kwargs)
+        return cls(repository, executor)
+
+    @property
+    def user_id(self) -> int:
+        return self._repository.user_id
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._repository, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        if inspect.isgeneratorfunction(attr):
+            raise AttributeError(f"{name}() is a generator and cannot be awaited")
+
+        async def method(*args, **kwargs):
+            return await self._executor.run(attr, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
@@ -0,0 +1,339 @@
+"""
+Online Database Backup
+File: src/database/backup.py
+
+Copies the live SQLite database with the online backup API
+(sqlite3.Connection.backup) a few pages per step, sleeping between steps
+so the UI and the sync thread keep getting the database. The copy is
+written next to its final name, checked with PRAGMA integrity_check and
+only then renamed into place, so a listed backup is always a complete,
+valid database.
+
+Backups are named <database>-YYYYMMDD-HHMMSS.db, with a -2, -3, ...
+suffix for further backups in the same second, and rotated by
+BackupPolicy: the newest keep_last are kept, plus the newest backup of
+each of the last keep_daily days and keep_weekly ISO weeks.
+BackupService runs create + prune on a daemon thread every
+interval_hours; restore_backup() copies a backup back over the database.
+"""
+
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from . import connection
+
+
+BACKUP_TIME_FORMAT = "%Y%m%d-%H%M%S"
+_SEQUENCE = re.compile(r"-(\d+)$")
+
+# Scheduled backups (BackupService); BACKUP_INTERVAL_HOURS=0 turns them off
+BACKUP_DIR = os.getenv("BACKUP_DIR")
+BACKUP_INTERVAL_HOURS = os.getenv("BACKUP_INTERVAL_HOURS")
+
+
+@dataclass(frozen=True)
+class BackupPolicy:
+    """Where backups go, how often they are made and which are kept"""
+    directory: Optional[Path] = None  # defaults to data/backups
+    interval_hours: float = 24.0
+    keep_last: int = 3
+    keep_daily: int = 7
+    keep_weekly: int = 4
+    pages_per_step: int = 256         # 1 MB with 4 KiB pages
+    step_sleep_seconds: float = 0.005
+
+    def backup_dir(self) -> Path:
+        return Path(self.directory) if self.directory else connection.DATABASE_DIR / "backups"
+
+
+@dataclass(frozen=True)
+class BackupInfo:
+    """One backup file"""
+    path: Path
+    created_at: datetime
+    size_bytes: int
+    seconds: float = 0.0  # time the backup took (0 for listed backups)
+    steps: int = 0
+
+    def __str__(self):
+        took = f" in {self.seconds:.1f}s ({self.steps} steps)" if self.steps else ""
+        return f"{self.path.name} ({self.size_bytes / 1e6:.1f} MB){took}"
+
+
+def policy_from_env() -> BackupPolicy:
+    """Default policy with the BACKUP_* environment overrides"""
+    defaults = BackupPolicy()
+    return BackupPolicy(
+        directory=Path(BACKUP_DIR) if BACKUP_DIR else None,
+        interval_hours=float(BACKUP_INTERVAL_HOURS or defaults.interval_hours),
+    )
+
+
+def _database_path(database_path=None) -> Path:
+    if database_path is not None:
+        return Path(database_path)
+    if connection.engine is None:
+        connection.init_database()
+    database = connection.engine.url.database
+    if not database or database == ":memory:":
+        raise ValueError("In-memory databases cannot be backed up")
+    return Path(database)
+
+
+def _integrity_check(path: Path) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        return "; ".join(row[0] for row in conn.execute("PRAGMA integrity_check"))
+    finally:
+        conn.close()
+
+
+def _backup_name(stem: str, created_at: datetime, sequence: int = 1) -> str:
+    suffix = f"-{sequence}" if sequence > 1 else ""
+    return f"{stem}-{created_at:{BACKUP_TIME_FORMAT}}{suffix}.db"
+
+
+def _parse_backup_name(name: str, stem: str) -> Optional[Tuple[datetime, int]]:
+    """(created_at, sequence) of a backup file name; None if it is not one of ours"""
+    label = name[len(stem) + 1:-len(".db")]
+    sequence = 1
+    match = _SEQUENCE.search(label)
+    if match and label.count("-") > 1:
+        sequence = int(match.group(1))
+        label = label[:match.start()]
+    try:
+        return datetime.strptime(label, BACKUP_TIME_FORMAT), sequence
+    except ValueError:
+        return None
+
+
+def _publish(partial: Path, directory: Path, stem: str, created_at: datetime) -> Path:
+    """
+    Move a finished copy to the first free backup name
+
+    A hard link never replaces an existing file, so two backups made in
+    the same second (a restore's safety backup right after a manual one,
+    or a manual and a scheduled one) cannot overwrite each other.
+    """
+    sequence = 1
+    while True:
+        path = directory / _backup_name(stem, created_at, sequence)
+        try:
+            os.link(partial, path)
+        except FileExistsError:
+            sequence += 1
+            continue
+        except OSError:
+            # No hard links on this file system: check, then rename
+            if path.exists():
+                sequence += 1
+                continue
+            os.rename(partial, path)
+            return path
+        partial.unlink()
+        return path
+
+
+def _copy(source: sqlite3.Connection, target: sqlite3.Connection, policy: BackupPolicy,
+          progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """Online backup in page steps; returns the number of steps"""
+    steps = 0
+    # Pin a WAL snapshot for the whole copy. Without an open read
+    # transaction every step starts its own, and any commit by another
+    # connection in between restarts the backup from the first page.
+    source.execute("BEGIN")
+    source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+
+    def on_step(status, remaining, total):
+        nonlocal steps
+        steps += 1
+        if progress:
+            progress(total - remaining, total)
+        # backup() itself only sleeps when the database is busy; pause
+        # between steps too so other threads get the GIL and the disk
+        time.sleep(policy.step_sleep_seconds)
+
+    try:
+        source.backup(target, pages=policy.pages_per_step, progress=on_step,
+                      sleep=policy.step_sleep_seconds)
+    finally:
+        source.rollback()
+    return steps
+
+
+def create_backup(policy: BackupPolicy = BackupPolicy(),
+                  database_path=None,
+                  progress: Optional[Callable[[int, int], None]] = None) -> BackupInfo:
+    """
+    Back up the database without blocking other connections
+
+    Args:
+        database_path: Database file, defaults to the connected database
+        progress: Called after each step with (pages copied, total pages)
+
+    Raises:
+        ValueError: The copy failed its integrity check (it is deleted)
+    """
+    source_path = _database_path(database_path)
+    directory = policy.backup_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    created_at = datetime.now().replace(microsecond=0)
+    # A unique name per copy; the backup name is only taken once it is complete
+    handle, partial = tempfile.mkstemp(prefix=f".{source_path.stem}-", suffix=".db.partial",
+                                       dir=directory)
+    os.close(handle)
+    partial = Path(partial)
+    started = time.perf_counter()
+
+    try:
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(partial)
+        try:
+            steps = _copy(source, target, policy, progress)
+            # A self-contained file: no -wal/-shm next to the backup
+            target.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            target.close()
+            source.close()
+
+        result = _integrity_check(partial)
+        if result != "ok":
+            raise ValueError(f"Backup failed integrity check: {result}")
+        path = _publish(partial, directory, source_path.stem, created_at)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    return BackupInfo(path, created_at, path.stat().st_size,
+                      time.perf_counter() - started, steps)
+
+
+def list_backups(policy: BackupPolicy = BackupPolicy(), database_path=None) -> List[BackupInfo]:
+    """Backups of the database, newest first"""
+    stem = _database_path(database_path).stem
+    backups = []
+    for path in policy.backup_dir().glob(f"{stem}-*.db"):
+        parsed = _parse_backup_name(path.name, stem)
+        if parsed is None:
+            continue  # not one of ours
+        backups.append((parsed, BackupInfo(path, parsed[0], path.stat().st_size)))
+    return [backup for _, backup in sorted(backups, key=lambda item: item[0], reverse=True)]
+
+
+def prune_backups(policy: BackupPolicy = BackupPolicy(), database_path=None,
+                  now: Optional[datetime] = None) -> List[BackupInfo]:
+    """
+    Delete backups the policy no longer keeps
+
+    Returns:
+        The deleted backups
+    """
+    backups = list_backups(policy, database_path)
+    now = now or datetime.now()
+    keep = set(b.path for b in backups[:policy.keep_last])
+
+    days_seen, weeks_seen = set(), set()
+    for backup in backups:  # newest first, so the first of each day/week is kept
+        day = backup.created_at.date()
+        week = day.isocalendar()[:2]
+        if day not in days_seen and (now.date() - day).days < policy.keep_daily:
+            days_seen.add(day)
+            keep.add(backup.path)
+        if week not in weeks_seen and (now.date() - day).days < policy.keep_weekly * 7:
+            weeks_seen.add(week)
+            keep.add(backup.path)
+
+    removed = [backup for backup in backups if backup.path not in keep]
+    for backup in removed:
+        backup.path.unlink()
+    return removed
+
+
+def restore_backup(backup_path, database_path=None,
+                   policy: BackupPolicy = BackupPolicy()) -> BackupInfo:
+    """
+    Replace the database contents with a backup
+
+    The backup is integrity-checked first and the current database is
+    backed up before it is overwritten. Pooled connections are closed and
+    the database is re-initialized (and migrated if the backup is older).
+
+    Returns:
+        The safety backup taken of the database before the restore
+    """
+    backup_path = Path(backup_path)
+    if not backup_path.exists():
+        raise ValueError(f"No backup at {backup_path}")
+    result = _integrity_check(backup_path)
+    if result != "ok":
+        raise ValueError(f"Backup failed integrity check: {result}")
+
+    target_path = _database_path(database_path)
+    safety = create_backup(policy, target_path)
+
+    url = None
+    engine = connection.engine
+    if engine is not None and Path(engine.url.database or "").resolve() == target_path.resolve():
+        url = engine.url.render_as_string(hide_password=False)
+        engine.dispose()
+
+    source = sqlite3.connect(backup_path)
+    target = sqlite3.connect(target_path)
+    try:
+        _copy(source, target, policy)
+    finally:
+        target.close()
+        source.close()
+
+    if url is not None:
+        connection.init_database(url)
+    return safety
+
+
+class BackupService(threading.Thread):
+    """
+    Scheduled backups on a daemon thread
+
+    Backs up as soon as the newest backup is older than interval_hours,
+    then every interval_hours, pruning after each backup. stop() ends the
+    thread (a running copy finishes first).
+    """
+
+    def __init__(self, policy: BackupPolicy = BackupPolicy()):
+        super().__init__(name="database-backup", daemon=True)
+        self.policy = policy
+        self.last_backup: Optional[BackupInfo] = None
+        self._stop_requested = threading.Event()
+
+    def _next_delay(self) -> float:
+        try:
+            backups = list_backups(self.policy)
+        except (OSError, ValueError) as e:
+            print(f"❌ Database backup error: {e}")
+            return self.policy.interval_hours * 3600
+        if not backups:
+            return 0.0
+        due = backups[0].created_at + timedelta(hours=self.policy.interval_hours)
+        return max(0.0, (due - datetime.now()).total_seconds())
+
+    def run(self):
+        while not self._stop_requested.wait(self._next_delay()):
+            try:
+                self.last_backup = create_backup(self.policy)
+                removed = prune_backups(self.policy)
+                print(f"✓ Database backup: {self.last_backup}, {len(removed)} old backup(s) removed")
+            except Exception as e:
+                print(f"❌ Database backup error: {e}")
+                self._stop_requested.wait(self.policy.interval_hours * 3600)
+
+    def stop(self):
+        self._stop_requested.set()
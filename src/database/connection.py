@@ -3,51 +3,95 @@ Database Connection Manager
 Handles SQLite database initialization and operations
 """
 import os
+import functools
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from typing import Iterator
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 
 # IMPORTANT: Use relative import to avoid circular import
 from .models import (
-    Base, User, HealthRecord, NutritionLog, 
+    User, HealthRecord, NutritionLog, 
     ActivityLog, SleepRecord, WaterIntake, 
     Medication, HealthGoal, Achievement
 )
+from .local_dates import clear_timezone_cache, get_user_timezone, local_today
+from .engine import EngineProfile, DEFAULT_ENGINE_PROFILE, create_sqlite_engine
+from .schema import ensure_schema
+from .session_debug import TrackedSession, enable_leak_detection
+from .query_stats import enable_query_stats, instrument_engine
 
 # Database configuration
 DATABASE_DIR = Path(__file__).parent.parent.parent / "data"
 DATABASE_PATH = DATABASE_DIR / "healthtrack.db"
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
+# Report sessions left open longer than this many seconds (debug aid)
+SESSION_LEAK_SECONDS = os.getenv("DB_SESSION_LEAK_SECONDS")
+
+# Statement timing / N+1 detection (debug aid, see query_stats.py)
+QUERY_STATS = os.getenv("DB_QUERY_STATS")
+SLOW_QUERY_MS = os.getenv("DB_SLOW_QUERY_MS")
+QUERY_LOG = os.getenv("DB_QUERY_LOG")
+
 # Create engine and session
 engine = None
 SessionLocal = None
+ThreadSession = None  # thread-local sessions for worker threads
+
 
+def init_database(database_url: str = None, profile: EngineProfile = None):
+    """
+    Initialize database connection and upgrade the schema
 
-def init_database():
-    """Initialize database connection and create tables"""
-    global engine, SessionLocal
+    Args:
+        database_url: SQLAlchemy URL, defaults to data/healthtrack.db
+        profile: Engine profile (PRAGMAs and pool sizing), defaults to
+            DEFAULT_ENGINE_PROFILE (WAL, synchronous=NORMAL)
+    """
+    global engine, SessionLocal, ThreadSession
     
     try:
         # Create data directory if not exists
         DATABASE_DIR.mkdir(parents=True, exist_ok=True)
         
-        # Create engine
-        engine = create_engine(
-            DATABASE_URL,
-            connect_args={"check_same_thread": False},
-            echo=False  # Set to True for SQL debugging
+        # Release pooled connections of a previous engine
+        if engine is not None:
+            engine.dispose()
+        
+        # Create engine with the tuned SQLite profile
+        engine = create_sqlite_engine(
+            database_url or DATABASE_URL,
+            profile or DEFAULT_ENGINE_PROFILE
+        )
+        
+        # Create session factories. Objects stay usable after commit so
+        # repository functions can return them from a closed session.
+        SessionLocal = sessionmaker(
+            class_=TrackedSession,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=engine
         )
+        ThreadSession = scoped_session(SessionLocal)
+        clear_timezone_cache()  # user ids may belong to another database
         
-        # Create session factory
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        if SESSION_LEAK_SECONDS:
+            enable_leak_detection(float(SESSION_LEAK_SECONDS))
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Listeners are only attached while query stats are enabled
+        instrument_engine(engine)
+        if QUERY_STATS or SLOW_QUERY_MS or QUERY_LOG:
+            enable_query_stats(slow_ms=float(SLOW_QUERY_MS or 100), log_path=QUERY_LOG)
         
-        print(f"✓ Database connected: {DATABASE_PATH}")
-        print("✓ Database tables created!")
+        # Create or upgrade tables through the Alembic migration chain,
+        # skipped when the stored revision stamp is already current
+        migrated = ensure_schema(engine)
+        
+        print(f"✓ Database connected: {engine.url.database}")
+        print("✓ Database schema upgraded!" if migrated else "✓ Database schema up to date!")
         
         return True
         
@@ -57,182 +101,243 @@ def init_database():
 
 
 def get_db() -> Session:
-    """Get database session"""
+    """
+    Get a new database session
+
+    The caller owns the session and must close it. Prefer session_scope()
+    or the @with_session decorator, which always close it.
+    """
     if SessionLocal is None:
         init_database()
     
-    db = SessionLocal()
+    return SessionLocal()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Transactional session scope
+
+    Commits when the block finishes, rolls back on any exception and
+    always closes the session:
+
+        with session_scope() as db:
+            db.add(record)
+    """
+    db = get_db()
     try:
-        return db
-    except Exception as e:
-        print(f"❌ Session error: {e}")
-        db.close()
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
         raise
+    finally:
+        db.close()
+
+
+def with_session(func):
+    """
+    Decorator for repository functions that need a session
+
+    The wrapped function receives the session as the ``db`` keyword
+    argument. Callers may pass their own ``db`` to join an outer
+    transaction; otherwise a session_scope() is opened for the call.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, db: Session = None, **kwargs):
+        if db is not None:
+            return func(*args, db=db, **kwargs)
+        with session_scope() as scoped_db:
+            return func(*args, db=scoped_db, **kwargs)
+    return wrapper
+
+
+def get_thread_session() -> Session:
+    """
+    Get the calling thread's session
+
+    For worker threads (sync, reports) that run many operations. The same
+    session is returned for every call on one thread until
+    remove_thread_session() is called when the worker finishes.
+    """
+    if ThreadSession is None:
+        init_database()
+    
+    return ThreadSession()
+
+
+def remove_thread_session():
+    """Close and discard the calling thread's session"""
+    if ThreadSession is not None:
+        ThreadSession.remove()
 
 
 def add_sample_data():
     """Add sample data for testing"""
-    db = get_db()
-    
     try:
-        # Check if user already exists
-        existing_user = db.query(User).filter_by(email="john.doe@example.com").first()
-        if existing_user:
-            print("✓ Sample data already exists!")
-            return
-        
-        # Create sample user
-        user = User(
-            email="john.doe@example.com",
-            username="johndoe",
-            full_name="John Doe",
-            date_of_birth=datetime(1990, 1, 1),
-            gender="Male",
-            height=175.0,
-            weight=75.0,
-            target_weight=70.0
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        
-        # Add health record
-        health_record = HealthRecord(
-            user_id=user.id,
-            steps=5420,
-            calories_burned=217,
-            heart_rate=72,
-            sleep_hours=7.5,
-            water_intake=2000
-        )
-        db.add(health_record)
-        
-        # Add nutrition log
-        nutrition = NutritionLog(
-            user_id=user.id,
-            meal_type="Breakfast",
-            food_name="Oatmeal with Banana",
-            calories=350,
-            protein=12.0,
-            carbs=60.0,
-            fats=8.0
-        )
-        db.add(nutrition)
-        
-        # Add activity log
-        activity = ActivityLog(
-            user_id=user.id,
-            activity_type="Walking",
-            duration_minutes=30,
-            calories_burned=150,
-            distance_km=2.5
-        )
-        db.add(activity)
-        
-        # Add sleep record
-        sleep = SleepRecord(
-            user_id=user.id,
-            sleep_start=datetime.now().replace(hour=22, minute=0),
-            sleep_end=datetime.now().replace(hour=6, minute=30),
-            duration_hours=7.5,
-            quality_score=85
-        )
-        db.add(sleep)
-        
-        # Add water intake
-        water = WaterIntake(
-            user_id=user.id,
-            amount_ml=2000
-        )
-        db.add(water)
-        
-        # Add health goal
-        goal = HealthGoal(
-            user_id=user.id,
-            goal_type="Weight Loss",
-            target_value=70.0,
-            current_value=75.0,
-            deadline=datetime.now() + timedelta(days=90),
-            status="Active"
-        )
-        db.add(goal)
+        with session_scope() as db:
+            # Check if user already exists
+            existing_user = db.query(User).filter_by(email="john.doe@example.com").first()
+            if existing_user:
+                print("✓ Sample data already exists!")
+                return
+            
+            # Create sample user
+            user = User(
+                email="john.doe@example.com",
+                username="johndoe",
+                full_name="John Doe",
+                date_of_birth=datetime(1990, 1, 1),
+                gender="Male",
+                height=175.0,
+                weight=75.0,
+                target_weight=70.0
+            )
+            db.add(user)
+            db.flush()  # assigns user.id
+            
+            # Add health record
+            health_record = HealthRecord(
+                user_id=user.id,
+                steps=5420,
+                calories_burned=217,
+                heart_rate=72,
+                sleep_hours=7.5,
+                water_intake=2000
+            )
+            db.add(health_record)
+            
+            # Add nutrition log
+            nutrition = NutritionLog(
+                user_id=user.id,
+                meal_type="Breakfast",
+                food_name="Oatmeal with Banana",
+                calories=350,
+                protein=12.0,
+                carbs=60.0,
+                fats=8.0
+            )
+            db.add(nutrition)
+            
+            # Add activity log
+            activity = ActivityLog(
+                user_id=user.id,
+                activity_type="Walking",
+                duration_minutes=30,
+                calories_burned=150,
+                distance_km=2.5
+            )
+            db.add(activity)
+            
+            # Add sleep record
+            sleep = SleepRecord(
+                user_id=user.id,
+                sleep_start=datetime.now().replace(hour=22, minute=0),
+                sleep_end=datetime.now().replace(hour=6, minute=30),
+                duration_hours=7.5,
+                quality_score=85
+            )
+            db.add(sleep)
+            
+            # Add water intake
+            water = WaterIntake(
+                user_id=user.id,
+                amount_ml=2000
+            )
+            db.add(water)
+            
+            # Add health goal
+            goal = HealthGoal(
+                user_id=user.id,
+                goal_type="Weight Loss",
+                target_value=70.0,
+                current_value=75.0,
+                deadline=datetime.now() + timedelta(days=90),
+                status="Active"
+            )
+            db.add(goal)
         
-        db.commit()
         print("✓ Sample data added!")
         
     except Exception as e:
         print(f"❌ Error adding sample data: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
 
 def check_database():
     """Check database status and content"""
-    db = get_db()
-    
     try:
-        # Count records
-        user_count = db.query(User).count()
-        health_count = db.query(HealthRecord).count()
-        nutrition_count = db.query(NutritionLog).count()
-        
-        print(f"\n📊 Database Statistics:")
-        print(f"   👤 Users: {user_count}")
-        print(f"   📈 Health Records: {health_count}")
-        print(f"   🍎 Nutrition Logs: {nutrition_count}")
-        
-        # Get latest user
-        if user_count > 0:
-            user = db.query(User).first()
-            print(f"\n👤 Latest User:")
-            print(f"   Name: {user.full_name}")
-            print(f"   Email: {user.email}")
-            print(f"   Weight: {user.weight} kg")
+        with session_scope() as db:
+            # Count records
+            user_count = db.query(User).count()
+            health_count = db.query(HealthRecord).count()
+            nutrition_count = db.query(NutritionLog).count()
+            
+            print(f"\n📊 Database Statistics:")
+            print(f"   👤 Users: {user_count}")
+            print(f"   📈 Health Records: {health_count}")
+            print(f"   🍎 Nutrition Logs: {nutrition_count}")
             
+            # Get latest user
+            if user_count > 0:
+                user = db.query(User).first()
+                print(f"\n👤 Latest User:")
+                print(f"   Name: {user.full_name}")
+                print(f"   Email: {user.email}")
+                print(f"   Weight: {user.weight} kg")
+        
         return True
         
     except Exception as e:
         print(f"❌ Database check error: {e}")
         return False
-    finally:
-        db.close()
+
+
+# get_user_stats() queries, built once and reused on every refresh
+LATEST_HEALTH_STMT = (
+    select(HealthRecord)
+    .where(HealthRecord.user_id == bindparam('user_id'))
+    .order_by(HealthRecord.recorded_at.desc())
+    .limit(1)
+)
+MONTHLY_STEPS_STMT = select(
+    func.coalesce(func.sum(HealthRecord.steps), 0),
+    func.count(HealthRecord.id)
+).where(
+    HealthRecord.user_id == bindparam('user_id'),
+    HealthRecord.local_date >= bindparam('month_start')
+)
 
 
 def get_user_stats(user_id: int):
-    """Get user statistics"""
-    db = get_db()
-    
+    """
+    Get user statistics
+
+    For other periods or metrics use database.stats.get_period_stats().
+    """
     try:
-        user = db.query(User).filter_by(id=user_id).first()
-        if not user:
-            return None
-        
-        # Get latest health record
-        latest_health = db.query(HealthRecord).filter_by(user_id=user_id).order_by(
-            HealthRecord.recorded_at.desc()
-        ).first()
-        
-        # Calculate total steps this month
-        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0)
-        monthly_records = db.query(HealthRecord).filter(
-            HealthRecord.user_id == user_id,
-            HealthRecord.recorded_at >= month_start
-        ).all()
-        
-        total_steps = sum(record.steps for record in monthly_records)
-        
-        stats = {
-            'user': user,
-            'latest_health': latest_health,
-            'monthly_steps': total_steps,
-            'monthly_records_count': len(monthly_records)
-        }
-        
-        return stats
+        with session_scope() as db:
+            user = db.get(User, user_id)
+            if not user:
+                return None
+            
+            # Get latest health record
+            latest_health = db.scalars(LATEST_HEALTH_STMT, {'user_id': user_id}).first()
+            
+            # Total steps this month (user's local calendar), aggregated in SQL
+            month_start = local_today(get_user_timezone(db.connection(), user_id)).replace(day=1)
+            total_steps, records_count = db.execute(
+                MONTHLY_STEPS_STMT, {'user_id': user_id, 'month_start': month_start}
+            ).one()
+            
+            stats = {
+                'user': user,
+                'latest_health': latest_health,
+                'monthly_steps': total_steps,
+                'monthly_records_count': records_count
+            }
+            
+            return stats
         
     except Exception as e:
         print(f"❌ Error getting stats: {e}")
         return None
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Device Repository
+File: src/database/device_repository.py
+
+Paired wearables for the Devices page and their per-stream sync cursors.
+Listing is one query on ux_devices_user_device, adding a device is one
+upsert on the same key, and both return plain dicts ready for the
+device cards.
+
+Connectors ask sync_since() where to resume and call save_sync_state()
+after the ingest has committed. Ingest upserts are idempotent, so a
+crash between the two only re-fetches that one batch, never history.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .history_repository import ConnectionRepository, utc_to_local
+from .models import ActivityLog, Device, DeviceSyncState, HealthRecord
+
+
+DEVICE_COLUMNS = (
+    Device.device_id,
+    Device.name,
+    Device.model,
+    Device.vendor,
+    Device.battery,
+    Device.status,
+    Device.last_sync_at,
+)
+
+DEVICE_STATUSES = ('connected', 'disconnected', 'syncing', 'error')
+
+# Sync stream -> timestamp column of the device samples it writes. Without
+# a stored cursor, the newest stored sample (one seek on the unique
+# device sample index) is where a sync resumes.
+SYNC_STREAMS = {
+    'health': HealthRecord.recorded_at,
+    'activity': ActivityLog.activity_date,
+}
+
+LIST_DEVICES = (
+    select(*DEVICE_COLUMNS)
+    .where(Device.user_id == bindparam('user_id'))
+    .order_by(Device.id.desc())  # newest first, like cards added on the page
+)
+
+GET_SYNC_STATE = select(DeviceSyncState.cursor, DeviceSyncState.last_sample_at,
+                        DeviceSyncState.synced_at).where(
+    DeviceSyncState.user_id == bindparam('user_id'),
+    DeviceSyncState.device_id == bindparam('device_id'),
+    DeviceSyncState.stream == bindparam('stream'),
+)
+
+
+def _device_dict(row) -> Dict[str, Any]:
+    return {
+        "id": row.device_id,
+        "name": row.name,
+        "model": row.model or "",
+        "vendor": row.vendor,
+        "battery": row.battery if row.battery is not None else 0,
+        "status": row.status,
+        "last_sync": (utc_to_local(row.last_sync_at).strftime("%Y-%m-%d %H:%M")
+                      if row.last_sync_at else "Never"),
+    }
+
+
+def _battery_percent(value) -> Optional[int]:
+    """Battery level as an int percentage; None stays unknown"""
+    if value is None:
+        return None
+    try:
+        battery = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Battery must be a percentage, got {value!r}") from None
+    if not 0 <= battery <= 100:
+        raise ValueError(f"Battery {battery}% outside 0..100")
+    return battery
+
+
+class DeviceRepository(ConnectionRepository):
+    """Paired devices and sync cursors of one user"""
+
+    def list_devices(self) -> List[Dict[str, Any]]:
+        """The user's devices, newest first, as device card dicts"""
+        with self._conn.begin():
+            rows = self._conn.execute(LIST_DEVICES, {'user_id': self.user_id}).all()
+        return [_device_dict(row) for row in rows]
+
+    def add_device(self, device_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Pair a device, or update it if it is already paired
+
+        Args:
+            device_info: 'name' and optionally 'id' (the id its samples
+                carry; generated if missing), 'model', 'vendor', 'battery'
+                (percentage, 0-100) and 'status'
+
+        Returns:
+            The device in list_devices() format
+        """
+        name = (device_info.get("name") or "").strip()
+        if not name:
+            raise ValueError("Device name is required")
+        status = device_info.get("status") or "disconnected"
+        if status not in DEVICE_STATUSES:
+            raise ValueError(f"Unknown device status '{status}', expected one of {DEVICE_STATUSES}")
+        battery = _battery_percent(device_info.get("battery"))
+
+        values = {
+            "name": name,
+            "model": device_info.get("model"),
+            "vendor": device_info.get("vendor"),
+            "battery": battery,
+            "status": status,
+        }
+        stmt = sqlite_insert(Device).values(
+            user_id=self.user_id,
+            device_id=str(device_info.get("id") or uuid.uuid4().hex),
+            created_at=datetime.utcnow(),
+            **values,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Device.user_id, Device.device_id],
+            set_={key: stmt.excluded[key] for key in values},
+        ).returning(*DEVICE_COLUMNS)
+        with self._conn.begin():
+            return _device_dict(self._conn.execute(stmt).one())
+
+    def get_sync_state(self, device_id: str, stream: str) -> Optional[Dict[str, Any]]:
+        """Stored cursor of a device stream: cursor, last_sample_at, synced_at (UTC)"""
+        with self._conn.begin():
+            row = self._conn.execute(GET_SYNC_STATE, {
+                'user_id': self.user_id, 'device_id': device_id, 'stream': stream,
+            }).first()
+        return dict(row._mapping) if row else None
+
+    def sync_since(self, device_id: str, stream: str = 'health') -> Optional[datetime]:
+        """
+        UTC timestamp an incremental sync should fetch after
+
+        The stored cursor, else the newest sample already in the database
+        (devices synced before cursors were stored); None for a new device.
+        """
+        if stream not in SYNC_STREAMS:
+            raise ValueError(f"Unknown sync stream '{stream}', expected one of {tuple(SYNC_STREAMS)}")
+        state = self.get_sync_state(device_id, stream)
+        if state and state["last_sample_at"]:
+            return state["last_sample_at"]
+
+        ts_column = SYNC_STREAMS[stream]
+        model = ts_column.class_
+        with self._conn.begin():
+            return self._conn.execute(
+                select(func.max(ts_column)).where(model.user_id == self.user_id,
+                                                  model.device_id == device_id)
+            ).scalar()
+
+    def save_sync_state(self, device_id: str, stream: str,
+                        last_sample_at: Optional[datetime] = None,
+                        cursor: Optional[str] = None,
+                        battery: Optional[int] = None):
+        """
+        Record a finished sync of one device stream
+
+        last_sample_at never moves backwards, and a missing cursor keeps
+        the stored one. The device's last sync time, status (and battery
+        if given) are updated in the same transaction.
+
+        Raises:
+            ValueError: The device is not paired or the stream is unknown
+        """
+        if stream not in SYNC_STREAMS:
+            raise ValueError(f"Unknown sync stream '{stream}', expected one of {tuple(SYNC_STREAMS)}")
+        now = datetime.utcnow()
+
+        device_values = {"last_sync_at": now, "status": "connected"}
+        if battery is not None:
+            device_values["battery"] = _battery_percent(battery)
+
+        stmt = sqlite_insert(DeviceSyncState).values(
+            user_id=self.user_id, device_id=device_id, stream=stream,
+            cursor=cursor, last_sample_at=last_sample_at, synced_at=now,
+        )
+        stored = DeviceSyncState.last_sample_at
+        new = stmt.excluded.last_sample_at
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DeviceSyncState.user_id, DeviceSyncState.device_id,
+                            DeviceSyncState.stream],
+            set_={
+                # SQLite's max() is NULL if either side is
+                "last_sample_at": func.max(func.coalesce(new, stored), func.coalesce(stored, new)),
+                "cursor": func.coalesce(stmt.excluded.cursor, DeviceSyncState.cursor),
+                "synced_at": stmt.excluded.synced_at,
+            },
+        )
+
+        with self._conn.begin():
+            updated = self._conn.execute(
+                update(Device)
+                .where(Device.user_id == self.user_id, Device.device_id == device_id)
+                .values(**device_values)
+            ).rowcount
+            if not updated:
+                raise ValueError(f"Device '{device_id}' is not paired")
+            self._conn.execute(stmt)
@@ -0,0 +1,628 @@
+"""
+Streaming Export and Import
+File: src/database/export.py
+
+Copies every table in models.py to a directory of files and back without
+loading a table into memory. Exports iterate each table with yield_per
+inside one read transaction (a consistent snapshot) and write one file
+per table in chunks; imports read the files chunk by chunk, validate each
+row against the model's columns and bulk-insert the chunk through the
+DBAPI executemany, one transaction per chunk.
+
+Formats:
+
+    csv       <table>.csv, header row; NULL is an empty field
+    jsonl     <table>.jsonl, one JSON object per row
+    parquet   <table>.parquet, one row group per chunk (needs pyarrow)
+
+Timestamps are written as stored (naive UTC), binary payloads as base64
+in the text formats. A manifest.json records the format, schema revision
+and row counts. daily_summaries is exported for reference but rebuilt on
+import from the imported rows.
+
+Imports keep the exported primary keys, so they go into a database
+without logged data unless told otherwise: mode 'resume' finishes an
+interrupted import of the same export, 'merge' adds the export as new
+users with new keys.
+"""
+
+import base64
+import csv
+import json
+import operator
+import os
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, LargeBinary, String, select, type_coerce
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from . import connection
+from .ingest import _to_db_value, parse_timestamp
+from .models import Base
+from .query_stats import query_context
+from .rollups import rebuild_daily_summaries
+from .schema import read_schema_stamp
+
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+IMPORT_MODES = ('new', 'resume', 'merge')
+DEFAULT_CHUNK_ROWS = 10000
+MANIFEST_NAME = 'manifest.json'
+
+# Recomputed from the log tables on import instead of copied
+DERIVED_TABLES = ('daily_summaries',)
+
+# Called after every chunk with (table name, rows of that table so far)
+ProgressCallback = Callable[[str, int], None]
+
+
+@dataclass
+class TransferResult:
+    """Outcome of one export or import"""
+    direction: str              # 'export' or 'import'
+    path: Path
+    format: str
+    tables: Dict[str, int] = field(default_factory=dict)  # rows read per table
+    skipped: int = 0            # import: rows already present (mode 'resume')
+    bytes: int = 0              # size of the table files
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return sum(self.tables.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        skipped = f", {self.skipped:,} already present" if self.skipped else ""
+        return (f"{self.direction} {self.format}: {self.rows:,} rows in {len(self.tables)} tables"
+                f"{skipped}, {self.bytes / 1e6:,.1f} MB in {self.seconds:.1f}s "
+                f"({self.rows_per_second:,.0f} rows/s, {self.megabytes_per_second:,.1f} MB/s)")
+
+
+def _tables():
+    """Mapped tables, parents before children"""
+    return Base.metadata.sorted_tables
+
+
+def _check_format(fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {EXPORT_FORMATS}")
+    if fmt == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ValueError("Parquet export/import needs pyarrow (pip install pyarrow)") from e
+
+
+def _user_filter(table, user_id):
+    column = table.c.get('user_id')
+    if column is None and table.name == 'users':
+        column = table.c.id
+    return None if column is None else column == user_id
+
+
+# Export -------------------------------------------------------------------
+
+def _raw_columns(table):
+    """Columns selected as stored: dates as text and booleans as 0/1, skipping type processing"""
+    columns = []
+    for column in table.columns:
+        if isinstance(column.type, (DateTime, Date)):
+            columns.append(type_coerce(column, String).label(column.name))
+        elif isinstance(column.type, Boolean):
+            columns.append(type_coerce(column, Integer).label(column.name))
+        else:
+            columns.append(column)
+    return columns
+
+
+def _base64_rows(rows, binary):
+    for row in rows:
+        row = list(row)
+        for index in binary:
+            if row[index] is not None:
+                row[index] = base64.b64encode(row[index]).decode('ascii')
+        yield row
+
+
+class _CsvWriter:
+    def __init__(self, path, table):
+        self._handle = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow([column.name for column in table.columns])
+        self._binary = [i for i, c in enumerate(table.columns) if isinstance(c.type, LargeBinary)]
+
+    def write(self, rows):
+        self._writer.writerows(_base64_rows(rows, self._binary) if self._binary else rows)
+
+    def close(self):
+        self._handle.close()
+
+
+class _JsonLinesWriter:
+    def __init__(self, path, table):
+        self._handle = open(path, 'w', encoding='utf-8')
+        self._names = [column.name for column in table.columns]
+        self._binary = [i for i, c in enumerate(table.columns) if isinstance(c.type, LargeBinary)]
+
+    def write(self, rows):
+        if self._binary:
+            rows = _base64_rows(rows, self._binary)
+        names = self._names
+        self._handle.write(''.join(
+            json.dumps(dict(zip(names, row)), separators=(',', ':')) + '\n' for row in rows
+        ))
+
+    def close(self):
+        self._handle.close()
+
+
+def _arrow_type(column):
+    import pyarrow as pa
+    kind = column.type
+    if isinstance(kind, Boolean):
+        return pa.bool_()
+    if isinstance(kind, Integer):
+        return pa.int64()
+    if isinstance(kind, Float):
+        return pa.float64()
+    if isinstance(kind, DateTime):
+        return pa.timestamp('us')
+    if isinstance(kind, Date):
+        return pa.date32()
+    if isinstance(kind, LargeBinary):
+        return pa.binary()
+    return pa.string()
+
+
+class _ParquetWriter:
+    def __init__(self, path, table):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._schema = pa.schema([(c.name, _arrow_type(c)) for c in table.columns])
+        # Dates and booleans arrive in their stored form and are cast per chunk
+        self._stored = [
+            pa.string() if isinstance(c.type, (DateTime, Date))
+            else pa.int64() if isinstance(c.type, Boolean) else None
+            for c in table.columns
+        ]
+        self._writer = pq.ParquetWriter(path, self._schema, compression='zstd')
+
+    def write(self, rows):
+        pa = self._pa
+        arrays = []
+        for values, target, stored in zip(zip(*rows), self._schema.types, self._stored):
+            if stored is None:
+                arrays.append(pa.array(values, type=target))
+            else:
+                arrays.append(pa.array(values, type=stored).cast(target))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+_WRITERS = {'csv': _CsvWriter, 'jsonl': _JsonLinesWriter, 'parquet': _ParquetWriter}
+
+
+def export_data(directory,
+                fmt: str = 'csv',
+                user_id: Optional[int] = None,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                progress: Optional[ProgressCallback] = None) -> TransferResult:
+    """
+    Export every table to directory/<table>.<fmt>
+
+    Args:
+        fmt: 'csv', 'jsonl' or 'parquet'
+        user_id: Only this user's rows (all users if None)
+        chunk_rows: Rows fetched and written at a time; bounds memory
+        progress: Called after each chunk with (table, rows so far)
+    """
+    _check_format(fmt)
+    if connection.engine is None:
+        connection.init_database()
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    result = TransferResult('export', directory, fmt)
+    started = time.perf_counter()
+
+    with query_context("export"), connection.engine.connect() as conn:
+        # One read transaction for all tables, so the files are consistent
+        conn.exec_driver_sql("BEGIN")
+        for table in _tables():
+            stmt = select(*_raw_columns(table)).order_by(*table.primary_key.columns)
+            if user_id is not None:
+                condition = _user_filter(table, user_id)
+                if condition is None:
+                    continue
+                stmt = stmt.where(condition)
+
+            path = directory / f"{table.name}.{fmt}"
+            partial = path.with_name(path.name + '.partial')
+            writer = _WRITERS[fmt](partial, table)
+            count = 0
+            try:
+                rows = conn.execution_options(yield_per=chunk_rows).execute(stmt)
+                for chunk in rows.partitions():
+                    writer.write(chunk)
+                    count += len(chunk)
+                    if progress:
+                        progress(table.name, count)
+            finally:
+                writer.close()
+            os.replace(partial, path)
+            result.tables[table.name] = count
+            result.bytes += path.stat().st_size
+        revision = read_schema_stamp(connection.engine)
+        conn.rollback()
+
+    manifest = {
+        'format': fmt,
+        'schema_revision': revision,
+        'exported_at': datetime.utcnow().isoformat(sep=' '),
+        'user_id': user_id,
+        'tables': result.tables,
+    }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+# Import -------------------------------------------------------------------
+
+def _parse_datetime(value):
+    if isinstance(value, str) and len(value) == 26 and value[10] == ' ':
+        datetime.fromisoformat(value)  # validates; already in the stored format
+        return value
+    return _to_db_value(parse_timestamp(value))
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    elif not isinstance(value, date):
+        value = date.fromisoformat(value)
+    return value.isoformat()
+
+
+def _parse_boolean(value):
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value not in ('0', '1', 'true', 'false'):
+            raise ValueError(f"not a boolean: {value!r}")
+        return int(value in ('1', 'true'))
+    return int(bool(value))
+
+
+def _parse_binary(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return base64.b64decode(value, validate=True)
+
+
+def _parser(column, text: bool):
+    """Converter to the stored value; text is True for CSV, where every value is a string"""
+    kind = column.type
+    if isinstance(kind, Boolean):
+        return _parse_boolean
+    if isinstance(kind, Integer):
+        # operator.index refuses floats instead of truncating them
+        return int if text else operator.index
+    if isinstance(kind, Float):
+        return float
+    if isinstance(kind, DateTime):
+        return _parse_datetime
+    if isinstance(kind, Date):
+        return _parse_date
+    if isinstance(kind, LargeBinary):
+        return _parse_binary
+    return str
+
+
+def _read_csv(path, chunk_rows) -> Iterator[tuple]:
+    with open(path, newline='', encoding='utf-8') as handle:
+        reader = csv.reader(handle)
+        names = next(reader, None)
+        if names is None:
+            return
+        chunk = []
+        for row in reader:
+            chunk.append([value if value != '' else None for value in row])
+            if len(chunk) >= chunk_rows:
+                yield names, chunk
+                chunk = []
+        if chunk:
+            yield names, chunk
+
+
+def _read_jsonl(path, chunk_rows) -> Iterator[tuple]:
+    names = None
+    chunk = []
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if names is None:
+                names = list(record)
+            elif list(record) != names:
+                # Rows with other keys start a chunk of their own
+                if chunk:
+                    yield names, chunk
+                    chunk = []
+                names = list(record)
+            chunk.append(list(record.values()))
+            if len(chunk) >= chunk_rows:
+                yield names, chunk
+                chunk = []
+    if chunk:
+        yield names, chunk
+
+
+def _read_parquet(path, chunk_rows) -> Iterator[tuple]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    names = parquet.schema_arrow.names
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        columns = []
+        for column in batch.columns:
+            # Timestamps and dates as text in C, not one Python object each
+            if pa.types.is_timestamp(column.type) or pa.types.is_date(column.type):
+                column = column.cast(pa.string())
+            columns.append(column.to_pylist())
+        yield names, list(zip(*columns))
+
+
+_READERS = {'csv': _read_csv, 'jsonl': _read_jsonl, 'parquet': _read_parquet}
+
+
+def _insert_sql(conn, table, names, mode):
+    """Compiled INSERT for one column list and its parameter order"""
+    columns = table.columns
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ValueError(f"{table.name}: unknown column(s) {', '.join(unknown)}")
+    missing = [
+        column.name for column in columns
+        if column.name not in names and not column.nullable and not column.primary_key
+        and column.server_default is None
+    ]
+    if missing:
+        raise ValueError(f"{table.name}: missing required column(s) {', '.join(missing)}")
+
+    stmt = sqlite_insert(table)
+    if mode == 'resume':
+        # Rows the interrupted run already imported
+        stmt = stmt.on_conflict_do_nothing()
+    elif mode == 'new' and table.name == 'users':
+        # The only users of a database without data are empty profiles,
+        # such as the app's default local user
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={name: stmt.excluded[name] for name in names if name != 'id'},
+        )
+    keys = list(names)
+    if mode == 'merge' and _renumbered(table) and 'id' in keys:
+        keys.remove('id')
+    compiled = stmt.compile(dialect=conn.dialect, column_keys=keys)
+    order = [names.index(name) for name in compiled.positiontup]
+    return str(compiled), order, list(compiled.positiontup)
+
+
+def _renumbered(table) -> bool:
+    """Tables whose rows get new ids in a merge"""
+    return [column.name for column in table.primary_key.columns] == ['id']
+
+
+def _parse_column(table, name, parse, required, values, first_row):
+    """Converted values of one column of a chunk; errors name the row"""
+    try:
+        if None not in values:
+            return list(map(parse, values))
+        if not required:
+            return [None if value is None else parse(value) for value in values]
+    except (TypeError, ValueError):
+        pass
+    # Slow path to find the offending row
+    for offset, value in enumerate(values):
+        if value is None:
+            if required:
+                raise ValueError(f"{table.name} row {first_row + offset}: {name} is required")
+            continue
+        try:
+            parse(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{table.name} row {first_row + offset}: {name}: {e}") from None
+    raise AssertionError("unreachable")
+
+
+def _validate_chunk(table, names, chunk, order, first_row, text):
+    """Rows of a chunk as parameter tuples in INSERT order, converted column by column"""
+    for offset, row in enumerate(chunk):
+        if len(row) != len(names):
+            raise ValueError(f"{table.name} row {first_row + offset}: "
+                             f"expected {len(names)} values, got {len(row)}")
+    columns = []
+    for name, values in zip(names, zip(*chunk)):
+        column = table.columns[name]
+        required = not column.nullable and not column.primary_key
+        columns.append(_parse_column(table, name, _parser(column, text), required,
+                                     values, first_row))
+    return list(zip(*(columns[i] for i in order)))
+
+
+def tables_with_data() -> List[str]:
+    """Tables an import writes to that already have rows, users excluded"""
+    if connection.engine is None:
+        connection.init_database()
+    names = []
+    with connection.engine.connect() as conn:
+        for table in _tables():
+            if table.name in DERIVED_TABLES or table.name == 'users':
+                continue
+            if conn.execute(select(1).select_from(table).limit(1)).first() is not None:
+                names.append(table.name)
+    return names
+
+
+def _exported_users(directory, fmt, chunk_rows) -> List[dict]:
+    """The export's users rows as stored values"""
+    users = Base.metadata.tables['users']
+    path = directory / f"users.{fmt}"
+    if not path.exists():
+        raise ValueError(f"No users.{fmt} in {directory}")
+    rows = []
+    for names, chunk in _READERS[fmt](path, chunk_rows):
+        order = list(range(len(names)))
+        values = _validate_chunk(users, names, chunk, order, len(rows) + 1, fmt == 'csv')
+        rows += [dict(zip(names, row)) for row in values]
+    return rows
+
+
+def _check_resume(conn, users: List[dict]):
+    """Every exported user must be in the database as the import stored it"""
+    for user in users:
+        identity = {name: user.get(name) for name in ('id', 'username', 'email', 'full_name', 'created_at')
+                    if name in user}
+        sql = "SELECT 1 FROM users WHERE " + " AND ".join(f"{name} IS ?" for name in identity)
+        if conn.exec_driver_sql(sql, tuple(identity.values())).first() is None:
+            raise ValueError(f"User {user.get('id')} ({user.get('full_name')}) of the export is not in "
+                             f"the database; 'resume' only continues an import of this export")
+
+
+def _merge_users(chunk_params, names, user_ids, first_row, table):
+    """Exported user ids of a chunk replaced by the ids they were merged as"""
+    position = names.index('user_id')
+    rows = []
+    for offset, row in enumerate(chunk_params):
+        try:
+            new_id = user_ids[row[position]]
+        except KeyError:
+            raise ValueError(f"{table.name} row {first_row + offset}: user_id {row[position]} "
+                             f"is not in the export's users") from None
+        rows.append(row[:position] + (new_id,) + row[position + 1:])
+    return rows
+
+
+def import_data(directory,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                progress: Optional[ProgressCallback] = None,
+                mode: str = 'new') -> TransferResult:
+    """
+    Import a directory written by export_data()
+
+    Rows are validated against the model columns and inserted one
+    transaction per chunk. Daily summaries are rebuilt afterwards.
+
+    Args:
+        mode: 'new' keeps the exported primary keys and needs a database
+            without logged data (users without data, like the default
+            local profile, are replaced by the exported user with their
+            id). 'resume' continues an interrupted import of the same
+            export into this database: its users must already be there
+            and rows that were imported are skipped. 'merge' adds the
+            export's users and their rows with new ids, in a single
+            transaction so an interrupted merge leaves nothing behind.
+
+    Raises:
+        ValueError: Missing manifest, a database with data in mode 'new',
+            users that do not match in mode 'resume', a username or email
+            taken in mode 'merge', unknown column or invalid value (with
+            table and row number); in modes 'new' and 'resume' chunks
+            before the error stay imported
+    """
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode '{mode}', expected one of {IMPORT_MODES}")
+    directory = Path(directory)
+    manifest_path = directory / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise ValueError(f"No {MANIFEST_NAME} in {directory}")
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    fmt = manifest.get('format')
+    _check_format(fmt)
+
+    if connection.engine is None:
+        connection.init_database()
+    revision = read_schema_stamp(connection.engine)
+    if manifest.get('schema_revision') != revision:
+        print(f"⚠️ Export is from schema {manifest.get('schema_revision')}, "
+              f"database is at {revision}")
+
+    if mode == 'new':
+        existing = tables_with_data()
+        if existing:
+            raise ValueError(f"The database already has data ({', '.join(existing)}); import with "
+                             f"mode 'resume' to finish an interrupted import of this export, or "
+                             f"'merge' to add it as new users")
+
+    result = TransferResult('import', directory, fmt)
+    started = time.perf_counter()
+    read = _READERS[fmt]
+    user_ids: Dict[int, int] = {}  # merge: exported user id -> new id
+
+    with query_context("import"), connection.engine.connect() as conn:
+        if mode == 'resume':
+            with conn.begin():
+                _check_resume(conn, _exported_users(directory, fmt, chunk_rows))
+        # A merge is one transaction, the other modes commit every chunk
+        with conn.begin() if mode == 'merge' else nullcontext():
+            for table in _tables():
+                path = directory / f"{table.name}.{fmt}"
+                if table.name in DERIVED_TABLES or not path.exists():
+                    continue
+                result.bytes += path.stat().st_size
+                count = 0
+                statements: Dict[tuple, tuple] = {}
+                for names, chunk in read(path, chunk_rows):
+                    key = tuple(names)
+                    if key not in statements:
+                        statements[key] = _insert_sql(conn, table, list(names), mode)
+                    sql, order, columns = statements[key]
+                    params = _validate_chunk(table, names, chunk, order, count + 1, fmt == 'csv')
+                    try:
+                        with nullcontext() if mode == 'merge' else conn.begin():
+                            if mode == 'merge' and table.name == 'users':
+                                old_ids = _validate_chunk(table, names, chunk, [names.index('id')],
+                                                          count + 1, fmt == 'csv')
+                                for (old_id,), row in zip(old_ids, params):
+                                    user_ids[old_id] = conn.exec_driver_sql(sql, row).lastrowid
+                                inserted = len(params)
+                            else:
+                                if mode == 'merge' and 'user_id' in columns:
+                                    params = _merge_users(params, columns, user_ids, count + 1, table)
+                                inserted = conn.exec_driver_sql(sql, params).rowcount
+                    except IntegrityError as e:
+                        rows = f"row {count + 1}" if len(params) == 1 else f"rows {count + 1}-{count + len(params)}"
+                        raise ValueError(f"{table.name} {rows}: {e.orig}") from None
+                    result.skipped += len(params) - inserted
+                    count += len(params)
+                    if progress:
+                        progress(table.name, count)
+                result.tables[table.name] = count
+
+    # Compacted samples have no rollup triggers
+    user_id = manifest.get('user_id')
+    if mode == 'merge':
+        for new_id in ([user_ids[user_id]] if user_id in user_ids else user_ids.values()):
+            rebuild_daily_summaries(new_id)
+    else:
+        rebuild_daily_summaries(user_id)
+    result.seconds = time.perf_counter() - started
+    return result
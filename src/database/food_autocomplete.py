@@ -0,0 +1,218 @@
+"""
+Food Autocomplete
+File: src/database/food_autocomplete.py
+
+Type-ahead suggestions over the FoodCatalog. Every word start of every
+folded name is a key in one sorted array ("nasi goreng" is stored as
+"nasi goreng" and "goreng"), so "goreng" finds Nasi Goreng and Mie
+Goreng, and a prefix is one bisect to the first matching key.
+
+Ranking comes from the user's own log (FoodUsage): foods logged often
+and recently come first, each log counting half as much after
+RECENCY_HALF_LIFE_DAYS. Names the user logged that are not in the
+catalog are suggested too. The rest of the top-k is filled from the
+catalog in key order, so a query touches the user's matching foods plus
+k catalog keys however large the catalog is. A compiled catalog file
+(MappedFoodCatalog) already holds these keys, so they are not rebuilt.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from . import connection
+from .food_catalog import Food, FoodCatalog, fold, get_catalog
+from .models import NutritionLog, User
+
+
+DEFAULT_LIMIT = 10
+RECENCY_HALF_LIFE_DAYS = 30
+USAGE_HISTORY_DAYS = 365
+
+# Sorts after every character a folded name can contain
+_KEY_END = '\U0010ffff'
+
+
+def word_keys(folded_name: str) -> List[str]:
+    """The name from each word start on: 'nasi goreng' -> ['nasi goreng', 'goreng']"""
+    keys = [folded_name]
+    position = folded_name.find(' ')
+    while position != -1:
+        keys.append(folded_name[position + 1:])
+        position = folded_name.find(' ', position + 1)
+    return keys
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """One autocomplete result; food is None for a name only found in the user's log"""
+    name: str
+    food: Optional[Food]
+    score: float = 0.0  # usage score, 0 for foods the user never logged
+
+
+@dataclass
+class _UsedFood:
+    name: str
+    food: Optional[Food]
+    count: int
+    last_logged_at: datetime
+
+    def score(self, now: datetime) -> float:
+        age_days = max(0.0, (now - self.last_logged_at).total_seconds() / 86400)
+        return self.count * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+class FoodUsage:
+    """
+    How often and how recently one user logged each food name
+
+    Kept in memory with its own small word-key array; record() updates it
+    as the user logs so suggestions adapt without reloading.
+    """
+
+    def __init__(self, catalog: Optional[FoodCatalog] = None):
+        self._catalog = catalog if catalog is not None else get_catalog()
+        # A mapped catalog is looked up per name instead of decoded whole
+        self._catalog_names = (None if hasattr(self._catalog, 'by_name')
+                               else {fold(food.name): food for food in self._catalog})
+        self._used: Dict[str, _UsedFood] = {}  # folded name -> usage
+        self._keys: List[Tuple[str, str]] = []  # sorted (word key, folded name)
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    def _catalog_food(self, folded: str) -> Optional[Food]:
+        if self._catalog_names is not None:
+            return self._catalog_names.get(folded)
+        return self._catalog.by_name(folded)
+
+    def record(self, name: str, logged_at: Optional[datetime] = None, count: int = 1):
+        """Count a logged food"""
+        logged_at = logged_at or datetime.utcnow()
+        folded = fold(name)
+        if not folded:
+            return
+        used = self._used.get(folded)
+        if used is None:
+            food = self._catalog_food(folded)
+            self._used[folded] = _UsedFood(food.name if food else name.strip(), food,
+                                           count, logged_at)
+            for key in word_keys(folded):
+                insort(self._keys, (key, folded))
+        else:
+            used.count += count
+            used.last_logged_at = max(used.last_logged_at, logged_at)
+
+    def matching(self, prefix: str) -> List[_UsedFood]:
+        """Used foods with a word starting with the folded prefix"""
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + _KEY_END,))
+        names = dict.fromkeys(folded for _, folded in self._keys[start:end])
+        return [self._used[folded] for folded in names]
+
+
+def load_food_usage(user_id: Optional[int] = None,
+                    days: int = USAGE_HISTORY_DAYS,
+                    catalog: Optional[FoodCatalog] = None) -> FoodUsage:
+    """
+    Usage of the last `days` days of a user's nutrition log
+
+    One grouped query over the (user_id, logged_at) index range. user_id
+    defaults to the first user; no user means empty usage.
+    """
+    if connection.engine is None:
+        connection.init_database()
+    usage = FoodUsage(catalog)
+    since = datetime.utcnow() - timedelta(days=days)
+
+    with connection.engine.connect() as conn:
+        if user_id is None:
+            user_id = conn.execute(select(User.id).order_by(User.id).limit(1)).scalar()
+            if user_id is None:
+                return usage
+        rows = conn.execute(
+            select(NutritionLog.food_name, func.count(), func.max(NutritionLog.logged_at))
+            .where(NutritionLog.user_id == user_id, NutritionLog.logged_at >= since)
+            .group_by(NutritionLog.food_name)
+        ).all()
+
+    for name, count, last_logged_at in rows:
+        if name:
+            usage.record(name, last_logged_at, count)
+    return usage
+
+
+class FoodAutocomplete:
+    """Prefix and word-start completion over a FoodCatalog"""
+
+    def __init__(self, catalog: Optional[FoodCatalog] = None):
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self._keys = self._foods = None
+        if hasattr(self.catalog, 'iter_prefix'):
+            return
+        keys, foods = [], []
+        for food in self.catalog:
+            for key in word_keys(fold(food.name)):
+                keys.append(key)
+                foods.append(food)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._foods = [foods[i] for i in order]
+
+    def complete(self, text: str, limit: int = DEFAULT_LIMIT,
+                 usage: Optional[FoodUsage] = None,
+                 now: Optional[datetime] = None) -> List[Suggestion]:
+        """
+        Top suggestions for what the user has typed so far
+
+        The user's matching foods come first by usage score, then catalog
+        foods in key order. An empty text suggests nothing.
+        """
+        prefix = fold(text)
+        if not prefix or limit < 1:
+            return []
+
+        suggestions = []
+        seen = set()
+        if usage is not None:
+            now = now or datetime.utcnow()
+            ranked = sorted(((used.score(now), used) for used in usage.matching(prefix)),
+                            key=lambda item: item[0], reverse=True)
+            for score, used in ranked[:limit]:
+                suggestions.append(Suggestion(used.name, used.food, score))
+                if used.food is not None:
+                    seen.add(used.food.id)
+
+        for food in self._catalog_matches(prefix):
+            if len(suggestions) >= limit:
+                break
+            if food.id not in seen:
+                seen.add(food.id)
+                suggestions.append(Suggestion(food.name, food))
+        return suggestions
+
+    def _catalog_matches(self, prefix: str) -> Iterator[Food]:
+        """Catalog foods with a word starting with prefix, in key order"""
+        if self._keys is None:
+            yield from self.catalog.iter_prefix(prefix)
+            return
+        keys, foods = self._keys, self._foods
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield foods[position]
+            position += 1
+
+
+_autocomplete: Optional[FoodAutocomplete] = None
+
+
+def get_autocomplete() -> FoodAutocomplete:
+    """Autocomplete over the built-in catalog, built on first use"""
+    global _autocomplete
+    if _autocomplete is None:
+        _autocomplete = FoodAutocomplete()
+    return _autocomplete
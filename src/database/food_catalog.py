@@ -0,0 +1,249 @@
+"""
+Food Catalog
+File: src/database/food_catalog.py
+
+One normalized catalog over both food sources: FOOD_DATABASE in
+database/food_data.py and COMMON_FOODS/INDONESIAN_FOODS in
+data/food_database.py. Records are normalized once (fats -> fat, meal
+labels such as "Snacks" or "Lunch/Dinner" -> meal types, a food that
+appears in several sources is kept once) and indexed by id, category
+and meal type.
+
+Name search runs over a precomputed accent- and case-folded copy of all
+names joined into one string, so a keystroke is a few str.find() calls
+instead of lowercasing every name again.
+
+Setting FOOD_CATALOG_FILE to a file built by scripts/build_food_catalog.py
+makes get_catalog() map that file instead (database/food_catalog_file.py).
+"""
+
+import os
+import re
+import unicodedata
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+MEAL_TYPES = ('breakfast', 'lunch', 'dinner', 'snack')
+MEAL_TYPE_ALIASES = {'snacks': 'snack'}
+
+# Category of data/food_database.py foods, which have none
+SOURCE_CATEGORIES = {
+    'common': 'Western',
+    'indonesian': 'Indonesian',
+}
+
+# Compiled catalog to use instead of the built-in foods (unset = built-in)
+FOOD_CATALOG_FILE = os.getenv("FOOD_CATALOG_FILE")
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def fold(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace (search key of a name)"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return " ".join(''.join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+def parse_meal_types(label: str) -> Tuple[str, ...]:
+    """Meal types of a label: 'Snacks' -> ('snack',), 'Lunch/Dinner' -> ('lunch', 'dinner')"""
+    meal_types = []
+    for part in fold(label).split('/'):
+        part = part.strip()
+        part = MEAL_TYPE_ALIASES.get(part, part)
+        if part not in MEAL_TYPES:
+            raise ValueError(f"Unknown meal type '{label}', expected one of {MEAL_TYPES}")
+        meal_types.append(part)
+    return tuple(meal_types)
+
+
+@dataclass(frozen=True)
+class Food:
+    """One catalog food with nutrition per serving"""
+    id: str
+    name: str
+    category: str
+    meal_types: Tuple[str, ...]
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+    fiber: float
+    serving: str
+    sugar: Optional[float] = None
+    source: str = 'food_data'
+
+    @property
+    def meal_type(self) -> str:
+        """Primary meal type"""
+        return self.meal_types[0]
+
+    def to_dict(self) -> dict:
+        """A new dict in the database/food_data.py format, with the id"""
+        food = {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category,
+            "meal_type": self.meal_type,
+            "calories": self.calories,
+            "protein": self.protein,
+            "carbs": self.carbs,
+            "fat": self.fat,
+            "fiber": self.fiber,
+            "serving": self.serving,
+        }
+        if self.sugar is not None:
+            food["sugar"] = self.sugar
+        return food
+
+
+class FoodCatalog:
+    """Immutable set of foods with id, category, meal type and name indexes"""
+
+    def __init__(self, foods: Iterable[Food]):
+        self._foods: Tuple[Food, ...] = tuple(foods)
+        self._by_id: Dict[str, Food] = {}
+        by_category: Dict[str, List[Food]] = {}
+        by_meal_type: Dict[str, List[Food]] = {meal_type: [] for meal_type in MEAL_TYPES}
+
+        for food in self._foods:
+            if food.id in self._by_id:
+                raise ValueError(f"Duplicate food id '{food.id}'")
+            self._by_id[food.id] = food
+            by_category.setdefault(fold(food.category), []).append(food)
+            for meal_type in food.meal_types:
+                by_meal_type[meal_type].append(food)
+
+        self._by_category = {key: tuple(foods) for key, foods in by_category.items()}
+        self._by_meal_type = {key: tuple(foods) for key, foods in by_meal_type.items()}
+        self.categories = tuple(sorted({food.category for food in self._foods}))
+
+        # All folded names in one string; _offsets[i] is where name i starts.
+        # '\n' never occurs in a folded name or query, so matches don't span names.
+        names = [fold(food.name) for food in self._foods]
+        self._names = "\n".join(names)
+        self._offsets = []
+        position = 0
+        for name in names:
+            self._offsets.append(position)
+            position += len(name) + 1
+
+    @classmethod
+    def from_sources(cls, food_database: Dict[str, dict],
+                     *meal_sources: Tuple[str, Dict[str, List[dict]]]) -> "FoodCatalog":
+        """
+        Build from FOOD_DATABASE plus ('source', {meal label: [food, ...]}) dicts
+
+        FOOD_DATABASE entries come first and win over a food of the same
+        (folded) name in a later source; the later source only adds its
+        meal types to it.
+        """
+        foods: Dict[str, Food] = {}  # folded name -> food
+        ids = set()
+
+        for food_id, data in food_database.items():
+            foods[fold(data["name"])] = Food(
+                id=food_id, name=data["name"], category=data["category"],
+                meal_types=parse_meal_types(data["meal_type"]),
+                calories=data["calories"], protein=data["protein"], carbs=data["carbs"],
+                fat=data["fat"], fiber=data["fiber"], serving=data["serving"],
+                sugar=data.get("sugar"),
+            )
+            ids.add(food_id)
+
+        for source, meals in meal_sources:
+            for label, items in meals.items():
+                meal_types = parse_meal_types(label)
+                for data in items:
+                    key = fold(data["name"])
+                    known = foods.get(key)
+                    if known is not None:
+                        added = tuple(m for m in meal_types if m not in known.meal_types)
+                        if added:
+                            foods[key] = replace(known, meal_types=known.meal_types + added)
+                        continue
+
+                    food_id = _NON_ALNUM.sub('_', key).strip('_')
+                    base, n = food_id, 1
+                    while food_id in ids:
+                        n += 1
+                        food_id = f"{base}_{n}"
+                    ids.add(food_id)
+                    foods[key] = Food(
+                        id=food_id, name=data["name"], category=SOURCE_CATEGORIES[source],
+                        meal_types=meal_types,
+                        calories=data["calories"], protein=data["protein"], carbs=data["carbs"],
+                        fat=data["fats"], fiber=data["fiber"], serving=data["serving"],
+                        sugar=data.get("sugar"), source=source,
+                    )
+
+        return cls(foods.values())
+
+    def __len__(self) -> int:
+        return len(self._foods)
+
+    def __iter__(self) -> Iterator[Food]:
+        return iter(self._foods)
+
+    def get(self, food_id: str) -> Optional[Food]:
+        return self._by_id.get(food_id)
+
+    def by_category(self, category: str) -> Tuple[Food, ...]:
+        return self._by_category.get(fold(category), ())
+
+    def by_meal_type(self, meal_type: str) -> Tuple[Food, ...]:
+        """Foods for a meal type or label ('snack', 'Snacks', 'Lunch/Dinner')"""
+        try:
+            meal_types = parse_meal_types(meal_type)
+        except ValueError:
+            return ()
+        if len(meal_types) == 1:
+            return self._by_meal_type[meal_types[0]]
+        return tuple(food for food in self._foods
+                     if any(m in food.meal_types for m in meal_types))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Food]:
+        """Foods whose name contains query (case- and accent-insensitive), in catalog order"""
+        if limit is not None and limit <= 0:
+            return []
+        query = fold(query)
+        if not query:
+            return list(self._foods[:limit])
+
+        results = []
+        names, offsets = self._names, self._offsets
+        position = names.find(query)
+        while position != -1:
+            index = bisect_right(offsets, position) - 1
+            results.append(self._foods[index])
+            if len(results) == limit or index + 1 == len(offsets):
+                break
+            position = names.find(query, offsets[index + 1])
+        return results
+
+
+_catalog: Optional[FoodCatalog] = None
+_catalog_file_failed = False
+
+
+def get_catalog() -> FoodCatalog:
+    """The catalog of all built-in foods (or FOOD_CATALOG_FILE), built on first use"""
+    global _catalog, _catalog_file_failed
+    if _catalog is None and FOOD_CATALOG_FILE and not _catalog_file_failed:
+        from .food_catalog_file import MappedFoodCatalog
+        try:
+            _catalog = MappedFoodCatalog(FOOD_CATALOG_FILE)
+        except (OSError, ValueError) as e:
+            _catalog_file_failed = True
+            print(f"Could not open food catalog file, using built-in foods: {e}")
+    if _catalog is None:
+        from .food_data import FOOD_DATABASE
+        from data.food_database import COMMON_FOODS, INDONESIAN_FOODS
+
+        _catalog = FoodCatalog.from_sources(
+            FOOD_DATABASE,
+            ('common', COMMON_FOODS),
+            ('indonesian', INDONESIAN_FOODS),
+        )
+    return _catalog
@@ -0,0 +1,360 @@
+"""
+Compiled Food Catalog File
+File: src/database/food_catalog_file.py
+
+compile_catalog() writes foods to one binary file; MappedFoodCatalog
+opens it with mmap and decodes a Food only when it is accessed, so a
+catalog of hundreds of thousands of foods opens in milliseconds, costs
+no Python objects up front and its pages are shared by every process
+that maps it.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    header      MAGIC, version, food count, (offset, length) per SECTIONS
+    records     RECORD_DTYPE per food: nutrients in hundredths (int32,
+                -1 = unknown), meal types, string table indexes
+    strings     offsets (uint32, count + 1) + UTF-8 blob: ids, names,
+                servings, categories, sources (deduplicated)
+    id_slots    hash table of food index + 1 (0 = empty) by crc32 of the
+                id, linear probing, for get()
+    names       folded names joined by '\\n' + byte offset of each, for
+                substring search() with mmap.find()
+    keys        word-start keys (food_autocomplete.word_keys) sorted by
+                bytes + the food of each, for prefix completion
+
+UTF-8 byte order is code point order, so the byte-sorted sections are
+bisected with the same results as sorted str lists.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .food_catalog import MEAL_TYPES, Food, fold, parse_meal_types
+
+
+MAGIC = b"HTFOODC1"
+FORMAT_VERSION = 1
+SECTIONS = ('records', 'string_offsets', 'string_blob', 'id_slots',
+            'name_offsets', 'names', 'key_offsets', 'key_blob', 'key_foods')
+_HEADER = struct.Struct(f"<8sII{2 * len(SECTIONS)}Q")
+
+NUTRIENTS = ('calories', 'protein', 'carbs', 'fat', 'fiber', 'sugar')
+RECORD_DTYPE = np.dtype(
+    [(nutrient, '<i4') for nutrient in NUTRIENTS]  # hundredths, -1 = unknown
+    + [
+        ('meal_type', 'u1'),   # index into MEAL_TYPES of the primary meal type
+        ('meal_types', 'u1'),  # bit i set = MEAL_TYPES[i]
+        ('id', '<u4'),         # string table indexes
+        ('name', '<u4'),
+        ('serving', '<u4'),
+        ('category', '<u4'),
+        ('source', '<u4'),
+    ]
+)
+_RECORD = struct.Struct("<6i2B5I")  # RECORD_DTYPE, for decoding one record
+_UINT32 = struct.Struct("<I")
+_ID_OFFSET = RECORD_DTYPE.fields['id'][1]
+MISSING = -1
+
+
+def _pack_strings(strings: List[bytes]) -> Tuple[np.ndarray, bytes]:
+    offsets = np.zeros(len(strings) + 1, dtype='<u4')
+    np.cumsum([len(s) for s in strings], out=offsets[1:])
+    return offsets, b"".join(strings)
+
+
+def compile_catalog(foods: Iterable[Food], path) -> int:
+    """
+    Write foods to a catalog file (atomically, via a .partial file)
+
+    Returns:
+        The number of foods written
+    """
+    # Imported here so that opening a file doesn't load the database models
+    from .food_autocomplete import word_keys
+
+    foods = list(foods)
+    strings: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    columns: Dict[str, list] = {field: [] for field in RECORD_DTYPE.names}
+    folded_names = []
+    keys: List[Tuple[bytes, int]] = []
+    for index, food in enumerate(foods):
+        for nutrient in NUTRIENTS:
+            value = getattr(food, nutrient)
+            columns[nutrient].append(MISSING if value is None else round(value * 100))
+        columns['meal_type'].append(MEAL_TYPES.index(food.meal_type))
+        columns['meal_types'].append(sum(1 << MEAL_TYPES.index(m) for m in food.meal_types))
+        for field in ('id', 'name', 'serving', 'category', 'source'):
+            columns[field].append(intern(getattr(food, field) or ""))
+        folded = fold(food.name)
+        folded_names.append(folded.encode())
+        keys.extend((key.encode(), index) for key in word_keys(folded))
+
+    records = np.zeros(len(foods), dtype=RECORD_DTYPE)
+    for field, values in columns.items():
+        records[field] = values
+
+    string_offsets, string_blob = _pack_strings([s.encode() for s in strings])
+
+    # Open addressing by crc32 of the id, linear probing, at most half full
+    ids = [food.id.encode() for food in foods]
+    mask = (1 << max(len(foods) * 2, 1).bit_length()) - 1
+    id_slots = [0] * (mask + 1)
+    for index, food_id in enumerate(ids):
+        slot = zlib.crc32(food_id) & mask
+        while id_slots[slot]:
+            if ids[id_slots[slot] - 1] == food_id:
+                raise ValueError(f"Duplicate food id '{foods[index].id}'")
+            slot = (slot + 1) & mask
+        id_slots[slot] = index + 1
+
+    names = b"\n".join(folded_names)
+    name_offsets = np.zeros(len(foods), dtype='<u4')
+    if foods:
+        np.cumsum([len(n) + 1 for n in folded_names[:-1]], out=name_offsets[1:])
+
+    keys.sort()
+    key_offsets, key_blob = _pack_strings([key for key, _ in keys])
+    key_foods = np.array([index for _, index in keys], dtype='<u4')
+
+    sections = {
+        'records': records.tobytes(),
+        'string_offsets': string_offsets.tobytes(),
+        'string_blob': string_blob,
+        'id_slots': np.array(id_slots, dtype='<u4').tobytes(),
+        'name_offsets': name_offsets.tobytes(),
+        'names': names,
+        'key_offsets': key_offsets.tobytes(),
+        'key_blob': key_blob,
+        'key_foods': key_foods.tobytes(),
+    }
+
+    path = Path(path)
+    partial = path.with_name(path.name + ".partial")
+    table = []
+    position = _HEADER.size
+    for name in SECTIONS:
+        position += -position % 8
+        table += [position, len(sections[name])]
+        position += len(sections[name])
+
+    with open(partial, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(foods), *table))
+        for name, offset in zip(SECTIONS, table[::2]):
+            handle.write(b"\0" * (offset - handle.tell()))
+            handle.write(sections[name])
+    os.replace(partial, path)
+    return len(foods)
+
+
+class MappedFoodCatalog:
+    """
+    Read-only FoodCatalog over a compiled catalog file
+
+    Same lookups as FoodCatalog (get, by_category, by_meal_type, search,
+    iteration); Foods are decoded on access and not cached.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if sys.byteorder != 'little':
+            self._mmap.close()
+            raise ValueError("Food catalog files can only be read on little-endian machines")
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a food catalog file")
+        magic, version, count, *table = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} food catalog file")
+        self._count = count
+        self._sections = {name: (table[2 * i], table[2 * i + 1])
+                          for i, name in enumerate(SECTIONS)}
+
+        # numpy views for whole-column filters; memoryviews for single
+        # lookups, which index about ten times faster than numpy scalars
+        self._records = self._array('records', RECORD_DTYPE)
+        self._views = []
+        self._string_offsets = self._view('string_offsets')
+        self._id_slots = self._view('id_slots')
+        self._name_starts = self._view('name_offsets')
+        self._key_offsets = self._view('key_offsets')
+        self._key_foods = self._view('key_foods')
+        self._records_base = self._sections['records'][0]
+        self._string_base = self._sections['string_blob'][0]
+        self._names_base, self._names_length = self._sections['names']
+        self._key_base = self._sections['key_blob'][0]
+
+        # Meal types and the few category and source names, decoded once
+        self._meal_types: Dict[Tuple[int, int], Tuple[str, ...]] = {}
+        self._shared_strings: Dict[int, str] = {}
+
+        # Categories are few; map their names to string indexes once
+        categories = np.unique(self._records['category'])
+        self._categories = {fold(self._string(int(i))): int(i) for i in categories}
+        self.categories = tuple(sorted(self._string(i) for i in self._categories.values()))
+
+    def _array(self, section: str, dtype) -> np.ndarray:
+        offset, length = self._sections[section]
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self._mmap, dtype=dtype, count=length // dtype.itemsize, offset=offset)
+
+    def _view(self, section: str) -> memoryview:
+        """A uint32 section as a memoryview of native (little-endian) ints"""
+        offset, length = self._sections[section]
+        view = memoryview(self._mmap)[offset:offset + length]
+        self._views.append(view)
+        self._views.append(view.cast('I'))
+        return self._views[-1]
+
+    def _bytes(self, index: int) -> bytes:
+        offsets = self._string_offsets
+        return self._mmap[self._string_base + offsets[index]:self._string_base + offsets[index + 1]]
+
+    def _string(self, index: int) -> str:
+        return self._bytes(index).decode()
+
+    def _shared_string(self, index: int) -> str:
+        text = self._shared_strings.get(index)
+        if text is None:
+            text = self._shared_strings[index] = self._string(index)
+        return text
+
+    def _key(self, index: int) -> bytes:
+        offsets = self._key_offsets
+        return self._mmap[self._key_base + offsets[index]:self._key_base + offsets[index + 1]]
+
+    def _folded_name(self, index: int) -> bytes:
+        start = self._name_starts[index]
+        end = self._name_starts[index + 1] - 1 if index + 1 < self._count else self._names_length
+        return self._mmap[self._names_base + start:self._names_base + end]
+
+    def _food_id(self, index: int) -> int:
+        """String table index of a food's id"""
+        return _UINT32.unpack_from(self._mmap, self._records_base + index * _RECORD.size + _ID_OFFSET)[0]
+
+    def close(self):
+        """Unmap the file; the catalog can't be used afterwards"""
+        self._records = None
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Food:
+        if not 0 <= index < self._count:
+            raise IndexError("food index out of range")
+        *nutrients, primary, mask, food_id, name, serving, category, source = \
+            _RECORD.unpack_from(self._mmap, self._records_base + index * _RECORD.size)
+        calories, protein, carbs, fat, fiber, sugar = [
+            None if value == MISSING else value / 100 for value in nutrients]
+        meal_types = self._meal_types.get((primary, mask))
+        if meal_types is None:
+            meal_types = self._meal_types[primary, mask] = (MEAL_TYPES[primary],) + tuple(
+                meal_type for bit, meal_type in enumerate(MEAL_TYPES)
+                if mask & (1 << bit) and bit != primary
+            )
+        return Food(
+            id=self._string(food_id), name=self._string(name),
+            category=self._shared_string(category), meal_types=meal_types,
+            calories=calories, protein=protein, carbs=carbs, fat=fat, fiber=fiber,
+            serving=self._string(serving), sugar=sugar, source=self._shared_string(source),
+        )
+
+    def __iter__(self) -> Iterator[Food]:
+        return (self[i] for i in range(self._count))
+
+    def get(self, food_id: str) -> Optional[Food]:
+        target = food_id.encode()
+        slots = self._id_slots
+        mask = len(slots) - 1
+        slot = zlib.crc32(target) & mask
+        while slots[slot]:
+            index = slots[slot] - 1
+            if self._bytes(self._food_id(index)) == target:
+                return self[index]
+            slot = (slot + 1) & mask
+        return None
+
+    def by_category(self, category: str) -> Tuple[Food, ...]:
+        index = self._categories.get(fold(category))
+        if index is None:
+            return ()
+        return tuple(self[int(i)] for i in np.flatnonzero(self._records['category'] == index))
+
+    def by_meal_type(self, meal_type: str) -> Tuple[Food, ...]:
+        """Foods for a meal type or label ('snack', 'Snacks', 'Lunch/Dinner')"""
+        try:
+            mask = sum(1 << MEAL_TYPES.index(m) for m in parse_meal_types(meal_type))
+        except ValueError:
+            return ()
+        return tuple(self[int(i)] for i in np.flatnonzero(self._records['meal_types'] & mask))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Food]:
+        """Foods whose name contains query (case- and accent-insensitive), in catalog order"""
+        if limit is not None and limit <= 0:
+            return []
+        query = fold(query).encode()
+        if not query:
+            return [self[i] for i in range(min(limit or self._count, self._count))]
+
+        results = []
+        start, end = self._names_base, self._names_base + self._names_length
+        position = self._mmap.find(query, start, end)
+        while position != -1:
+            index = bisect_right(self._name_starts, position - start) - 1
+            results.append(self[index])
+            if len(results) == limit or index + 1 == self._count:
+                break
+            position = self._mmap.find(query, start + self._name_starts[index + 1], end)
+        return results
+
+    def _first_key(self, target: bytes) -> int:
+        low, high = 0, len(self._key_foods)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def iter_prefix(self, prefix: str) -> Iterator[Food]:
+        """Foods with a name word starting with the folded prefix, in key order"""
+        target = prefix.encode()
+        position = self._first_key(target)
+        while position < len(self._key_foods) and self._key(position).startswith(target):
+            yield self[self._key_foods[position]]
+            position += 1
+
+    def by_name(self, name: str) -> Optional[Food]:
+        """The first food whose folded name equals the folded name"""
+        target = fold(name).encode()
+        position = self._first_key(target)
+        while position < len(self._key_foods) and self._key(position) == target:
+            index = self._key_foods[position]
+            if self._folded_name(index) == target:
+                return self[index]
+            position += 1
+        return None
@@ -2,9 +2,19 @@
 Food Database - Indonesian & International Foods
 File: src/database/food_data.py
 
-Comprehensive food database with nutrition information
+Comprehensive food database with nutrition information. The lookup
+functions below are served by the unified FoodCatalog (food_catalog.py),
+which also includes the foods of data/food_database.py, and its fuzzy
+index (food_fuzzy.py).
+
+Importing the module only defines FOOD_DATABASE: the catalog, the fuzzy
+index (and numpy) and the quick access lists are built on first use.
 """
 
+from types import MappingProxyType
+
+from .food_catalog import get_catalog
+
 FOOD_DATABASE = {
     # Indonesian Foods - Breakfast
     "nasi_goreng": {
@@ -341,59 +351,71 @@ FOOD_DATABASE = {
 }
 
 
+
 def search_food(query):
-    """Search food by name"""
-    query = query.lower()
-    results = []
-    
-    for food_id, food_data in FOOD_DATABASE.items():
-        if query in food_data["name"].lower():
-            results.append({
-                "id": food_id,
-                **food_data
-            })
-    
-    return results
+    """
+    Search food by name (case- and accent-insensitive)
 
+    Falls back to search_food_fuzzy() when no name contains the query,
+    so typos and English/Indonesian names still find something.
+    """
+    foods = [food.to_dict() for food in get_catalog().search(query)]
+    return foods or search_food_fuzzy(query)
+
+
+def search_food_fuzzy(query, limit=10):
+    """Typo-tolerant, bilingual search; foods best first with a 'score' (0-1)"""
+    from .food_fuzzy import get_fuzzy_index
 
-def get_food_by_category(category):
-    """Get foods by category"""
     return [
-        {"id": food_id, **food_data}
-        for food_id, food_data in FOOD_DATABASE.items()
-        if food_data["category"] == category
+        dict(match.food.to_dict(), score=match.score)
+        for match in get_fuzzy_index().search(query, limit)
     ]
 
 
+def get_food_by_category(category):
+    """Get foods by category"""
+    return [food.to_dict() for food in get_catalog().by_category(category)]
+
+
 def get_food_by_meal_type(meal_type):
     """Get foods by meal type"""
-    return [
-        {"id": food_id, **food_data}
-        for food_id, food_data in FOOD_DATABASE.items()
-        if food_data["meal_type"] == meal_type
-    ]
+    return [food.to_dict() for food in get_catalog().by_meal_type(meal_type)]
 
 
 def get_all_foods():
     """Get all foods"""
-    return [
-        {"id": food_id, **food_data}
-        for food_id, food_data in FOOD_DATABASE.items()
-    ]
+    return [food.to_dict() for food in get_catalog()]
 
 
 def get_food_by_id(food_id):
     """Get food details by ID"""
-    return FOOD_DATABASE.get(food_id)
+    food = get_catalog().get(food_id)
+    return food.to_dict() if food else None
+
+
+# Quick access lists, built by __getattr__ on first access and cached as
+# module attributes: tuples of read-only food mappings, shared by callers
+_QUICK_ACCESS = {
+    "INDONESIAN_FOODS": (get_food_by_category, "Indonesian"),
+    "WESTERN_FOODS": (get_food_by_category, "Western"),
+    "FRUITS": (get_food_by_category, "Fruit"),
+    "BEVERAGES": (get_food_by_category, "Beverage"),
+    "BREAKFAST_FOODS": (get_food_by_meal_type, "breakfast"),
+    "LUNCH_FOODS": (get_food_by_meal_type, "lunch"),
+    "DINNER_FOODS": (get_food_by_meal_type, "dinner"),
+    "SNACK_FOODS": (get_food_by_meal_type, "snack"),
+}
+
 
+def __getattr__(name):
+    if name not in _QUICK_ACCESS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    lookup, key = _QUICK_ACCESS[name]
+    foods = tuple(MappingProxyType(food) for food in lookup(key))
+    globals()[name] = foods
+    return foods
 
-# Quick access lists
-INDONESIAN_FOODS = get_food_by_category("Indonesian")
-WESTERN_FOODS = get_food_by_category("Western")
-FRUITS = get_food_by_category("Fruit")
-BEVERAGES = get_food_by_category("Beverage")
 
-BREAKFAST_FOODS = get_food_by_meal_type("breakfast")
-LUNCH_FOODS = get_food_by_meal_type("lunch")
-DINNER_FOODS = get_food_by_meal_type("dinner")
-SNACK_FOODS = get_food_by_meal_type("snack")
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_QUICK_ACCESS))
@@ -0,0 +1,216 @@
+"""
+Fuzzy Food Search
+File: src/database/food_fuzzy.py
+
+Typo-tolerant, bilingual search over the FoodCatalog ("rendag",
+"nasi goremg", "satay", "chicken" for Ayam ...). Names are split into
+words; the distinct words of the catalog get a character trigram index,
+and every word a posting array of the foods that contain it.
+
+A query word is expanded with its FOOD_SYNONYMS group, matched against
+the word vocabulary by trigram (Dice) similarity, and each food scores
+the best similarity it has for that query word. A food's score is the
+mean over the query words, slightly lowered for extra words in its name
+so "Sate Ayam" ranks above "Sate Ayam Madura". Scoring runs on numpy
+arrays, so the cost grows with the matching postings, not Python loops
+over the catalog.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .food_catalog import Food, FoodCatalog, fold, get_catalog
+
+
+# Indonesian / English words that name the same food or ingredient
+FOOD_SYNONYMS = (
+    ('ayam', 'chicken'),
+    ('telur', 'telor', 'egg', 'eggs'),
+    ('sate', 'satay', 'skewer'),
+    ('nasi', 'rice'),
+    ('mie', 'mi', 'noodle', 'noodles'),
+    ('ikan', 'fish'),
+    ('lele', 'catfish'),
+    ('udang', 'shrimp', 'prawn'),
+    ('sapi', 'beef'),
+    ('daging', 'meat'),
+    ('kambing', 'mutton', 'goat'),
+    ('sayur', 'sayuran', 'vegetable', 'vegetables', 'veggies'),
+    ('goreng', 'fried'),
+    ('bakar', 'grilled'),
+    ('rebus', 'boiled'),
+    ('bubur', 'porridge', 'congee'),
+    ('sup', 'soto', 'soup'),
+    ('roti', 'bread', 'toast'),
+    ('kentang', 'potato'),
+    ('tahu', 'tofu'),
+    ('kacang', 'nuts', 'peanut', 'peanuts'),
+    ('pisang', 'banana'),
+    ('apel', 'apple'),
+    ('jeruk', 'orange'),
+    ('mangga', 'mango'),
+    ('alpukat', 'avocado'),
+    ('susu', 'milk'),
+    ('kopi', 'coffee'),
+    ('teh', 'tea'),
+    ('jus', 'juice'),
+    ('air', 'water'),
+    ('manis', 'sweet'),
+    ('pedas', 'spicy'),
+    ('keju', 'cheese'),
+    ('salad', 'selada'),
+)
+
+# Words that say nothing about the food
+STOP_WORDS = frozenset(('with', 'and', 'the', 'of', 'dengan', 'dan', 'pakai', 'set'))
+
+MIN_WORD_SIMILARITY = 0.45  # Dice of trigram sets; "goremg"/"goreng" is 0.57
+MIN_SYNONYM_SIMILARITY = 0.6  # a query word this close to a synonym gets its group
+SYNONYM_WEIGHT = 0.95  # the word as typed ranks above its translation
+MIN_SCORE = 0.5  # mean word similarity, before the extra-word penalty
+EXTRA_WORD_PENALTY = 0.03  # per name word beyond the query's, up to MAX_EXTRA_WORDS
+MAX_EXTRA_WORDS = 5
+DEFAULT_LIMIT = 10
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def words(text: str) -> List[str]:
+    """Distinct folded words of a name or query, in order, without stop words"""
+    return list(dict.fromkeys(w for w in _WORD.findall(fold(text)) if w not in STOP_WORDS))
+
+
+def trigrams(word: str) -> Set[str]:
+    """Character trigrams of a word padded with two leading and one trailing blank"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: Set[str], b: Set[str]) -> float:
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+def _synonym_groups(groups: Iterable[Tuple[str, ...]]) -> Dict[str, Tuple[str, ...]]:
+    lookup: Dict[str, Set[str]] = {}
+    for group in groups:
+        members = set(group)
+        for word in group:
+            lookup.setdefault(word, set()).update(members)
+    return {word: tuple(sorted(members)) for word, members in lookup.items()}
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    """A food and how well it matches the query (0..1)"""
+    food: Food
+    score: float
+
+
+class FuzzyFoodIndex:
+    """Word trigram index and word -> food postings over a FoodCatalog"""
+
+    def __init__(self, catalog: Optional[FoodCatalog] = None,
+                 synonyms: Iterable[Tuple[str, ...]] = FOOD_SYNONYMS):
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self._foods = list(self.catalog)
+        self._synonyms = _synonym_groups(synonyms)
+        self._synonym_trigrams = {word: trigrams(word) for word in self._synonyms}
+
+        postings: Dict[str, List[int]] = {}
+        word_counts = np.empty(len(self._foods), dtype=np.int16)
+        for index, food in enumerate(self._foods):
+            food_words = words(food.name)
+            word_counts[index] = len(food_words)
+            for word in food_words:
+                postings.setdefault(word, []).append(index)
+
+        self._vocabulary = list(postings)
+        self._postings = [np.array(postings[word], dtype=np.int32) for word in self._vocabulary]
+        self._trigram_counts = np.array([len(trigrams(word)) for word in self._vocabulary],
+                                        dtype=np.int32)
+        self._word_ids = {word: i for i, word in enumerate(self._vocabulary)}
+        by_trigram: Dict[str, List[int]] = {}
+        for word_id, word in enumerate(self._vocabulary):
+            for trigram in trigrams(word):
+                by_trigram.setdefault(trigram, []).append(word_id)
+        self._by_trigram = {trigram: np.array(ids, dtype=np.int32)
+                            for trigram, ids in by_trigram.items()}
+
+        self._extra_word_penalty = EXTRA_WORD_PENALTY * np.minimum(word_counts, MAX_EXTRA_WORDS)
+
+    def _variants(self, word: str) -> Dict[str, float]:
+        """The word and its synonyms -> weight; a misspelt synonym ("satey") counts too"""
+        variants = {word: 1.0}
+        grams = trigrams(word)
+        for synonym, synonym_grams in self._synonym_trigrams.items():
+            similarity = 1.0 if synonym == word else _dice(grams, synonym_grams)
+            if similarity >= MIN_SYNONYM_SIMILARITY:
+                for member in self._synonyms[synonym]:
+                    weight = similarity * (1.0 if member == word else SYNONYM_WEIGHT)
+                    variants[member] = max(variants.get(member, 0.0), weight)
+        return variants
+
+    def similar_words(self, word: str) -> Dict[int, float]:
+        """Vocabulary word ids similar to word or a synonym of it -> best similarity"""
+        best: Dict[int, float] = {}
+        for variant, weight in self._variants(word).items():
+            exact = self._word_ids.get(variant)
+            if exact is not None:
+                best[exact] = max(best.get(exact, 0.0), weight)
+            grams = trigrams(variant)
+            postings = [self._by_trigram[g] for g in grams if g in self._by_trigram]
+            if not postings:
+                continue
+            # Shared trigram count of every vocabulary word in one pass
+            shared = np.bincount(np.concatenate(postings), minlength=len(self._vocabulary))
+            similarity = weight * 2.0 * shared / (len(grams) + self._trigram_counts)
+            for word_id in np.flatnonzero(similarity >= MIN_WORD_SIMILARITY):
+                if similarity[word_id] > best.get(word_id, 0.0):
+                    best[int(word_id)] = float(similarity[word_id])
+        return best
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT,
+               min_score: float = MIN_SCORE) -> List[FuzzyMatch]:
+        """Foods matching the query, best first, with scores from 0 to 1"""
+        query_words = words(query)
+        if not query_words or limit < 1:
+            return []
+
+        scores = np.zeros(len(self._foods), dtype=np.float32)
+        for word in query_words:
+            best = np.zeros(len(self._foods), dtype=np.float32)
+            for word_id, similarity in self.similar_words(word).items():
+                postings = self._postings[word_id]
+                best[postings] = np.maximum(best[postings], similarity)
+            scores += best
+
+        # Mean over query words, minus a little per name word beyond them
+        scores /= len(query_words)
+        candidates = np.flatnonzero(scores >= min_score)
+        if not candidates.size:
+            return []
+        extra = self._extra_word_penalty[candidates] - EXTRA_WORD_PENALTY * min(
+            len(query_words), MAX_EXTRA_WORDS)
+        ranked = scores[candidates] - np.maximum(extra, 0.0)
+
+        if candidates.size > limit:
+            top = np.argpartition(-ranked, limit - 1)[:limit]
+        else:
+            top = np.arange(candidates.size)
+        # Best score first, catalog order among equals
+        top = top[np.lexsort((candidates[top], -ranked[top]))]
+        return [FuzzyMatch(self._foods[candidates[i]], round(float(ranked[i]), 3)) for i in top]
+
+
+_index: Optional[FuzzyFoodIndex] = None
+
+
+def get_fuzzy_index() -> FuzzyFoodIndex:
+    """Fuzzy index over the built-in catalog, built on first use"""
+    global _index
+    if _index is None:
+        _index = FuzzyFoodIndex()
+    return _index
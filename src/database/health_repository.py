@@ -0,0 +1,86 @@
+"""
+Health Repository
+File: src/database/health_repository.py
+
+Vitals (weight, blood pressure, heart rate, blood sugar) for the Health
+page, stored in health_records. The repository keeps one connection for
+its lifetime so the GUI thread doesn't reconnect on every call, and
+returns plain dicts ready for the table and chart.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam, insert, or_, select
+
+from .history_repository import (
+    DEFAULT_PAGE_SIZE, HistoryPage, HistoryRepository, KeysetQuery, PageCursor, utc_to_local
+)
+from .models import HealthRecord
+
+
+VITALS_COLUMNS = (
+    HealthRecord.id,
+    HealthRecord.recorded_at,
+    HealthRecord.weight,
+    HealthRecord.blood_pressure_systolic,
+    HealthRecord.blood_pressure_diastolic,
+    HealthRecord.heart_rate,
+    HealthRecord.blood_sugar,
+    HealthRecord.notes,
+)
+
+# Manual vitals entries; device samples only carry steps/heart rate.
+# Served by the partial index ix_health_records_user_vitals (same terms).
+HAS_VITALS = or_(
+    HealthRecord.weight.isnot(None),
+    HealthRecord.blood_pressure_systolic.isnot(None),
+    HealthRecord.blood_sugar.isnot(None),
+)
+
+
+VITALS_QUERY = KeysetQuery(
+    select(*VITALS_COLUMNS).where(HealthRecord.user_id == bindparam('user_id'), HAS_VITALS),
+    HealthRecord.recorded_at, HealthRecord.id,
+)
+
+
+def _vitals_dict(row) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "recorded_at": utc_to_local(row.recorded_at).strftime("%Y-%m-%d %H:%M"),
+        "weight": row.weight,
+        "systolic": row.blood_pressure_systolic,
+        "diastolic": row.blood_pressure_diastolic,
+        "heart_rate": row.heart_rate,
+        "blood_sugar": row.blood_sugar,
+        "notes": row.notes,
+    }
+
+
+class HealthRepository(HistoryRepository):
+    """Vitals storage for the Health page"""
+
+    def vitals_page(self, cursor: Optional[PageCursor] = None,
+                    page_size: int = DEFAULT_PAGE_SIZE) -> HistoryPage:
+        """One page of vitals entries, newest first; pass next_cursor for older ones"""
+        with self._conn.begin():
+            return VITALS_QUERY.page(self._conn, {'user_id': self.user_id},
+                                     cursor, page_size, _vitals_dict)
+
+    def add_vitals(self, weight: float, systolic: int, diastolic: int,
+                   heart_rate: int, blood_sugar: float,
+                   notes: Optional[str] = None) -> Dict[str, Any]:
+        """Insert one vitals entry and return it in vitals_page() row format"""
+        stmt = insert(HealthRecord).values(
+            user_id=self.user_id,
+            recorded_at=datetime.utcnow(),
+            weight=weight,
+            blood_pressure_systolic=systolic,
+            blood_pressure_diastolic=diastolic,
+            heart_rate=heart_rate,
+            blood_sugar=blood_sugar,
+            notes=notes,
+        ).returning(*VITALS_COLUMNS)
+        with self._conn.begin():
+            return _vitals_dict(self._conn.execute(stmt).one())
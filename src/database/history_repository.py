@@ -0,0 +1,181 @@
+"""
+History Repository
+File: src/database/history_repository.py
+
+Keyset pagination over the log tables. Pages are ordered newest first by
+(timestamp, id) and the next page starts strictly after the last row seen,
+so page N is one index range scan of page_size rows instead of an OFFSET
+that walks every earlier row.
+
+Page statements are built once per listing (KeysetQuery) with bound
+parameters, so scrolling reuses the compiled SQL instead of rebuilding
+the statement for every page.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import bindparam, insert, select, tuple_
+
+from . import connection
+from .models import User, HealthRecord, NutritionLog, ActivityLog, SleepRecord
+
+
+# History kind -> (model, timestamp column the history is ordered by)
+HISTORY_SOURCES = {
+    'health': (HealthRecord, HealthRecord.recorded_at),
+    'nutrition': (NutritionLog, NutritionLog.logged_at),
+    'activity': (ActivityLog, ActivityLog.activity_date),
+    'sleep': (SleepRecord, SleepRecord.sleep_start),
+}
+
+DEFAULT_PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Position after the last row of a page: its (timestamp, id)"""
+    timestamp: datetime
+    id: int
+
+
+@dataclass(frozen=True)
+class HistoryPage:
+    """One page of history rows, newest first"""
+    rows: List[Dict[str, Any]]
+    next_cursor: Optional[PageCursor]  # None on the last page
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def utc_to_local(value: datetime) -> datetime:
+    """Convert a naive UTC timestamp from the database to naive local time"""
+    return value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+class KeysetQuery:
+    """
+    A listing ordered by (ts_column, id_column) descending, paged by keyset
+
+    stmt must select ts_column and id_column and may use bound parameters
+    that are passed to page(). The first-page and next-page statements
+    are built here once; one extra row is fetched per page to know
+    whether another page exists without a COUNT query.
+    """
+
+    def __init__(self, stmt, ts_column, id_column):
+        self.ts_key = ts_column.key
+        self.id_key = id_column.key
+        order = (ts_column.desc(), id_column.desc())
+        limit = bindparam('limit')
+        after = tuple_(ts_column, id_column) < tuple_(
+            bindparam('cursor_ts', type_=ts_column.type),
+            bindparam('cursor_id', type_=id_column.type),
+        )
+        self.first = stmt.order_by(*order).limit(limit)
+        self.after = stmt.where(after).order_by(*order).limit(limit)
+
+    def page(self, conn, params: Dict[str, Any],
+             cursor: Optional[PageCursor] = None,
+             page_size: int = DEFAULT_PAGE_SIZE,
+             to_dict: Optional[Callable] = None) -> HistoryPage:
+        """Run one page; params are the values of stmt's own bound parameters"""
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        params = dict(params, limit=page_size + 1)
+        if cursor is None:
+            stmt = self.first
+        else:
+            stmt = self.after
+            params.update(cursor_ts=cursor.timestamp, cursor_id=cursor.id)
+
+        rows = conn.execute(stmt, params).all()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]._mapping
+            next_cursor = PageCursor(last[self.ts_key], last[self.id_key])
+
+        to_dict = to_dict or (lambda row: dict(row._mapping))
+        return HistoryPage(rows=[to_dict(row) for row in rows], next_cursor=next_cursor)
+
+
+# History kind -> KeysetQuery over all columns of one user's rows
+HISTORY_QUERIES = {
+    kind: KeysetQuery(
+        select(*model.__table__.columns).where(model.user_id == bindparam('user_id')),
+        ts_column, model.id,
+    )
+    for kind, (model, ts_column) in HISTORY_SOURCES.items()
+}
+
+
+class ConnectionRepository:
+    """
+    One user's pooled connection, held for the repository's lifetime
+
+    Base for repositories that serve a page; close() returns the
+    connection to the pool.
+    """
+
+    def __init__(self, user_id: Optional[int] = None):
+        if connection.engine is None:
+            connection.init_database()
+        self._conn = connection.engine.connect()
+        self.user_id = user_id or self.ensure_default_user()
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def ensure_default_user(self) -> int:
+        """Id of the first user, creating a local profile if there is none"""
+        with self._conn.begin():
+            user_id = self._conn.execute(select(User.id).order_by(User.id).limit(1)).scalar()
+            if user_id is None:
+                now = datetime.utcnow()
+                user_id = self._conn.execute(
+                    insert(User).values(full_name="Local User", created_at=now, updated_at=now)
+                ).inserted_primary_key[0]
+        return user_id
+
+
+class HistoryRepository(ConnectionRepository):
+    """Paged, newest-first history of one user's log tables"""
+
+    def fetch_page(self, kind: str,
+                   cursor: Optional[PageCursor] = None,
+                   page_size: int = DEFAULT_PAGE_SIZE) -> HistoryPage:
+        """
+        Get one page of 'health', 'nutrition', 'activity' or 'sleep' history
+
+        Args:
+            kind: Key of HISTORY_SOURCES
+            cursor: next_cursor of the previous page, None for the newest page
+            page_size: Rows per page
+
+        Rows are dicts of the table's columns with timestamps in UTC.
+        """
+        if kind not in HISTORY_SOURCES:
+            raise ValueError(f"Unknown history '{kind}', expected one of {tuple(HISTORY_SOURCES)}")
+
+        with self._conn.begin():
+            return HISTORY_QUERIES[kind].page(self._conn, {'user_id': self.user_id},
+                                              cursor, page_size)
+
+    def iter_pages(self, kind: str,
+                   page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[HistoryPage]:
+        """Walk the whole history page by page, newest first"""
+        cursor = None
+        while True:
+            page = self.fetch_page(kind, cursor, page_size)
+            yield page
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
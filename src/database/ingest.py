@@ -0,0 +1,267 @@
+"""
+Bulk Device Ingestion
+File: src/database/ingest.py
+
+Validates batches of smartwatch samples and writes them to HealthRecord /
+ActivityLog with a compiled Core INSERT run through executemany inside a
+single transaction. Samples are keyed on (user_id, device_id, timestamp),
+so re-syncing the same window updates rows instead of duplicating them.
+Rows get their local_date here, since the DBAPI executemany skips the
+model's column default.
+"""
+
+import math
+import operator
+import time
+from operator import itemgetter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import connection
+from .local_dates import get_user_timezone, to_local_date
+from .models import HealthRecord, ActivityLog
+from .query_stats import query_context
+
+
+# Allowed fields per target and their (type, min, max) validation rules
+HEALTH_SAMPLE_FIELDS = {
+    'steps': (int, 0, 100000),
+    'calories_burned': (int, 0, 20000),
+    'distance_km': (float, 0.0, 500.0),
+    'heart_rate': (int, 20, 250),
+    'blood_pressure_systolic': (int, 50, 260),
+    'blood_pressure_diastolic': (int, 30, 200),
+    'blood_sugar': (float, 10.0, 1000.0),
+    'sleep_hours': (float, 0.0, 24.0),
+    'water_intake': (int, 0, 10000),
+    'notes': (str, None, None),
+}
+
+ACTIVITY_SAMPLE_FIELDS = {
+    'activity_type': (str, None, None),
+    'duration_minutes': (int, 0, 24 * 60),
+    'distance_km': (float, 0.0, 500.0),
+    'calories_burned': (int, 0, 20000),
+    'avg_heart_rate': (int, 20, 250),
+    'max_heart_rate': (int, 20, 250),
+    'steps': (int, 0, 200000),
+    'notes': (str, None, None),
+}
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+@dataclass
+class IngestResult:
+    """Outcome of one bulk ingest call"""
+    table: str
+    received: int = 0
+    written: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (sample index, reason)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.written / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.table}: {self.written:,}/{self.received:,} rows written, "
+                f"{self.rejected:,} rejected, {self.rows_per_second:,.0f} rows/s")
+
+
+def parse_timestamp(value) -> datetime:
+    """
+    Normalize a device timestamp to a naive UTC datetime
+
+    Accepts datetime objects, ISO-8601 strings and Unix epoch seconds.
+    Aware datetimes are converted to UTC, matching the datetime.utcnow
+    defaults used by the models.
+    """
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+    elif isinstance(value, str):
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    else:
+        raise ValueError(f"unsupported timestamp {value!r}")
+
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _to_int(key: str, value) -> int:
+    """int of a whole number; int() would silently truncate 72.9 to 72"""
+    if isinstance(value, float):
+        if not math.isfinite(value) or not value.is_integer():
+            raise ValueError(f"{key}={value} is not a whole number")
+        return int(value)
+    if isinstance(value, str):
+        return int(value)
+    return operator.index(value)
+
+
+def _validate(sample: Dict[str, Any], rules) -> Dict[str, Any]:
+    row = {}
+    for key, value in sample.items():
+        if key == 'timestamp' or value is None:
+            continue
+        rule = rules.get(key)
+        if rule is None:
+            raise ValueError(f"unknown field '{key}'")
+        kind, low, high = rule
+        if kind is str:
+            value = str(value)
+        else:
+            value = _to_int(key, value) if kind is int else float(value)
+            # NaN compares False with everything, so it would pass the range check
+            if not math.isfinite(value):
+                raise ValueError(f"{key}={value} is not a finite number")
+            if value < low or value > high:
+                raise ValueError(f"{key}={value} outside {low}..{high}")
+        row[key] = value
+    return row
+
+
+def _prepare(samples, user_id, device_id, ts_column, rules, required, tz, result):
+    rows = []
+    for index, sample in enumerate(samples):
+        result.received += 1
+        try:
+            if 'timestamp' not in sample:
+                raise ValueError("missing timestamp")
+            row = _validate(sample, rules)
+            for name in required:
+                if name not in row:
+                    raise ValueError(f"missing {name}")
+            row['user_id'] = user_id
+            row['device_id'] = device_id
+            timestamp = parse_timestamp(sample['timestamp'])
+            row[ts_column] = _to_db_value(timestamp)
+            row['local_date'] = _to_db_value(to_local_date(timestamp, tz))
+            rows.append(row)
+        except (TypeError, ValueError) as e:
+            result.rejected += 1
+            result.errors.append((index, str(e)))
+    return rows
+
+
+def _python_defaults(table, columns) -> Dict[str, Any]:
+    """Values for Python-side column defaults the rows don't set"""
+    defaults = {}
+    for column in table.columns:
+        if column.name in columns or column.default is None or column.primary_key:
+            continue
+        arg = column.default.arg
+        defaults[column.name] = arg(None) if callable(arg) else arg
+    return defaults
+
+
+def _to_db_value(value):
+    # Same text format SQLAlchemy's SQLite DateTime/Date types store
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='microseconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _write(model, ts_column, rows, upsert, batch_size):
+    """
+    Write rows in one transaction, grouped by column set
+
+    The INSERT is compiled once per column set and run through the DBAPI
+    executemany with pre-converted tuples, skipping SQLAlchemy's per-row
+    parameter processing.
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    table = model.__table__
+    with connection.engine.begin() as conn:
+        for columns, group in groups.items():
+            defaults = _python_defaults(table, columns)
+            stmt = sqlite_insert(table)
+            if upsert:
+                updates = {
+                    name: stmt.excluded[name]
+                    for name in columns
+                    if name not in ('user_id', 'device_id', ts_column)
+                }
+                conflict = ['user_id', 'device_id', ts_column]
+                stmt = (stmt.on_conflict_do_update(index_elements=conflict, set_=updates)
+                        if updates else stmt.on_conflict_do_nothing(index_elements=conflict))
+
+            compiled = stmt.compile(dialect=conn.dialect,
+                                    column_keys=list(columns) + list(defaults))
+            fixed = {name: _to_db_value(value) for name, value in defaults.items()}
+            getter = itemgetter(*compiled.positiontup)
+            params = []
+            for row in group:
+                row.update(fixed)
+                params.append(getter(row))
+            for start in range(0, len(params), batch_size):
+                conn.exec_driver_sql(str(compiled), params[start:start + batch_size])
+
+
+def _ingest(model, ts_column, rules, required, user_id, device_id, samples,
+            upsert, batch_size) -> IngestResult:
+    if connection.engine is None:
+        connection.init_database()
+    if not device_id:
+        raise ValueError("device_id is required for bulk ingestion")
+
+    result = IngestResult(table=model.__tablename__)
+    started = time.perf_counter()
+
+    with connection.engine.connect() as conn:
+        tz = get_user_timezone(conn, user_id)
+    rows = _prepare(samples, user_id, device_id, ts_column, rules, required, tz, result)
+    if rows:
+        with query_context("sync"):
+            _write(model, ts_column, rows, upsert, batch_size)
+    result.written = len(rows)
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def ingest_health_samples(user_id: int,
+                          device_id: str,
+                          samples: Iterable[Dict[str, Any]],
+                          upsert: bool = True,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> IngestResult:
+    """
+    Bulk insert device samples into health_records
+
+    Each sample is a dict with a 'timestamp' plus any HEALTH_SAMPLE_FIELDS.
+    Invalid samples are skipped and reported in IngestResult.errors; the
+    valid ones are written in a single transaction.
+
+    Args:
+        upsert: Update existing rows with the same (user_id, device_id,
+            timestamp) instead of failing on the unique key
+    """
+    return _ingest(HealthRecord, 'recorded_at', HEALTH_SAMPLE_FIELDS, (),
+                   user_id, device_id, samples, upsert, batch_size)
+
+
+def ingest_activity_samples(user_id: int,
+                            device_id: str,
+                            samples: Iterable[Dict[str, Any]],
+                            upsert: bool = True,
+                            batch_size: int = DEFAULT_BATCH_SIZE) -> IngestResult:
+    """
+    Bulk insert device activity sessions into activity_logs
+
+    Each sample needs a 'timestamp' (session start) and 'activity_type';
+    other keys must be in ACTIVITY_SAMPLE_FIELDS.
+    """
+    return _ingest(ActivityLog, 'activity_date', ACTIVITY_SAMPLE_FIELDS, ('activity_type',),
+                   user_id, device_id, samples, upsert, batch_size)
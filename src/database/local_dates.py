@@ -0,0 +1,104 @@
+"""
+Local Dates
+File: src/database/local_dates.py
+
+Timestamps are stored as naive UTC, but pages bucket by the user's local
+day. Each log table therefore persists a local_date column, computed from
+the user's timezone (users.timezone, an IANA name such as 'Asia/Jakarta';
+NULL means the system timezone) when the row is inserted, so "today" and
+"this week" are index lookups on local_date instead of UTC ranges.
+"""
+
+from datetime import date, datetime, timezone, tzinfo
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# user_id -> tzinfo (None = system timezone); cleared by init_database()
+_user_timezones: Dict[int, Optional[tzinfo]] = {}
+
+
+def resolve_timezone(name: Optional[str]) -> Optional[tzinfo]:
+    """ZoneInfo for an IANA name; None (system timezone) for an empty name"""
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone '{name}'") from e
+
+
+def to_local_date(value, tz: Optional[tzinfo] = None) -> Optional[date]:
+    """
+    Local calendar day of a naive UTC timestamp
+
+    Accepts datetimes and the text SQLite stores them as. tz None uses the
+    system timezone, like history_repository.utc_to_local().
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=timezone.utc).astimezone(tz).date()
+
+
+def local_to_utc(value: datetime, tz: Optional[tzinfo] = None) -> datetime:
+    """Naive UTC timestamp of a naive local time in tz (system timezone if None)"""
+    local = value.replace(tzinfo=tz) if tz is not None else value.astimezone()
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utc_to_local(value: datetime, tz: Optional[tzinfo] = None) -> datetime:
+    """Naive local time in tz (system timezone if None) of a naive UTC timestamp"""
+    return value.replace(tzinfo=timezone.utc).astimezone(tz).replace(tzinfo=None)
+
+
+def local_today(tz: Optional[tzinfo] = None) -> date:
+    """Current day in tz (system timezone if None)"""
+    return datetime.now(tz).date() if tz is not None else date.today()
+
+
+def get_user_timezone(conn, user_id: int) -> Optional[tzinfo]:
+    """Timezone of a user, cached; conn is an open SQLAlchemy connection"""
+    try:
+        return _user_timezones[user_id]
+    except KeyError:
+        pass
+    name = conn.exec_driver_sql("SELECT timezone FROM users WHERE id = ?", (user_id,)).scalar()
+    tz = _user_timezones[user_id] = resolve_timezone(name)
+    return tz
+
+
+def clear_timezone_cache(user_id: Optional[int] = None):
+    """Forget cached user timezones (all users if user_id is None)"""
+    if user_id is None:
+        _user_timezones.clear()
+    else:
+        _user_timezones.pop(user_id, None)
+
+
+def local_date_default(ts_column: str):
+    """
+    Column default computing local_date from ts_column at insert time
+
+    Runs for ORM flushes and Core insert() alike. Bulk writers that go
+    straight to the DBAPI (ingest.py) set local_date themselves.
+    """
+    def default(context):
+        params = context.get_current_parameters()
+        value = params.get(ts_column)
+        if value is None or params.get('user_id') is None:
+            return None
+        return to_local_date(value, get_user_timezone(context.connection, params['user_id']))
+
+    return default
+
+
+def sql_local_date(ts_text: Optional[str], tz_name: Optional[str]) -> Optional[str]:
+    """to_local_date(ts, timezone) SQL function for backfills, see register_sql_function()"""
+    day = to_local_date(ts_text, resolve_timezone(tz_name))
+    return day.isoformat() if day else None
+
+
+def register_sql_function(dbapi_connection):
+    """Make to_local_date(ts, timezone) callable from SQL on one DBAPI connection"""
+    dbapi_connection.create_function("to_local_date", 2, sql_local_date, deterministic=True)
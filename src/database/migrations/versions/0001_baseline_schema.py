@@ -0,0 +1,153 @@
+"""Baseline schema (tables as created by create_all before migrations)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('username', sa.String(50), unique=True),
+        sa.Column('full_name', sa.String(100), nullable=False),
+        sa.Column('email', sa.String(120), unique=True),
+        sa.Column('date_of_birth', sa.Date()),
+        sa.Column('age', sa.Integer()),
+        sa.Column('gender', sa.String(20)),
+        sa.Column('height', sa.Float()),
+        sa.Column('weight', sa.Float()),
+        sa.Column('target_weight', sa.Float()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_table(
+        'health_records',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('recorded_at', sa.DateTime()),
+        sa.Column('steps', sa.Integer()),
+        sa.Column('calories_burned', sa.Integer()),
+        sa.Column('distance_km', sa.Float()),
+        sa.Column('heart_rate', sa.Integer()),
+        sa.Column('blood_pressure_systolic', sa.Integer()),
+        sa.Column('blood_pressure_diastolic', sa.Integer()),
+        sa.Column('blood_sugar', sa.Float()),
+        sa.Column('sleep_hours', sa.Float()),
+        sa.Column('water_intake', sa.Integer()),
+        sa.Column('notes', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'nutrition_logs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('logged_at', sa.DateTime()),
+        sa.Column('meal_type', sa.String(20)),
+        sa.Column('food_name', sa.String(200), nullable=False),
+        sa.Column('food_description', sa.Text()),
+        sa.Column('serving_size', sa.String(50)),
+        sa.Column('calories', sa.Float()),
+        sa.Column('protein', sa.Float()),
+        sa.Column('carbs', sa.Float()),
+        sa.Column('fats', sa.Float()),
+        sa.Column('fiber', sa.Float()),
+        sa.Column('sugar', sa.Float()),
+        sa.Column('food_image_path', sa.String(500)),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'activity_logs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('activity_date', sa.DateTime()),
+        sa.Column('activity_type', sa.String(50), nullable=False),
+        sa.Column('duration_minutes', sa.Integer()),
+        sa.Column('distance_km', sa.Float()),
+        sa.Column('calories_burned', sa.Integer()),
+        sa.Column('avg_heart_rate', sa.Integer()),
+        sa.Column('max_heart_rate', sa.Integer()),
+        sa.Column('steps', sa.Integer()),
+        sa.Column('notes', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'sleep_records',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('sleep_start', sa.DateTime(), nullable=False),
+        sa.Column('sleep_end', sa.DateTime(), nullable=False),
+        sa.Column('duration_hours', sa.Float()),
+        sa.Column('quality_score', sa.Integer()),
+        sa.Column('deep_sleep_hours', sa.Float()),
+        sa.Column('rem_sleep_hours', sa.Float()),
+        sa.Column('light_sleep_hours', sa.Float()),
+        sa.Column('notes', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'water_intakes',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('logged_at', sa.DateTime()),
+        sa.Column('amount_ml', sa.Integer()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'medications',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('dosage', sa.String(50)),
+        sa.Column('frequency', sa.String(50)),
+        sa.Column('start_date', sa.Date()),
+        sa.Column('end_date', sa.Date()),
+        sa.Column('reminder_time', sa.String(10)),
+        sa.Column('is_active', sa.Boolean()),
+        sa.Column('notes', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_table(
+        'health_goals',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('goal_type', sa.String(50), nullable=False),
+        sa.Column('title', sa.String(100)),
+        sa.Column('description', sa.Text()),
+        sa.Column('target_value', sa.Float()),
+        sa.Column('current_value', sa.Float()),
+        sa.Column('unit', sa.String(20)),
+        sa.Column('start_date', sa.Date()),
+        sa.Column('deadline', sa.Date()),
+        sa.Column('status', sa.String(20)),
+        sa.Column('progress_percentage', sa.Float()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_table(
+        'achievements',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('achievement_type', sa.String(50)),
+        sa.Column('title', sa.String(100)),
+        sa.Column('description', sa.Text()),
+        sa.Column('icon', sa.String(50)),
+        sa.Column('earned_at', sa.DateTime()),
+    )
+
+
+def downgrade():
+    for table in ('achievements', 'health_goals', 'medications', 'water_intakes',
+                  'sleep_records', 'activity_logs', 'nutrition_logs',
+                  'health_records', 'users'):
+        op.drop_table(table)
@@ -0,0 +1,36 @@
+"""Composite (user_id, timestamp) indexes for all log tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trailing columns make the index covering for the dashboard aggregates
+    op.create_index('ix_health_records_user_recorded', 'health_records',
+                    ['user_id', 'recorded_at', 'steps', 'calories_burned'])
+    op.create_index('ix_nutrition_logs_user_logged', 'nutrition_logs',
+                    ['user_id', 'logged_at', 'calories', 'protein', 'carbs', 'fats'])
+    op.create_index('ix_activity_logs_user_date', 'activity_logs',
+                    ['user_id', 'activity_date', 'duration_minutes', 'calories_burned'])
+    op.create_index('ix_sleep_records_user_start', 'sleep_records',
+                    ['user_id', 'sleep_start'])
+    op.create_index('ix_water_intakes_user_logged', 'water_intakes',
+                    ['user_id', 'logged_at', 'amount_ml'])
+
+
+def downgrade():
+    op.drop_index('ix_water_intakes_user_logged', table_name='water_intakes')
+    op.drop_index('ix_sleep_records_user_start', table_name='sleep_records')
+    op.drop_index('ix_activity_logs_user_date', table_name='activity_logs')
+    op.drop_index('ix_nutrition_logs_user_logged', table_name='nutrition_logs')
+    op.drop_index('ix_health_records_user_recorded', table_name='health_records')
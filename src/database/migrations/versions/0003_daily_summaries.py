@@ -0,0 +1,135 @@
+"""Daily rollup table maintained by triggers on the log tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+# table -> (timestamp column, source columns, {summary column: expression})
+# Expressions use {row} as placeholder for NEW / OLD.
+ROLLUP_SOURCES = {
+    'health_records': ('recorded_at', ('steps', 'calories_burned', 'distance_km', 'heart_rate'), {
+        'steps': 'COALESCE({row}.steps, 0)',
+        'calories_burned': 'COALESCE({row}.calories_burned, 0)',
+        'distance_km': 'COALESCE({row}.distance_km, 0)',
+        'heart_rate_sum': 'COALESCE({row}.heart_rate, 0)',
+        'heart_rate_count': '({row}.heart_rate IS NOT NULL)',
+        'health_record_count': '1',
+    }),
+    'nutrition_logs': ('logged_at', ('calories', 'protein', 'carbs', 'fats', 'fiber'), {
+        'calories_in': 'COALESCE({row}.calories, 0)',
+        'protein': 'COALESCE({row}.protein, 0)',
+        'carbs': 'COALESCE({row}.carbs, 0)',
+        'fats': 'COALESCE({row}.fats, 0)',
+        'fiber': 'COALESCE({row}.fiber, 0)',
+        'meal_count': '1',
+    }),
+    'activity_logs': ('activity_date', ('duration_minutes', 'calories_burned'), {
+        'activity_minutes': 'COALESCE({row}.duration_minutes, 0)',
+        'activity_calories': 'COALESCE({row}.calories_burned, 0)',
+        'activity_count': '1',
+    }),
+    'water_intakes': ('logged_at', ('amount_ml',), {
+        'water_ml': 'COALESCE({row}.amount_ml, 0)',
+    }),
+    # Sleep counts towards the day the user woke up
+    'sleep_records': ('sleep_end', ('duration_hours',), {
+        'sleep_hours': 'COALESCE({row}.duration_hours, 0)',
+    }),
+}
+
+
+def _day(row, ts_column):
+    return f"date(COALESCE({row}.{ts_column}, CURRENT_TIMESTAMP))"
+
+
+def _add_sql(ts_column, columns):
+    names = ', '.join(columns)
+    values = ', '.join(expr.format(row='NEW') for expr in columns.values())
+    updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in columns)
+    return (
+        f"INSERT INTO daily_summaries (user_id, local_date, {names}) "
+        f"VALUES (NEW.user_id, {_day('NEW', ts_column)}, {values}) "
+        f"ON CONFLICT (user_id, local_date) DO UPDATE SET {updates};"
+    )
+
+
+def _subtract_sql(ts_column, columns):
+    updates = ', '.join(
+        f"{name} = {name} - {expr.format(row='OLD')}" for name, expr in columns.items()
+    )
+    return (
+        f"UPDATE daily_summaries SET {updates} "
+        f"WHERE user_id = OLD.user_id AND local_date = {_day('OLD', ts_column)};"
+    )
+
+
+def upgrade():
+    op.create_table(
+        'daily_summaries',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('local_date', sa.Date(), primary_key=True),
+        sa.Column('steps', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('calories_burned', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('distance_km', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('heart_rate_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('heart_rate_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('health_record_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('calories_in', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('protein', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('carbs', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('fats', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('fiber', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('meal_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('water_ml', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sleep_hours', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('activity_minutes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('activity_calories', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('activity_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    for table, (ts_column, sources, columns) in ROLLUP_SOURCES.items():
+        watched = ', '.join(('user_id', ts_column) + sources)
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_rollup_insert AFTER INSERT ON {table} "
+            f"BEGIN {_add_sql(ts_column, columns)} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_rollup_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {_subtract_sql(ts_column, columns)} {_add_sql(ts_column, columns)} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_rollup_delete AFTER DELETE ON {table} "
+            f"BEGIN {_subtract_sql(ts_column, columns)} END"
+        )
+
+    # Backfill from existing rows
+    bind = op.get_bind()
+    for table, (ts_column, _, columns) in ROLLUP_SOURCES.items():
+        names = ', '.join(columns)
+        sums = ', '.join(f"SUM({expr.format(row=table)})" for expr in columns.values())
+        updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in columns)
+        bind.execute(text(
+            f"INSERT INTO daily_summaries (user_id, local_date, {names}) "
+            f"SELECT user_id, {_day(table, ts_column)}, {sums} FROM {table} "
+            f"WHERE true GROUP BY user_id, {_day(table, ts_column)} "
+            f"ON CONFLICT (user_id, local_date) DO UPDATE SET {updates}"
+        ))
+
+
+def downgrade():
+    for table in ROLLUP_SOURCES:
+        for action in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_rollup_{action}")
+    op.drop_table('daily_summaries')
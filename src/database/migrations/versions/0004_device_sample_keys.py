@@ -0,0 +1,33 @@
+"""Device id columns and unique sample keys for idempotent sync
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plain ADD COLUMN (no batch mode) so the rollup triggers are kept
+    op.add_column('health_records', sa.Column('device_id', sa.String(64)))
+    op.add_column('activity_logs', sa.Column('device_id', sa.String(64)))
+
+    op.create_index('ux_health_records_user_device_recorded', 'health_records',
+                    ['user_id', 'device_id', 'recorded_at'], unique=True)
+    op.create_index('ux_activity_logs_user_device_date', 'activity_logs',
+                    ['user_id', 'device_id', 'activity_date'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_activity_logs_user_device_date', table_name='activity_logs')
+    op.drop_index('ux_health_records_user_device_recorded', table_name='health_records')
+    op.drop_column('activity_logs', 'device_id')
+    op.drop_column('health_records', 'device_id')
@@ -0,0 +1,64 @@
+"""Add weight to health_records and merge the legacy health_entries table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('health_records', sa.Column('weight', sa.Float()))
+
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('health_entries'):
+        return
+
+    if bind.execute(text("SELECT COUNT(*) FROM health_entries")).scalar():
+        user_id = bind.execute(text("SELECT MIN(id) FROM users")).scalar()
+        if user_id is None:
+            bind.execute(text(
+                "INSERT INTO users (full_name, created_at, updated_at) "
+                "VALUES ('Local User', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ))
+            user_id = bind.execute(text("SELECT MIN(id) FROM users")).scalar()
+
+        # health_entries stored local 'YYYY-MM-DD HH:MM' text; health_records
+        # uses UTC in SQLAlchemy's DateTime format
+        bind.execute(text(
+            "INSERT INTO health_records "
+            "(user_id, recorded_at, weight, blood_pressure_systolic, "
+            " blood_pressure_diastolic, heart_rate, blood_sugar, notes, "
+            " steps, calories_burned, distance_km, created_at) "
+            "SELECT :user_id, "
+            "       strftime('%Y-%m-%d %H:%M:%S.000000', recorded_at, 'utc'), "
+            "       weight, systolic, diastolic, heart_rate, blood_sugar, notes, "
+            "       0, 0, 0.0, CURRENT_TIMESTAMP "
+            "FROM health_entries ORDER BY id"
+        ), {"user_id": user_id})
+
+    op.drop_table('health_entries')
+
+
+def downgrade():
+    op.create_table(
+        'health_entries',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('recorded_at', sa.Text(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.Column('systolic', sa.Integer(), nullable=False),
+        sa.Column('diastolic', sa.Integer(), nullable=False),
+        sa.Column('heart_rate', sa.Integer(), nullable=False),
+        sa.Column('blood_sugar', sa.Float(), nullable=False),
+        sa.Column('notes', sa.Text()),
+    )
+    op.drop_column('health_records', 'weight')
@@ -0,0 +1,81 @@
+"""FTS5 full-text index over logged food names and notes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+# table -> (source code, timestamp column, title column, body column)
+# The FTS rowid is source_id * 8 + source code, so triggers update or
+# delete one entry by rowid instead of scanning the index.
+SEARCH_SOURCES = {
+    'health_records': (1, 'recorded_at', None, 'notes'),
+    'nutrition_logs': (2, 'logged_at', 'food_name', 'food_description'),
+    'activity_logs': (3, 'activity_date', None, 'notes'),
+    'sleep_records': (4, 'sleep_start', None, 'notes'),
+}
+
+
+def _expr(row, column):
+    return f"{row}.{column}" if column else "NULL"
+
+
+def _insert_sql(row, code, ts_column, title, body):
+    title, body = _expr(row, title), _expr(row, body)
+    return (
+        f"INSERT INTO log_search (rowid, title, body, user_id, logged_at) "
+        f"SELECT {row}.id * 8 + {code}, {title}, {body}, {row}.user_id, {row}.{ts_column} "
+        f"WHERE COALESCE({title}, {body}) IS NOT NULL;"
+    )
+
+
+def _delete_sql(code):
+    return f"DELETE FROM log_search WHERE rowid = OLD.id * 8 + {code};"
+
+
+def upgrade():
+    op.execute(
+        "CREATE VIRTUAL TABLE log_search USING fts5("
+        "title, body, user_id UNINDEXED, logged_at UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+    for table, (code, ts_column, title, body) in SEARCH_SOURCES.items():
+        watched = ', '.join(c for c in ('user_id', ts_column, title, body) if c)
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_search_insert AFTER INSERT ON {table} "
+            f"BEGIN {_insert_sql('NEW', code, ts_column, title, body)} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_search_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {_delete_sql(code)} {_insert_sql('NEW', code, ts_column, title, body)} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_search_delete AFTER DELETE ON {table} "
+            f"BEGIN {_delete_sql(code)} END"
+        )
+
+    # Backfill from existing rows
+    for table, (code, ts_column, title, body) in SEARCH_SOURCES.items():
+        title, body = _expr(table, title), _expr(table, body)
+        op.execute(
+            f"INSERT INTO log_search (rowid, title, body, user_id, logged_at) "
+            f"SELECT id * 8 + {code}, {title}, {body}, user_id, {ts_column} FROM {table} "
+            f"WHERE COALESCE({title}, {body}) IS NOT NULL"
+        )
+
+
+def downgrade():
+    for table in SEARCH_SOURCES:
+        for action in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_{action}")
+    op.execute("DROP TABLE IF EXISTS log_search")
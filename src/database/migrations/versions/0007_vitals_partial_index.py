@@ -0,0 +1,28 @@
+"""Partial index for manual vitals entries
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Must match HAS_VITALS in health_repository.py for SQLite to use it
+    op.create_index(
+        'ix_health_records_user_vitals', 'health_records', ['user_id', 'recorded_at'],
+        sqlite_where=sa.text('weight IS NOT NULL OR blood_pressure_systolic IS NOT NULL '
+                             'OR blood_sugar IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_health_records_user_vitals', table_name='health_records')
@@ -0,0 +1,154 @@
+"""User timezone and local_date on the log tables; rollups keyed by local day
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+# table -> (timestamp local_date is derived from, extra covering index columns)
+LOCAL_DATE_SOURCES = {
+    'health_records': ('recorded_at', ('steps', 'calories_burned')),
+    'nutrition_logs': ('logged_at', ()),
+    'activity_logs': ('activity_date', ()),
+    'water_intakes': ('logged_at', ()),
+    'sleep_records': ('sleep_end', ()),
+}
+
+# Same as migration 0003: table -> (timestamp column, source columns, {summary column: expression})
+ROLLUP_SOURCES = {
+    'health_records': ('recorded_at', ('steps', 'calories_burned', 'distance_km', 'heart_rate'), {
+        'steps': 'COALESCE({row}.steps, 0)',
+        'calories_burned': 'COALESCE({row}.calories_burned, 0)',
+        'distance_km': 'COALESCE({row}.distance_km, 0)',
+        'heart_rate_sum': 'COALESCE({row}.heart_rate, 0)',
+        'heart_rate_count': '({row}.heart_rate IS NOT NULL)',
+        'health_record_count': '1',
+    }),
+    'nutrition_logs': ('logged_at', ('calories', 'protein', 'carbs', 'fats', 'fiber'), {
+        'calories_in': 'COALESCE({row}.calories, 0)',
+        'protein': 'COALESCE({row}.protein, 0)',
+        'carbs': 'COALESCE({row}.carbs, 0)',
+        'fats': 'COALESCE({row}.fats, 0)',
+        'fiber': 'COALESCE({row}.fiber, 0)',
+        'meal_count': '1',
+    }),
+    'activity_logs': ('activity_date', ('duration_minutes', 'calories_burned'), {
+        'activity_minutes': 'COALESCE({row}.duration_minutes, 0)',
+        'activity_calories': 'COALESCE({row}.calories_burned, 0)',
+        'activity_count': '1',
+    }),
+    'water_intakes': ('logged_at', ('amount_ml',), {
+        'water_ml': 'COALESCE({row}.amount_ml, 0)',
+    }),
+    'sleep_records': ('sleep_end', ('duration_hours',), {
+        'sleep_hours': 'COALESCE({row}.duration_hours, 0)',
+    }),
+}
+
+
+def _utc_day(row, ts_column):
+    return f"date(COALESCE({row}.{ts_column}, CURRENT_TIMESTAMP))"
+
+
+def _local_day(row, ts_column):
+    # Rows written outside the app may lack local_date; fall back to the UTC day
+    return f"COALESCE({row}.local_date, {_utc_day(row, ts_column)})"
+
+
+def _create_rollup_triggers(day, extra_watched=()):
+    for table, (ts_column, sources, columns) in ROLLUP_SOURCES.items():
+        watched = ', '.join(('user_id', ts_column) + tuple(extra_watched) + sources)
+        names = ', '.join(columns)
+        values = ', '.join(expr.format(row='NEW') for expr in columns.values())
+        updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in columns)
+        add = (
+            f"INSERT INTO daily_summaries (user_id, local_date, {names}) "
+            f"VALUES (NEW.user_id, {day('NEW', ts_column)}, {values}) "
+            f"ON CONFLICT (user_id, local_date) DO UPDATE SET {updates};"
+        )
+        subtract = (
+            "UPDATE daily_summaries SET "
+            + ', '.join(f"{name} = {name} - {expr.format(row='OLD')}" for name, expr in columns.items())
+            + f" WHERE user_id = OLD.user_id AND local_date = {day('OLD', ts_column)};"
+        )
+        op.execute(f"CREATE TRIGGER trg_{table}_rollup_insert AFTER INSERT ON {table} "
+                   f"BEGIN {add} END")
+        op.execute(f"CREATE TRIGGER trg_{table}_rollup_update AFTER UPDATE OF {watched} ON {table} "
+                   f"BEGIN {subtract} {add} END")
+        op.execute(f"CREATE TRIGGER trg_{table}_rollup_delete AFTER DELETE ON {table} "
+                   f"BEGIN {subtract} END")
+
+
+def _drop_rollup_triggers():
+    for table in ROLLUP_SOURCES:
+        for action in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_rollup_{action}")
+
+
+def _rebuild_summaries(bind, day):
+    bind.execute(text("DELETE FROM daily_summaries"))
+    for table, (ts_column, _, columns) in ROLLUP_SOURCES.items():
+        names = ', '.join(columns)
+        sums = ', '.join(f"SUM({expr.format(row=table)})" for expr in columns.values())
+        updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in columns)
+        bind.execute(text(
+            f"INSERT INTO daily_summaries (user_id, local_date, {names}) "
+            f"SELECT user_id, {day(table, ts_column)}, {sums} FROM {table} "
+            f"WHERE true GROUP BY user_id, {day(table, ts_column)} "
+            f"ON CONFLICT (user_id, local_date) DO UPDATE SET {updates}"
+        ))
+
+
+def _to_local_date(ts_text):
+    # Existing users have no timezone yet, i.e. the system timezone
+    if ts_text is None:
+        return None
+    value = datetime.fromisoformat(ts_text).replace(tzinfo=timezone.utc)
+    return value.astimezone().date().isoformat()
+
+
+def upgrade():
+    op.add_column('users', sa.Column('timezone', sa.String(64)))
+    for table in LOCAL_DATE_SOURCES:
+        op.add_column(table, sa.Column('local_date', sa.Date()))
+
+    bind = op.get_bind()
+    bind.connection.driver_connection.create_function(
+        "to_local_date", 1, _to_local_date, deterministic=True
+    )
+    for table, (ts_column, covering) in LOCAL_DATE_SOURCES.items():
+        bind.execute(text(
+            f"UPDATE {table} SET local_date = to_local_date({ts_column})"
+        ))
+        op.create_index(f'ix_{table}_user_local_date', table,
+                        ['user_id', 'local_date', *covering])
+
+    # Summary rows were keyed by UTC day
+    _drop_rollup_triggers()
+    _create_rollup_triggers(_local_day, extra_watched=('local_date',))
+    _rebuild_summaries(bind, _local_day)
+
+
+def downgrade():
+    _drop_rollup_triggers()
+    _create_rollup_triggers(_utc_day)
+
+    for table in LOCAL_DATE_SOURCES:
+        op.drop_index(f'ix_{table}_user_local_date', table_name=table)
+        op.drop_column(table, 'local_date')
+    op.drop_column('users', 'timezone')
+
+    _rebuild_summaries(op.get_bind(), _utc_day)
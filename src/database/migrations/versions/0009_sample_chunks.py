@@ -0,0 +1,30 @@
+"""Chunked time-series storage for high-frequency samples
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sample_chunks',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('metric_id', sa.Integer(), primary_key=True),
+        sa.Column('chunk_start', sa.DateTime(), primary_key=True),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('sample_chunks')
@@ -0,0 +1,52 @@
+"""Downsampled tiers for compacted device samples
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+# metric -> type of its sum/min/max columns
+METRICS = {
+    'steps': sa.Integer,
+    'calories_burned': sa.Integer,
+    'distance_km': sa.Float,
+    'heart_rate': sa.Integer,
+}
+
+
+def upgrade():
+    metric_columns = []
+    for metric, type_ in METRICS.items():
+        metric_columns += [
+            sa.Column(f'{metric}_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column(f'{metric}_sum', type_()),
+            sa.Column(f'{metric}_min', type_()),
+            sa.Column(f'{metric}_max', type_()),
+        ]
+
+    op.create_table(
+        'sample_aggregates',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('resolution', sa.Integer(), primary_key=True),
+        sa.Column('bucket_start', sa.DateTime(), primary_key=True),
+        sa.Column('local_date', sa.Date()),
+        sa.Column('sample_count', sa.Integer(), nullable=False, server_default='0'),
+        *metric_columns,
+    )
+    op.create_index('ix_sample_aggregates_user_local_date', 'sample_aggregates',
+                    ['user_id', 'local_date'])
+
+
+def downgrade():
+    op.drop_index('ix_sample_aggregates_user_local_date', table_name='sample_aggregates')
+    op.drop_table('sample_aggregates')
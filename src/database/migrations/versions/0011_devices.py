@@ -0,0 +1,50 @@
+"""Paired devices and per-device sync cursors
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'devices',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('device_id', sa.String(64), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('model', sa.String(100)),
+        sa.Column('vendor', sa.String(50)),
+        sa.Column('battery', sa.Integer()),
+        sa.Column('status', sa.String(20), nullable=False, server_default='disconnected'),
+        sa.Column('last_sync_at', sa.DateTime()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    op.create_index('ux_devices_user_device', 'devices', ['user_id', 'device_id'], unique=True)
+
+    op.create_table(
+        'device_sync_states',
+        sa.Column('user_id', sa.Integer(), primary_key=True),
+        sa.Column('device_id', sa.String(64), primary_key=True),
+        sa.Column('stream', sa.String(32), primary_key=True),
+        sa.Column('cursor', sa.String(255)),
+        sa.Column('last_sample_at', sa.DateTime()),
+        sa.Column('synced_at', sa.DateTime()),
+        sa.ForeignKeyConstraint(['user_id', 'device_id'],
+                                ['devices.user_id', 'devices.device_id'], ondelete='CASCADE'),
+    )
+
+
+def downgrade():
+    op.drop_table('device_sync_states')
+    op.drop_index('ux_devices_user_device', table_name='devices')
+    op.drop_table('devices')
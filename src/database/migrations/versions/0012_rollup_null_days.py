@@ -0,0 +1,108 @@
+"""Rollup triggers skip rows without a day and prune emptied summary rows
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+# Same as migration 0008: table -> (timestamp column, source columns, {summary column: expression})
+ROLLUP_SOURCES = {
+    'health_records': ('recorded_at', ('steps', 'calories_burned', 'distance_km', 'heart_rate'), {
+        'steps': 'COALESCE({row}.steps, 0)',
+        'calories_burned': 'COALESCE({row}.calories_burned, 0)',
+        'distance_km': 'COALESCE({row}.distance_km, 0)',
+        'heart_rate_sum': 'COALESCE({row}.heart_rate, 0)',
+        'heart_rate_count': '({row}.heart_rate IS NOT NULL)',
+        'health_record_count': '1',
+    }),
+    'nutrition_logs': ('logged_at', ('calories', 'protein', 'carbs', 'fats', 'fiber'), {
+        'calories_in': 'COALESCE({row}.calories, 0)',
+        'protein': 'COALESCE({row}.protein, 0)',
+        'carbs': 'COALESCE({row}.carbs, 0)',
+        'fats': 'COALESCE({row}.fats, 0)',
+        'fiber': 'COALESCE({row}.fiber, 0)',
+        'meal_count': '1',
+    }),
+    'activity_logs': ('activity_date', ('duration_minutes', 'calories_burned'), {
+        'activity_minutes': 'COALESCE({row}.duration_minutes, 0)',
+        'activity_calories': 'COALESCE({row}.calories_burned, 0)',
+        'activity_count': '1',
+    }),
+    'water_intakes': ('logged_at', ('amount_ml',), {
+        'water_ml': 'COALESCE({row}.amount_ml, 0)',
+    }),
+    'sleep_records': ('sleep_end', ('duration_hours',), {
+        'sleep_hours': 'COALESCE({row}.duration_hours, 0)',
+    }),
+}
+
+# A summary row nothing contributes to any more
+EMPTY_SUMMARY = ("health_record_count = 0 AND meal_count = 0 AND activity_count = 0 "
+                 "AND water_ml = 0 AND ABS(sleep_hours) < 1e-9")
+
+
+def _stored_day(row, ts_column):
+    # NULL when the row has neither local_date nor a timestamp: it is not
+    # counted, instead of landing on whatever day it was inserted or deleted
+    return f"COALESCE({row}.local_date, date({row}.{ts_column}))"
+
+
+def _fallback_day(row, ts_column):
+    # Migration 0008's expression
+    return f"COALESCE({row}.local_date, date(COALESCE({row}.{ts_column}, CURRENT_TIMESTAMP)))"
+
+
+def _create_rollup_triggers(day, prune):
+    for table, (ts_column, sources, columns) in ROLLUP_SOURCES.items():
+        watched = ', '.join(('user_id', ts_column, 'local_date') + sources)
+        names = ', '.join(columns)
+        values = ', '.join(expr.format(row='NEW') for expr in columns.values())
+        updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in columns)
+        add = (
+            f"INSERT INTO daily_summaries (user_id, local_date, {names}) "
+            f"SELECT NEW.user_id, {day('NEW', ts_column)}, {values} "
+            f"WHERE {day('NEW', ts_column)} IS NOT NULL "
+            f"ON CONFLICT (user_id, local_date) DO UPDATE SET {updates};"
+        )
+        old_day = f"user_id = OLD.user_id AND local_date = {day('OLD', ts_column)}"
+        subtract = (
+            "UPDATE daily_summaries SET "
+            + ', '.join(f"{name} = {name} - {expr.format(row='OLD')}" for name, expr in columns.items())
+            + f" WHERE {old_day};"
+        )
+        if prune:
+            subtract += f" DELETE FROM daily_summaries WHERE {old_day} AND {EMPTY_SUMMARY};"
+        op.execute(f"CREATE TRIGGER trg_{table}_rollup_insert AFTER INSERT ON {table} "
+                   f"BEGIN {add} END")
+        op.execute(f"CREATE TRIGGER trg_{table}_rollup_update AFTER UPDATE OF {watched} ON {table} "
+                   f"BEGIN {subtract} {add} END")
+        op.execute(f"CREATE TRIGGER trg_{table}_rollup_delete AFTER DELETE ON {table} "
+                   f"BEGIN {subtract} END")
+
+
+def _drop_rollup_triggers():
+    for table in ROLLUP_SOURCES:
+        for action in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_rollup_{action}")
+
+
+def upgrade():
+    _drop_rollup_triggers()
+    _create_rollup_triggers(_stored_day, prune=True)
+    # Rows left behind by deletes; drift from rows without a timestamp is
+    # repaired by database.rollups.rebuild_daily_summaries()
+    op.execute(f"DELETE FROM daily_summaries WHERE {EMPTY_SUMMARY}")
+
+
+def downgrade():
+    _drop_rollup_triggers()
+    _create_rollup_triggers(_fallback_day, prune=False)
@@ -7,10 +7,12 @@ All database tables and relationships
 
 from datetime import datetime
 from sqlalchemy import (Column, Integer, String, Float, DateTime, Boolean, 
-                       ForeignKey, Text, Date)
+                       ForeignKey, ForeignKeyConstraint, Text, Date, Index, LargeBinary, text)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
+from .local_dates import local_date_default
+
 Base = declarative_base()
 
 
@@ -28,6 +30,7 @@ class User(Base):
     height = Column(Float)  # in cm
     weight = Column(Float)  # in kg
     target_weight = Column(Float)
+    timezone = Column(String(64))  # IANA name, e.g. 'Asia/Jakarta'; NULL = system timezone
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -40,6 +43,7 @@ class User(Base):
     medications = relationship("Medication", back_populates="user", cascade="all, delete-orphan")
     health_goals = relationship("HealthGoal", back_populates="user", cascade="all, delete-orphan")
     achievements = relationship("Achievement", back_populates="user", cascade="all, delete-orphan")
+    devices = relationship("Device", back_populates="user", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<User(name='{self.full_name}', email='{self.email}')>"
@@ -48,10 +52,27 @@ class User(Base):
 class HealthRecord(Base):
     """Daily health metrics"""
     __tablename__ = 'health_records'
+    __table_args__ = (
+        # Time-series lookups; steps/calories make it covering for monthly sums
+        Index('ix_health_records_user_recorded', 'user_id', 'recorded_at',
+              'steps', 'calories_burned'),
+        # Idempotent device sync (NULL device_id = manual entry, not unique)
+        Index('ux_health_records_user_device_recorded', 'user_id', 'device_id',
+              'recorded_at', unique=True),
+        # Manual vitals entries only, so the Health page skips device samples
+        Index('ix_health_records_user_vitals', 'user_id', 'recorded_at',
+              sqlite_where=text('weight IS NOT NULL OR blood_pressure_systolic IS NOT NULL '
+                                'OR blood_sugar IS NOT NULL')),
+        # Local-day lookups; covering for daily/monthly step and calorie sums
+        Index('ix_health_records_user_local_date', 'user_id', 'local_date',
+              'steps', 'calories_burned'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     recorded_at = Column(DateTime, default=datetime.utcnow)
+    local_date = Column(Date, default=local_date_default('recorded_at'))  # in the user's timezone
+    device_id = Column(String(64))  # Source device, NULL for manual entries
     
     # Activity metrics
     steps = Column(Integer, default=0)
@@ -59,6 +80,7 @@ class HealthRecord(Base):
     distance_km = Column(Float, default=0.0)
     
     # Vitals
+    weight = Column(Float)  # kg
     heart_rate = Column(Integer)  # bpm
     blood_pressure_systolic = Column(Integer)  # mmHg
     blood_pressure_diastolic = Column(Integer)  # mmHg
@@ -83,10 +105,17 @@ class HealthRecord(Base):
 class NutritionLog(Base):
     """Food and nutrition tracking"""
     __tablename__ = 'nutrition_logs'
+    __table_args__ = (
+        # Time-series lookups; macros make it covering for daily totals
+        Index('ix_nutrition_logs_user_logged', 'user_id', 'logged_at',
+              'calories', 'protein', 'carbs', 'fats'),
+        Index('ix_nutrition_logs_user_local_date', 'user_id', 'local_date'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     logged_at = Column(DateTime, default=datetime.utcnow)
+    local_date = Column(Date, default=local_date_default('logged_at'))
     meal_type = Column(String(20))  # breakfast, lunch, dinner, snack
     
     # Food details
@@ -117,10 +146,20 @@ class NutritionLog(Base):
 class ActivityLog(Base):
     """Physical activity and exercise tracking"""
     __tablename__ = 'activity_logs'
+    __table_args__ = (
+        # Time-series lookups; covering for duration/calorie totals
+        Index('ix_activity_logs_user_date', 'user_id', 'activity_date',
+              'duration_minutes', 'calories_burned'),
+        Index('ux_activity_logs_user_device_date', 'user_id', 'device_id',
+              'activity_date', unique=True),
+        Index('ix_activity_logs_user_local_date', 'user_id', 'local_date'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     activity_date = Column(DateTime, default=datetime.utcnow)
+    local_date = Column(Date, default=local_date_default('activity_date'))
+    device_id = Column(String(64))  # Source device, NULL for manual entries
     
     # Activity details
     activity_type = Column(String(50), nullable=False)  # walking, running, cycling
@@ -148,6 +187,10 @@ class ActivityLog(Base):
 class SleepRecord(Base):
     """Sleep tracking"""
     __tablename__ = 'sleep_records'
+    __table_args__ = (
+        Index('ix_sleep_records_user_start', 'user_id', 'sleep_start'),
+        Index('ix_sleep_records_user_local_date', 'user_id', 'local_date'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -155,6 +198,7 @@ class SleepRecord(Base):
     # Sleep timing
     sleep_start = Column(DateTime, nullable=False)
     sleep_end = Column(DateTime, nullable=False)
+    local_date = Column(Date, default=local_date_default('sleep_end'))  # day the user woke up
     duration_hours = Column(Float)
     
     # Sleep quality
@@ -178,10 +222,16 @@ class SleepRecord(Base):
 class WaterIntake(Base):
     """Water intake tracking"""
     __tablename__ = 'water_intakes'
+    __table_args__ = (
+        # Covering for daily water totals
+        Index('ix_water_intakes_user_logged', 'user_id', 'logged_at', 'amount_ml'),
+        Index('ix_water_intakes_user_local_date', 'user_id', 'local_date'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     logged_at = Column(DateTime, default=datetime.utcnow)
+    local_date = Column(Date, default=local_date_default('logged_at'))
     amount_ml = Column(Integer)  # milliliters
     
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -193,6 +243,172 @@ class WaterIntake(Base):
         return f"<WaterIntake(amount={self.amount_ml}ml)>"
 
 
+class DailySummary(Base):
+    """
+    Per-day rollup of the log tables
+
+    Maintained by SQLite triggers on health_records, nutrition_logs,
+    activity_logs, water_intakes and sleep_records (migrations 0003, 0008
+    and 0012), keyed by the rows' local_date.
+    Rebuild with database.rollups.rebuild_daily_summaries().
+    """
+    __tablename__ = 'daily_summaries'
+    
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    local_date = Column(Date, primary_key=True)
+    
+    # Health records
+    steps = Column(Integer, nullable=False, default=0)
+    calories_burned = Column(Integer, nullable=False, default=0)
+    distance_km = Column(Float, nullable=False, default=0.0)
+    heart_rate_sum = Column(Integer, nullable=False, default=0)
+    heart_rate_count = Column(Integer, nullable=False, default=0)
+    health_record_count = Column(Integer, nullable=False, default=0)
+    
+    # Nutrition
+    calories_in = Column(Float, nullable=False, default=0.0)
+    protein = Column(Float, nullable=False, default=0.0)
+    carbs = Column(Float, nullable=False, default=0.0)
+    fats = Column(Float, nullable=False, default=0.0)
+    fiber = Column(Float, nullable=False, default=0.0)
+    meal_count = Column(Integer, nullable=False, default=0)
+    
+    # Water, sleep and activity
+    water_ml = Column(Integer, nullable=False, default=0)
+    sleep_hours = Column(Float, nullable=False, default=0.0)
+    activity_minutes = Column(Integer, nullable=False, default=0)
+    activity_calories = Column(Integer, nullable=False, default=0)
+    activity_count = Column(Integer, nullable=False, default=0)
+    
+    @property
+    def avg_heart_rate(self):
+        if not self.heart_rate_count:
+            return None
+        return self.heart_rate_sum / self.heart_rate_count
+    
+    def __repr__(self):
+        return f"<DailySummary(user_id={self.user_id}, date={self.local_date}, steps={self.steps})>"
+
+
+class SampleChunk(Base):
+    """
+    One hour of high-frequency samples of a single metric
+
+    The payload is a delta-encoded, compressed array of (timestamp, value)
+    pairs; read and write it through database.timeseries.
+    """
+    __tablename__ = 'sample_chunks'
+    
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    metric_id = Column(Integer, primary_key=True)  # see timeseries.TIMESERIES_METRICS
+    chunk_start = Column(DateTime, primary_key=True)  # UTC, aligned to the chunk length
+    sample_count = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    
+    def __repr__(self):
+        return (f"<SampleChunk(user_id={self.user_id}, metric_id={self.metric_id}, "
+                f"start={self.chunk_start}, samples={self.sample_count})>")
+
+
+class SampleAggregate(Base):
+    """
+    Downsampled device samples from health_records
+
+    Written by database.retention: raw device samples past the retention
+    horizon become 5-minute buckets, and old 5-minute buckets are rolled
+    up into hourly ones. Each sample lives in exactly one tier, so a
+    range is read as raw + 5-minute + hourly rows.
+    """
+    __tablename__ = 'sample_aggregates'
+    __table_args__ = (
+        Index('ix_sample_aggregates_user_local_date', 'user_id', 'local_date'),
+    )
+    
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    resolution = Column(Integer, primary_key=True)  # bucket length in seconds (300, 3600)
+    bucket_start = Column(DateTime, primary_key=True)  # UTC
+    local_date = Column(Date)  # of bucket_start in the user's timezone
+    sample_count = Column(Integer, nullable=False, default=0)  # raw rows in the bucket
+    
+    # Per metric: non-null samples, sum, min and max
+    steps_count = Column(Integer, nullable=False, default=0)
+    steps_sum = Column(Integer)
+    steps_min = Column(Integer)
+    steps_max = Column(Integer)
+    calories_burned_count = Column(Integer, nullable=False, default=0)
+    calories_burned_sum = Column(Integer)
+    calories_burned_min = Column(Integer)
+    calories_burned_max = Column(Integer)
+    distance_km_count = Column(Integer, nullable=False, default=0)
+    distance_km_sum = Column(Float)
+    distance_km_min = Column(Float)
+    distance_km_max = Column(Float)
+    heart_rate_count = Column(Integer, nullable=False, default=0)
+    heart_rate_sum = Column(Integer)
+    heart_rate_min = Column(Integer)
+    heart_rate_max = Column(Integer)
+    
+    def __repr__(self):
+        return (f"<SampleAggregate(user_id={self.user_id}, resolution={self.resolution}, "
+                f"start={self.bucket_start}, samples={self.sample_count})>")
+
+
+class Device(Base):
+    """Paired wearable; device_id is the id its samples carry in health_records"""
+    __tablename__ = 'devices'
+    __table_args__ = (
+        # One row per device per user; the Devices page lists by user_id
+        Index('ux_devices_user_device', 'user_id', 'device_id', unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    device_id = Column(String(64), nullable=False)  # same as health_records.device_id
+    name = Column(String(100), nullable=False)
+    model = Column(String(100))
+    vendor = Column(String(50))  # connector that syncs it, e.g. 'fitbit', 'xiaomi'
+    battery = Column(Integer)  # percent, last reported
+    status = Column(String(20), nullable=False, default='disconnected')
+    last_sync_at = Column(DateTime)  # UTC
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = relationship("User", back_populates="devices")
+    sync_states = relationship("DeviceSyncState", back_populates="device",
+                               cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<Device(name='{self.name}', device_id='{self.device_id}')>"
+
+
+class DeviceSyncState(Base):
+    """
+    Incremental sync cursor of one device data stream
+
+    Connectors fetch only what is newer than last_sample_at (or resume from
+    their opaque cursor token), so a sync never re-downloads history.
+    """
+    __tablename__ = 'device_sync_states'
+    __table_args__ = (
+        ForeignKeyConstraint(['user_id', 'device_id'],
+                             ['devices.user_id', 'devices.device_id'], ondelete='CASCADE'),
+    )
+    
+    user_id = Column(Integer, primary_key=True)
+    device_id = Column(String(64), primary_key=True)
+    stream = Column(String(32), primary_key=True)  # e.g. 'health', 'activity', 'sleep'
+    cursor = Column(String(255))  # vendor page token / change id, if the API has one
+    last_sample_at = Column(DateTime)  # UTC timestamp of the newest stored sample
+    synced_at = Column(DateTime, default=datetime.utcnow)  # UTC
+    
+    # Relationship
+    device = relationship("Device", back_populates="sync_states")
+    
+    def __repr__(self):
+        return (f"<DeviceSyncState(device_id='{self.device_id}', stream='{self.stream}', "
+                f"last_sample_at={self.last_sample_at})>")
+
+
 class Medication(Base):
     """Medication tracking"""
     __tablename__ = 'medications'
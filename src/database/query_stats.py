@@ -0,0 +1,338 @@
+"""
+Query Instrumentation
+File: src/database/query_stats.py
+
+Debug aid that times every statement through the engine's
+before/after_cursor_execute events. Each statement is reduced to a
+fingerprint (literals and IN-lists replaced by ?), attributed to the
+active page or job, and kept in a rolling window for get_query_report().
+Slow statements and N+1 bursts (the same SELECT repeated many times in
+quick succession, e.g. lazy-loading User.health_records in a loop) are
+reported as they happen; every record can also go to a JSON-lines log.
+
+Enable with enable_query_stats() or the DB_QUERY_STATS, DB_SLOW_QUERY_MS
+and DB_QUERY_LOG environment variables. When disabled no event listeners
+are attached, so there is no per-statement cost.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+DEFAULT_CONTEXT = "app"
+
+_context: ContextVar[str] = ContextVar("db_query_context", default=DEFAULT_CONTEXT)
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)+\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\?[^()]*\))(?:, \(\?[^()]*\))+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Statement with whitespace collapsed and literal values replaced by ?"""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _LITERALS.sub("?", text)
+    text = _IN_LIST.sub("IN (?+)", text)
+    return _VALUES_ROWS.sub(r"\1, ...", text)
+
+
+def set_query_context(name: str):
+    """Attribute following statements on this thread to a page or job"""
+    return _context.set(name)
+
+
+def get_query_context() -> str:
+    return _context.get()
+
+
+@contextmanager
+def query_context(name: str):
+    """Attribute statements run inside the block to a page or job"""
+    token = _context.set(name)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+@dataclass(frozen=True)
+class QueryRecord:
+    """One executed statement"""
+    timestamp: float       # time.time()
+    context: str
+    fingerprint: str
+    duration_ms: float
+    rows: Optional[int]    # affected rows; None for SELECT (SQLite reports it only once fetched)
+    executemany: bool
+    statement: str = ""    # full text, kept for slow statements only
+
+
+@dataclass
+class NPlusOneSuspect:
+    """A SELECT repeated at least threshold times in one burst"""
+    context: str
+    fingerprint: str
+    count: int
+    first_seen: float
+
+
+@dataclass(frozen=True)
+class FingerprintStats:
+    fingerprint: str
+    count: int
+    total_ms: float
+    max_ms: float
+    rows: int
+
+
+@dataclass(frozen=True)
+class ContextStats:
+    """Statements of one page or job in the rolling window"""
+    context: str
+    query_count: int
+    total_ms: float
+    top: List[FingerprintStats]  # by total time
+
+
+@dataclass(frozen=True)
+class QueryReport:
+    window: int  # number of statements the report covers
+    contexts: Dict[str, ContextStats] = field(default_factory=dict)
+    slow_queries: List[QueryRecord] = field(default_factory=list)
+    n_plus_one: List[NPlusOneSuspect] = field(default_factory=list)
+
+    def format(self) -> str:
+        """Human readable summary"""
+        lines = [f"Last {self.window} statements"]
+        for stats in sorted(self.contexts.values(), key=lambda s: s.total_ms, reverse=True):
+            lines.append(f"\n[{stats.context}] {stats.query_count} queries, {stats.total_ms:.1f} ms")
+            for fp in stats.top:
+                lines.append(f"  {fp.count:>5}x {fp.total_ms:>9.1f} ms (max {fp.max_ms:.1f})  "
+                             f"{fp.fingerprint[:120]}")
+        if self.slow_queries:
+            lines.append("\nSlow queries")
+            for record in self.slow_queries:
+                lines.append(f"  {record.duration_ms:>9.1f} ms [{record.context}] {record.fingerprint[:120]}")
+        if self.n_plus_one:
+            lines.append("\nPossible N+1")
+            for suspect in self.n_plus_one:
+                lines.append(f"  {suspect.count:>5}x [{suspect.context}] {suspect.fingerprint[:120]}")
+        return "\n".join(lines)
+
+
+class _QueryRecorder:
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms = 100.0
+        self.n_plus_one_threshold = 10
+        self.burst_gap = 1.0  # seconds between repeats that still count as one burst
+        self.records = deque(maxlen=2000)
+        self.slow = deque(maxlen=100)
+        self.suspects = deque(maxlen=100)
+        self._bursts = {}  # (thread id, fingerprint) -> [count, last seen, suspect]
+        self._lock = threading.Lock()
+        self._log = None
+        self._engine = None
+
+    # Engine wiring -------------------------------------------------------
+    def set_engine(self, engine):
+        """Remember the app engine; listeners are attached only while enabled"""
+        if self._engine is not None and self._engine is not engine:
+            self._detach(self._engine)
+        self._engine = engine
+        if self.enabled:
+            self._attach(engine)
+
+    def _attach(self, engine):
+        if not event.contains(engine, "before_cursor_execute", self.before_execute):
+            event.listen(engine, "before_cursor_execute", self.before_execute)
+            event.listen(engine, "after_cursor_execute", self.after_execute)
+
+    def _detach(self, engine):
+        if event.contains(engine, "before_cursor_execute", self.before_execute):
+            event.remove(engine, "before_cursor_execute", self.before_execute)
+            event.remove(engine, "after_cursor_execute", self.after_execute)
+
+    # Events ---------------------------------------------------------------
+    def before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            # Profiling was switched on while this statement ran
+            return
+        duration_ms = (time.perf_counter() - started.pop()) * 1000
+        fp = fingerprint(statement)
+        rows = cursor.rowcount if cursor.rowcount >= 0 else None
+        slow = duration_ms >= self.slow_ms
+        record = QueryRecord(
+            timestamp=time.time(),
+            context=_context.get(),
+            fingerprint=fp,
+            duration_ms=duration_ms,
+            rows=rows,
+            executemany=executemany,
+            statement=statement if slow else "",
+        )
+
+        with self._lock:
+            self.records.append(record)
+            if slow:
+                self.slow.append(record)
+            if not executemany and fp.startswith("SELECT"):
+                self._track_burst(record)
+            if self._log is not None:
+                self._log.write(json.dumps({
+                    "ts": record.timestamp,
+                    "context": record.context,
+                    "fingerprint": fp,
+                    "ms": round(duration_ms, 3),
+                    "rows": rows,
+                    "executemany": executemany,
+                    "slow": slow,
+                }) + "\n")
+
+        if slow:
+            print(f"⚠️  Slow query ({duration_ms:.0f} ms, {record.context}): {fp[:200]}")
+
+    def _track_burst(self, record):
+        key = (threading.get_ident(), record.fingerprint)
+        burst = self._bursts.get(key)
+        now = time.monotonic()
+        if burst is None or now - burst[1] > self.burst_gap:
+            burst = self._bursts[key] = [0, now, None]
+            if len(self._bursts) > 1000:
+                self._prune_bursts(now)
+        burst[0] += 1
+        burst[1] = now
+
+        if burst[2] is not None:
+            burst[2].count = burst[0]
+        elif burst[0] >= self.n_plus_one_threshold:
+            burst[2] = NPlusOneSuspect(record.context, record.fingerprint, burst[0], record.timestamp)
+            self.suspects.append(burst[2])
+            print(f"⚠️  Possible N+1 in {record.context}: "
+                  f"{burst[0]}+ x {record.fingerprint[:200]}")
+
+    def _prune_bursts(self, now):
+        for key in [k for k, b in self._bursts.items() if now - b[1] > self.burst_gap]:
+            del self._bursts[key]
+
+    # Control --------------------------------------------------------------
+    def start(self, slow_ms, n_plus_one_threshold, window, log_path):
+        with self._lock:
+            self.slow_ms = slow_ms
+            self.n_plus_one_threshold = n_plus_one_threshold
+            if window != self.records.maxlen:
+                self.records = deque(self.records, maxlen=window)
+            if self._log is not None:
+                self._log.close()
+            self._log = open(log_path, "a", buffering=1, encoding="utf-8") if log_path else None
+        self.enabled = True
+        if self._engine is not None:
+            self._attach(self._engine)
+
+    def stop(self):
+        self.enabled = False
+        if self._engine is not None:
+            self._detach(self._engine)
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.slow.clear()
+            self.suspects.clear()
+            self._bursts.clear()
+
+    def report(self, top) -> QueryReport:
+        with self._lock:
+            records = list(self.records)
+            slow = list(self.slow)
+            suspects = list(self.suspects)
+
+        by_context: Dict[str, Dict[str, list]] = {}
+        for record in records:
+            fps = by_context.setdefault(record.context, {})
+            stats = fps.setdefault(record.fingerprint, [0, 0.0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += record.duration_ms
+            stats[2] = max(stats[2], record.duration_ms)
+            stats[3] += record.rows or 0
+
+        contexts = {}
+        for context, fps in by_context.items():
+            ranked = sorted(fps.items(), key=lambda item: item[1][1], reverse=True)
+            contexts[context] = ContextStats(
+                context=context,
+                query_count=sum(s[0] for s in fps.values()),
+                total_ms=sum(s[1] for s in fps.values()),
+                top=[FingerprintStats(fp, *stats) for fp, stats in ranked[:top]],
+            )
+        return QueryReport(window=len(records), contexts=contexts,
+                           slow_queries=slow, n_plus_one=suspects)
+
+    def counts(self) -> Counter:
+        with self._lock:
+            return Counter(record.context for record in self.records)
+
+
+_recorder = _QueryRecorder()
+
+
+def instrument_engine(engine):
+    """Called by init_database() with each new engine"""
+    _recorder.set_engine(engine)
+
+
+def enable_query_stats(slow_ms: float = 100.0,
+                       n_plus_one_threshold: int = 10,
+                       window: int = 2000,
+                       log_path: Optional[str] = None):
+    """
+    Start recording statements on the app engine
+
+    Args:
+        slow_ms: Statements at least this slow are printed and kept in
+            the report's slow list
+        n_plus_one_threshold: Repeats of one SELECT within a burst that
+            flag a possible N+1
+        window: Number of recent statements the rolling report covers
+        log_path: Append every statement as one JSON object per line
+    """
+    _recorder.start(slow_ms, n_plus_one_threshold, window, log_path)
+
+
+def disable_query_stats():
+    """Detach the event listeners and close the JSON-lines log"""
+    _recorder.stop()
+
+
+def reset_query_stats():
+    """Forget recorded statements, slow queries and N+1 suspects"""
+    _recorder.reset()
+
+
+def get_query_report(top: int = 5) -> QueryReport:
+    """Rolling report per page/job with the top fingerprints by total time"""
+    return _recorder.report(top)
+
+
+def get_query_counts() -> Counter:
+    """Statements per page/job in the rolling window"""
+    return _recorder.counts()
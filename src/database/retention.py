@@ -0,0 +1,374 @@
+"""
+Sample Retention and Compaction
+File: src/database/retention.py
+
+Per-minute device samples dominate database size but are rarely viewed
+at full resolution once they are old. The compaction job rewrites them
+into downsampled tiers (sample_aggregates):
+
+    raw health_records   newer than RetentionPolicy.raw_days
+    5-minute buckets     until RetentionPolicy.five_minute_days
+    hourly buckets       after that
+
+Each sample lives in exactly one tier, so readers (read_series() and
+database.stats) combine all three for any range. Work is done one user
+and UTC day per transaction: an interrupted run leaves finished days
+compacted and the rest untouched, and the next run simply continues.
+Raw rows can optionally be written to gzip CSV archives first.
+
+Only device samples that carry nothing but steps, calories, distance and
+heart rate are compacted; manual entries and vitals stay raw. The rows'
+contribution to daily_summaries is preserved.
+"""
+
+import csv
+import gzip
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from . import connection
+from .query_stats import query_context
+from .rollups import ROLLUP_SOURCES, _day_expr
+
+
+FIVE_MINUTES = 300
+HOURLY = 3600
+
+# health_records columns kept in every tier
+AGGREGATE_METRICS = ('steps', 'calories_burned', 'distance_km', 'heart_rate')
+
+COMPACTABLE = (
+    "device_id IS NOT NULL AND weight IS NULL AND blood_pressure_systolic IS NULL "
+    "AND blood_pressure_diastolic IS NULL AND blood_sugar IS NULL "
+    "AND sleep_hours IS NULL AND water_intake IS NULL AND notes IS NULL"
+)
+
+# Automatic compaction at startup is off unless RETENTION_RAW_DAYS is set
+RETENTION_RAW_DAYS = os.getenv("RETENTION_RAW_DAYS")
+RETENTION_FIVE_MINUTE_DAYS = os.getenv("RETENTION_FIVE_MINUTE_DAYS")
+RETENTION_ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR")
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long each tier keeps its resolution"""
+    raw_days: int = 90
+    five_minute_days: int = 365
+    archive_dir: Optional[Path] = None  # gzip CSV copies of compacted raw rows
+
+    def cutoffs(self, now: Optional[datetime] = None):
+        """(raw cutoff, 5-minute cutoff) as UTC midnights"""
+        today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=self.raw_days), today - timedelta(days=self.five_minute_days)
+
+
+@dataclass
+class CompactionResult:
+    """Outcome of one compaction run"""
+    days: int = 0               # user-days of raw samples compacted
+    raw_rows: int = 0
+    archived_rows: int = 0
+    hourly_days: int = 0        # user-days of 5-minute buckets rolled up
+    seconds: float = 0.0
+    stopped: bool = False       # interrupted; the next run continues
+
+    def __str__(self):
+        state = "stopped early" if self.stopped else "done"
+        return (f"{self.raw_rows:,} raw rows in {self.days} user-days compacted, "
+                f"{self.hourly_days} user-days rolled up to hourly, "
+                f"{self.archived_rows:,} rows archived in {self.seconds:.1f}s ({state})")
+
+
+@dataclass(frozen=True)
+class SeriesPoint:
+    """One chart bucket of a metric, from whichever tiers cover it"""
+    start: datetime
+    count: int
+    total: Optional[float]
+    minimum: Optional[float]
+    maximum: Optional[float]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+def policy_from_env() -> Optional[RetentionPolicy]:
+    """Policy from the RETENTION_* environment variables, None if not configured"""
+    if not RETENTION_RAW_DAYS:
+        return None
+    defaults = RetentionPolicy()
+    return RetentionPolicy(
+        raw_days=int(RETENTION_RAW_DAYS),
+        five_minute_days=int(RETENTION_FIVE_MINUTE_DAYS or defaults.five_minute_days),
+        archive_dir=Path(RETENTION_ARCHIVE_DIR) if RETENTION_ARCHIVE_DIR else None,
+    )
+
+
+# SQL ----------------------------------------------------------------------
+
+def _bucket_expr(ts_column: str, seconds: int) -> str:
+    # Same text format as SQLAlchemy's DateTime so buckets compare with timestamps
+    return (f"strftime('%Y-%m-%d %H:%M:%S.000000', "
+            f"CAST(strftime('%s', {ts_column}) AS INTEGER) / {seconds} * {seconds}, 'unixepoch')")
+
+
+def _merge_sql() -> str:
+    """ON CONFLICT clause adding a bucket into an existing one"""
+    updates = ["sample_count = sample_count + excluded.sample_count"]
+    for m in AGGREGATE_METRICS:
+        updates += [
+            f"{m}_count = {m}_count + excluded.{m}_count",
+            f"{m}_sum = COALESCE({m}_sum + excluded.{m}_sum, {m}_sum, excluded.{m}_sum)",
+            f"{m}_min = MIN(COALESCE({m}_min, excluded.{m}_min), COALESCE(excluded.{m}_min, {m}_min))",
+            f"{m}_max = MAX(COALESCE({m}_max, excluded.{m}_max), COALESCE(excluded.{m}_max, {m}_max))",
+        ]
+    return "ON CONFLICT (user_id, resolution, bucket_start) DO UPDATE SET " + ", ".join(updates)
+
+
+_COLUMNS = "user_id, resolution, bucket_start, local_date, sample_count, " + ", ".join(
+    f"{m}_count, {m}_sum, {m}_min, {m}_max" for m in AGGREGATE_METRICS
+)
+_RAW_RANGE = "user_id = :user_id AND recorded_at >= :start AND recorded_at < :end"
+
+COMPACT_RAW_SQL = text(
+    f"INSERT INTO sample_aggregates ({_COLUMNS}) "
+    f"SELECT user_id, {FIVE_MINUTES}, {_bucket_expr('recorded_at', FIVE_MINUTES)} AS bucket, "
+    f"MIN(local_date), COUNT(*), "
+    + ", ".join(f"COUNT({m}), SUM({m}), MIN({m}), MAX({m})" for m in AGGREGATE_METRICS)
+    + f" FROM health_records WHERE {_RAW_RANGE} AND {COMPACTABLE} GROUP BY bucket "
+    + _merge_sql()
+)
+
+ROLL_UP_SQL = text(
+    f"INSERT INTO sample_aggregates ({_COLUMNS}) "
+    f"SELECT user_id, {HOURLY}, {_bucket_expr('bucket_start', HOURLY)} AS bucket, "
+    f"MIN(local_date), SUM(sample_count), "
+    + ", ".join(f"SUM({m}_count), SUM({m}_sum), MIN({m}_min), MAX({m}_max)"
+                for m in AGGREGATE_METRICS)
+    + f" FROM sample_aggregates WHERE user_id = :user_id AND resolution = {FIVE_MINUTES} "
+    f"AND bucket_start >= :start AND bucket_start < :end GROUP BY bucket "
+    + _merge_sql()
+)
+
+_ts_column, _rollup_columns = ROLLUP_SOURCES['health_records']
+# Adds the chunk's totals to daily_summaries once more, so the delete
+# triggers' subtraction leaves the day unchanged
+KEEP_DAILY_TOTALS_SQL = text(
+    f"INSERT INTO daily_summaries (user_id, local_date, {', '.join(_rollup_columns)}) "
+    f"SELECT user_id, {_day_expr(_ts_column)}, "
+    + ", ".join(f"SUM({expr})" for expr in _rollup_columns.values())
+    + f" FROM health_records WHERE {_RAW_RANGE} AND {COMPACTABLE} "
+    f"GROUP BY user_id, {_day_expr(_ts_column)} ON CONFLICT (user_id, local_date) DO UPDATE SET "
+    + ", ".join(f"{name} = {name} + excluded.{name}" for name in _rollup_columns)
+)
+
+DELETE_RAW_SQL = text(f"DELETE FROM health_records WHERE {_RAW_RANGE} AND {COMPACTABLE}")
+DELETE_FIVE_MINUTE_SQL = text(
+    f"DELETE FROM sample_aggregates WHERE user_id = :user_id AND resolution = {FIVE_MINUTES} "
+    f"AND bucket_start >= :start AND bucket_start < :end"
+)
+NEXT_RAW_SQL = text(
+    f"SELECT MIN(recorded_at) FROM health_records WHERE user_id = :user_id "
+    f"AND recorded_at >= :after AND recorded_at < :cutoff AND {COMPACTABLE}"
+)
+NEXT_FIVE_MINUTE_SQL = text(
+    f"SELECT MIN(bucket_start) FROM sample_aggregates WHERE user_id = :user_id "
+    f"AND resolution = {FIVE_MINUTES} AND bucket_start >= :after AND bucket_start < :cutoff"
+)
+ARCHIVE_ROWS_SQL = text(
+    f"SELECT * FROM health_records WHERE {_RAW_RANGE} AND {COMPACTABLE} ORDER BY recorded_at, id"
+)
+
+
+# Compaction ---------------------------------------------------------------
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _archive(conn, params, archive_dir: Path) -> int:
+    """Write the chunk's raw rows to <dir>/health_records/user_<id>/<year>/<day>-<first id>.csv.gz"""
+    result = conn.execute(ARCHIVE_ROWS_SQL, params)
+    columns = list(result.keys())
+    rows = result.all()
+    if not rows:
+        return 0
+
+    day = params['start']
+    folder = Path(archive_dir) / "health_records" / f"user_{params['user_id']}" / f"{day:%Y}"
+    folder.mkdir(parents=True, exist_ok=True)
+    # First row id in the name: a re-run of an uncommitted chunk rewrites
+    # the same file, late samples for the same day get their own
+    path = folder / f"{day:%Y-%m-%d}-{rows[0].id}.csv.gz"
+    partial = path.with_name(path.name + ".partial")
+    with gzip.open(partial, "wt", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    os.replace(partial, path)
+    return len(rows)
+
+
+def _next_day(conn, sql, user_id, after, cutoff) -> Optional[datetime]:
+    first = conn.execute(sql, {'user_id': user_id, 'after': after, 'cutoff': cutoff}).scalar()
+    if first is None:
+        return None
+    return _as_datetime(first).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def compact_user(user_id: int,
+                 policy: RetentionPolicy = RetentionPolicy(),
+                 should_stop: Callable[[], bool] = lambda: False,
+                 now: Optional[datetime] = None,
+                 result: Optional[CompactionResult] = None) -> CompactionResult:
+    """Compact one user's samples older than the policy horizons"""
+    result = result or CompactionResult()
+    raw_cutoff, five_minute_cutoff = policy.cutoffs(now)
+    engine = connection.engine
+
+    # Raw samples -> 5-minute buckets, one UTC day per transaction
+    after = datetime.min
+    while not should_stop():
+        with engine.connect() as conn:
+            day = _next_day(conn, NEXT_RAW_SQL, user_id, after, raw_cutoff)
+        if day is None:
+            break
+        params = {'user_id': user_id, 'start': day, 'end': min(day + timedelta(days=1), raw_cutoff)}
+        with engine.begin() as conn:
+            if policy.archive_dir is not None:
+                result.archived_rows += _archive(conn, params, policy.archive_dir)
+            conn.execute(COMPACT_RAW_SQL, params)
+            conn.execute(KEEP_DAILY_TOTALS_SQL, params)
+            result.raw_rows += conn.execute(DELETE_RAW_SQL, params).rowcount
+        result.days += 1
+        after = params['end']
+
+    # 5-minute buckets -> hourly buckets
+    after = datetime.min
+    while not should_stop():
+        with engine.connect() as conn:
+            day = _next_day(conn, NEXT_FIVE_MINUTE_SQL, user_id, after, five_minute_cutoff)
+        if day is None:
+            break
+        params = {'user_id': user_id, 'start': day,
+                  'end': min(day + timedelta(days=1), five_minute_cutoff)}
+        with engine.begin() as conn:
+            conn.execute(ROLL_UP_SQL, params)
+            conn.execute(DELETE_FIVE_MINUTE_SQL, params)
+        result.hourly_days += 1
+        after = params['end']
+
+    result.stopped = should_stop()
+    return result
+
+
+def compact(policy: RetentionPolicy = RetentionPolicy(),
+            should_stop: Callable[[], bool] = lambda: False,
+            now: Optional[datetime] = None) -> CompactionResult:
+    """
+    Compact every user's old samples according to policy
+
+    Args:
+        policy: Tier horizons and optional archive directory
+        should_stop: Checked between chunks; return True to stop early
+        now: Reference time for the horizons (UTC), defaults to now
+    """
+    if connection.engine is None:
+        connection.init_database()
+
+    result = CompactionResult()
+    started = time.perf_counter()
+    with query_context("compaction"):
+        with connection.engine.connect() as conn:
+            user_ids = conn.execute(text("SELECT id FROM users ORDER BY id")).scalars().all()
+        for user_id in user_ids:
+            compact_user(user_id, policy, should_stop, now, result)
+            if result.stopped:
+                break
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+class CompactionJob(threading.Thread):
+    """Runs compact() on a daemon thread; stop() ends it after the current chunk"""
+
+    def __init__(self, policy: RetentionPolicy = RetentionPolicy()):
+        super().__init__(name="sample-compaction", daemon=True)
+        self.policy = policy
+        self.result: Optional[CompactionResult] = None
+        self._stop_requested = threading.Event()
+
+    def run(self):
+        try:
+            self.result = compact(self.policy, self._stop_requested.is_set)
+            print(f"✓ Sample compaction: {self.result}")
+        except Exception as e:
+            print(f"❌ Sample compaction error: {e}")
+
+    def stop(self):
+        self._stop_requested.set()
+
+
+# Reading across tiers -----------------------------------------------------
+
+def read_series(user_id: int, metric: str, start: datetime, end: datetime,
+                resolution: int = HOURLY) -> List[SeriesPoint]:
+    """
+    Chart buckets of a metric over [start, end) (UTC), oldest first
+
+    Raw samples and both aggregate tiers are combined. Where only a
+    coarser tier covers the range, its buckets are returned as they are
+    (e.g. hourly points in a 5-minute chart of last year). Compacted
+    buckets count when they start inside the range, so align start and
+    end to the resolution for exact results.
+
+    Args:
+        metric: One of AGGREGATE_METRICS
+        resolution: Bucket length in seconds
+    """
+    if metric not in AGGREGATE_METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {AGGREGATE_METRICS}")
+    if connection.engine is None:
+        connection.init_database()
+
+    params = {'user_id': user_id, 'start': start, 'end': end}
+    queries = [text(
+        f"SELECT {_bucket_expr('recorded_at', resolution)} AS bucket, COUNT({metric}) AS n, "
+        f"SUM({metric}) AS total, MIN({metric}) AS low, MAX({metric}) AS high "
+        f"FROM health_records WHERE {_RAW_RANGE} AND {metric} IS NOT NULL GROUP BY bucket"
+    )]
+    for tier in (FIVE_MINUTES, HOURLY):
+        size = max(resolution, tier)
+        queries.append(text(
+            f"SELECT {_bucket_expr('bucket_start', size)} AS bucket, SUM({metric}_count) AS n, "
+            f"SUM({metric}_sum) AS total, MIN({metric}_min) AS low, MAX({metric}_max) AS high "
+            f"FROM sample_aggregates WHERE user_id = :user_id AND resolution = {tier} "
+            f"AND bucket_start >= :start AND bucket_start < :end AND {metric}_count > 0 "
+            f"GROUP BY bucket"
+        ))
+
+    buckets: Dict[str, list] = {}
+    with connection.engine.connect() as conn:
+        for query in queries:
+            for row in conn.execute(query, params):
+                merged = buckets.get(row.bucket)
+                if merged is None:
+                    buckets[row.bucket] = [row.n, row.total, row.low, row.high]
+                else:
+                    merged[0] += row.n
+                    merged[1] += row.total
+                    merged[2] = min(merged[2], row.low)
+                    merged[3] = max(merged[3], row.high)
+
+    return [
+        SeriesPoint(datetime.fromisoformat(bucket), *values)
+        for bucket, values in sorted(buckets.items())
+    ]
@@ -0,0 +1,222 @@
+"""
+Daily Rollups
+File: src/database/rollups.py
+
+Read and rebuild helpers for the daily_summaries table. The table is kept
+current by SQLite triggers on the log tables (migrations 0003, 0008 and
+0012), so pages read one row per day instead of re-aggregating raw logs.
+Days are the rows' local_date, i.e. calendar days in the user's timezone.
+Rows with neither local_date nor a timestamp are not counted, and a
+summary row is deleted once nothing contributes to it any more.
+rebuild_daily_summaries() is the repair for summaries that drifted
+(e.g. written before migration 0012 or with the triggers disabled).
+
+The read queries run on every dashboard refresh and are built once with
+bound parameters so only the cached compiled SQL is reused.
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import bindparam, select, text
+
+from . import connection
+from .connection import with_session
+from .local_dates import clear_timezone_cache, register_sql_function, resolve_timezone
+from .models import DailySummary, User
+
+
+# table -> (timestamp column, {summary column: SQL expression over the row})
+# Must stay in sync with the triggers created by the migrations.
+ROLLUP_SOURCES = {
+    'health_records': ('recorded_at', {
+        'steps': 'COALESCE(steps, 0)',
+        'calories_burned': 'COALESCE(calories_burned, 0)',
+        'distance_km': 'COALESCE(distance_km, 0)',
+        'heart_rate_sum': 'COALESCE(heart_rate, 0)',
+        'heart_rate_count': '(heart_rate IS NOT NULL)',
+        'health_record_count': '1',
+    }),
+    'nutrition_logs': ('logged_at', {
+        'calories_in': 'COALESCE(calories, 0)',
+        'protein': 'COALESCE(protein, 0)',
+        'carbs': 'COALESCE(carbs, 0)',
+        'fats': 'COALESCE(fats, 0)',
+        'fiber': 'COALESCE(fiber, 0)',
+        'meal_count': '1',
+    }),
+    'activity_logs': ('activity_date', {
+        'activity_minutes': 'COALESCE(duration_minutes, 0)',
+        'activity_calories': 'COALESCE(calories_burned, 0)',
+        'activity_count': '1',
+    }),
+    'water_intakes': ('logged_at', {
+        'water_ml': 'COALESCE(amount_ml, 0)',
+    }),
+    'sleep_records': ('sleep_end', {
+        'sleep_hours': 'COALESCE(duration_hours, 0)',
+    }),
+}
+
+# Device samples compacted into sample_aggregates (database.retention) are
+# gone from health_records; rebuilds add their totals from the aggregates
+AGGREGATE_ROLLUP = {
+    'steps': 'COALESCE(steps_sum, 0)',
+    'calories_burned': 'COALESCE(calories_burned_sum, 0)',
+    'distance_km': 'COALESCE(distance_km_sum, 0)',
+    'heart_rate_sum': 'COALESCE(heart_rate_sum, 0)',
+    'heart_rate_count': 'heart_rate_count',
+    'health_record_count': 'sample_count',
+}
+
+
+# Summary rows of one user in [start_date, end_date], oldest first
+SUMMARIES_STMT = (
+    select(DailySummary)
+    .where(
+        DailySummary.user_id == bindparam('user_id'),
+        DailySummary.local_date >= bindparam('start_date'),
+        DailySummary.local_date <= bindparam('end_date'),
+    )
+    .order_by(DailySummary.local_date)
+)
+
+
+def _day_expr(ts_column: str) -> str:
+    # Same fallback as the triggers for rows written without local_date;
+    # NULL (not counted) for rows without a timestamp either
+    return f"COALESCE(local_date, date({ts_column}))"
+
+
+def rebuild_daily_summaries(user_id: Optional[int] = None,
+                            start_date: Optional[date] = None,
+                            end_date: Optional[date] = None) -> int:
+    """
+    Recompute daily_summaries from the raw log tables and compacted samples
+
+    Used for backfills (e.g. after importing history) or to repair drift.
+    All arguments are optional filters; dates are inclusive.
+
+    Returns:
+        Number of summary rows written
+    """
+    if connection.engine is None:
+        connection.init_database()
+
+    filters = []
+    params = {}
+    if user_id is not None:
+        filters.append("user_id = :user_id")
+        params['user_id'] = user_id
+    if start_date is not None:
+        params['start_date'] = start_date.isoformat()
+    if end_date is not None:
+        params['end_date'] = end_date.isoformat()
+
+    def where(day_expr):
+        clauses = list(filters) + [f"{day_expr} IS NOT NULL"]
+        if start_date is not None:
+            clauses.append(f"{day_expr} >= :start_date")
+        if end_date is not None:
+            clauses.append(f"{day_expr} <= :end_date")
+        return " AND ".join(clauses)
+
+    sources = [(table, _day_expr(ts_column), columns)
+               for table, (ts_column, columns) in ROLLUP_SOURCES.items()]
+    sources.append(('sample_aggregates', 'local_date', AGGREGATE_ROLLUP))
+
+    with connection.engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM daily_summaries WHERE {where('local_date')}"), params)
+
+        for table, day, columns in sources:
+            names = ', '.join(columns)
+            sums = ', '.join(f"SUM({expr})" for expr in columns.values())
+            updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in columns)
+            conn.execute(text(
+                f"INSERT INTO daily_summaries (user_id, local_date, {names}) "
+                f"SELECT user_id, {day}, {sums} FROM {table} "
+                f"WHERE {where(day)} GROUP BY user_id, {day} "
+                f"ON CONFLICT (user_id, local_date) DO UPDATE SET {updates}"
+            ), params)
+
+        return conn.execute(
+            text(f"SELECT COUNT(*) FROM daily_summaries WHERE {where('local_date')}"), params
+        ).scalar()
+
+
+def rebuild_local_dates(user_id: Optional[int] = None) -> int:
+    """
+    Recompute local_date of log rows from their owner's timezone
+
+    Needed after a user's timezone changes or for rows written without
+    local_date. Only rows whose day changes are updated; the rollup
+    triggers move their totals in daily_summaries. Compacted samples have
+    no triggers, so the user's summaries are rebuilt if any of them moved.
+
+    Returns:
+        Number of log rows moved to another day
+    """
+    if connection.engine is None:
+        connection.init_database()
+    clear_timezone_cache(user_id)
+
+    params = {}
+    user_filter = ""
+    if user_id is not None:
+        user_filter = "AND user_id = :user_id"
+        params['user_id'] = user_id
+
+    updated = 0
+    with connection.engine.begin() as conn:
+        register_sql_function(conn.connection.driver_connection)
+        for table, (ts_column, _) in ROLLUP_SOURCES.items():
+            day = (f"to_local_date({ts_column}, "
+                   f"(SELECT timezone FROM users WHERE users.id = {table}.user_id))")
+            updated += conn.execute(text(
+                f"UPDATE {table} SET local_date = {day} "
+                f"WHERE local_date IS NOT {day} {user_filter}"
+            ), params).rowcount
+
+        day = ("to_local_date(bucket_start, "
+               "(SELECT timezone FROM users WHERE users.id = sample_aggregates.user_id))")
+        moved_aggregates = conn.execute(text(
+            f"UPDATE sample_aggregates SET local_date = {day} "
+            f"WHERE local_date IS NOT {day} {user_filter}"
+        ), params).rowcount
+
+    if moved_aggregates:
+        rebuild_daily_summaries(user_id)
+    return updated + moved_aggregates
+
+
+def set_user_timezone(user_id: int, timezone_name: Optional[str]) -> int:
+    """
+    Change a user's timezone (IANA name, None for the system timezone)
+
+    Existing rows are moved to their new local days.
+
+    Returns:
+        Number of log rows updated
+    """
+    resolve_timezone(timezone_name)  # raises ValueError for unknown names
+    with connection.session_scope() as db:
+        user = db.get(User, user_id)
+        if user is None:
+            raise ValueError(f"Unknown user {user_id}")
+        user.timezone = timezone_name or None
+    return rebuild_local_dates(user_id)
+
+
+@with_session
+def get_daily_summaries(user_id: int, start_date: date, end_date: date,
+                        db=None) -> List[DailySummary]:
+    """Get one summary row per day in [start_date, end_date], oldest first"""
+    return db.scalars(SUMMARIES_STMT, {
+        'user_id': user_id, 'start_date': start_date, 'end_date': end_date
+    }).all()
+
+
+@with_session
+def get_daily_summary(user_id: int, day: date, db=None) -> Optional[DailySummary]:
+    """Get the summary row for a single day"""
+    return db.get(DailySummary, (user_id, day))
@@ -0,0 +1,106 @@
+"""
+Schema Migrations
+File: src/database/schema.py
+
+Runs the Alembic migration chain in src/database/migrations against the
+app's engine, so existing databases are upgraded in place.
+
+At startup the revision stamped in alembic_version is compared with the
+newest migration file first; when they match, Alembic is not imported
+and nothing is reflected.
+"""
+
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+VERSIONS_DIR = MIGRATIONS_DIR / "versions"
+
+# Revision matching the tables that create_all() produced before migrations
+BASELINE_REVISION = "0001"
+
+
+def get_expected_revision() -> str:
+    """
+    Head revision read from the migration file names
+
+    Relies on the NNNN_description.py naming with revision = 'NNNN' and
+    a linear chain; get_head_revision() is the authoritative (slower)
+    answer from Alembic.
+    """
+    return max(path.name.split("_", 1)[0] for path in VERSIONS_DIR.glob("[0-9]*_*.py"))
+
+
+def read_schema_stamp(engine: Engine):
+    """Revision stored in alembic_version, or None for a new database"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except OperationalError:
+        return None
+
+
+def get_alembic_config(engine: Engine = None):
+    """Build an Alembic config pointing at the bundled migration scripts"""
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    if engine is not None:
+        config.set_main_option("sqlalchemy.url", str(engine.url))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def get_head_revision() -> str:
+    """Latest revision in the migration chain"""
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(get_alembic_config())
+    return script.get_current_head()
+
+
+def get_current_revision(engine: Engine):
+    """Revision the database is stamped with, or None"""
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def ensure_schema(engine: Engine) -> bool:
+    """
+    Bring the database to the head revision if it is not there already
+
+    Returns:
+        True if migrations ran, False if the stamp already matched
+    """
+    if read_schema_stamp(engine) == get_expected_revision():
+        return False
+    upgrade_database(engine)
+    return True
+
+
+def upgrade_database(engine: Engine, revision: str = "head"):
+    """
+    Upgrade the database to the given revision
+
+    Databases created by create_all() before migrations existed have all
+    baseline tables but no alembic_version table; they are stamped with the
+    baseline revision first so only the newer migrations run.
+    """
+    from alembic import command
+
+    config = get_alembic_config(engine)
+
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" not in tables and "users" in tables:
+            command.stamp(config, BASELINE_REVISION)
+
+        command.upgrade(config, revision)
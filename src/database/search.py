@@ -0,0 +1,159 @@
+"""
+Log Search
+File: src/database/search.py
+
+Full-text search over what the user logged: food names and descriptions
+from nutrition_logs and the notes of health, activity and sleep records.
+The log_search FTS5 table is kept in sync by triggers (migration 0006);
+results are ranked with bm25 and come with a highlighted snippet.
+
+Every match is ranked: the weighted bm25 is FTS5's rank column, so
+"ORDER BY rank LIMIT n" is sorted inside FTS5 and the snippet is only
+built for the n rows returned.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+
+from . import connection
+
+
+# Source name -> (code in the FTS rowid, table, timestamp column, title column, body column)
+# Must stay in sync with the triggers created by migration 0006.
+SEARCH_SOURCES = {
+    'health': (1, 'health_records', 'recorded_at', None, 'notes'),
+    'nutrition': (2, 'nutrition_logs', 'logged_at', 'food_name', 'food_description'),
+    'activity': (3, 'activity_logs', 'activity_date', None, 'notes'),
+    'sleep': (4, 'sleep_records', 'sleep_start', None, 'notes'),
+}
+
+_SOURCE_BY_CODE = {code: name for name, (code, *_) in SEARCH_SOURCES.items()}
+
+# Food names weigh more than descriptions and notes
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One matching log entry"""
+    source: str            # key of SEARCH_SOURCES
+    id: int                # primary key in the source table
+    user_id: int
+    logged_at: Optional[datetime]
+    title: Optional[str]
+    snippet: str           # best matching fragment, matches wrapped in markers
+    rank: float            # bm25 score, lower is better
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression
+
+    Every word must match, the last one as a prefix so results show up
+    while typing. FTS5 syntax characters in the input are ignored.
+    Returns None when the query has no words.
+    """
+    words = _TOKEN.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_logs(query: str,
+                user_id: Optional[int] = None,
+                sources: Optional[Iterable[str]] = None,
+                limit: int = 20,
+                highlight=('[', ']')) -> List[SearchHit]:
+    """
+    Search logged food and notes, best matches first
+
+    Args:
+        query: Free text, e.g. "rendang" or "headache"
+        user_id: Only this user's entries (all users if None)
+        sources: Subset of SEARCH_SOURCES keys (all if None)
+        limit: Maximum number of hits
+        highlight: (open, close) markers around matched terms in snippets
+    """
+    match = build_match_query(query)
+    if match is None:
+        return []
+
+    filters = ["log_search MATCH :match", "rank MATCH :rank"]
+    params = {
+        'match': match,
+        'rank': f"bm25({TITLE_WEIGHT}, {BODY_WEIGHT})",
+        'limit': limit,
+        'open': highlight[0],
+        'close': highlight[1],
+    }
+    if user_id is not None:
+        filters.append("user_id = :user_id")
+        params['user_id'] = user_id
+    if sources is not None:
+        codes = []
+        for name in sources:
+            if name not in SEARCH_SOURCES:
+                raise ValueError(f"Unknown source '{name}', expected one of {tuple(SEARCH_SOURCES)}")
+            codes.append(str(SEARCH_SOURCES[name][0]))
+        filters.append(f"rowid % 8 IN ({', '.join(codes)})")
+
+    sql = text(
+        "SELECT rowid, user_id, logged_at, title, "
+        "snippet(log_search, -1, :open, :close, '…', 12) AS snippet, rank "
+        f"FROM log_search WHERE {' AND '.join(filters)} "
+        "ORDER BY rank LIMIT :limit"
+    )
+
+    if connection.engine is None:
+        connection.init_database()
+    with connection.engine.connect() as conn:
+        rows = conn.execute(sql, params).all()
+
+    return [
+        SearchHit(
+            source=_SOURCE_BY_CODE[row.rowid % 8],
+            id=row.rowid // 8,
+            user_id=row.user_id,
+            logged_at=datetime.fromisoformat(row.logged_at) if row.logged_at else None,
+            title=row.title,
+            snippet=row.snippet,
+            rank=row.rank,
+        )
+        for row in rows
+    ]
+
+
+def rebuild_search_index() -> int:
+    """
+    Repopulate log_search from the log tables
+
+    Only needed to repair the index (e.g. after editing rows with triggers
+    disabled); normal writes keep it in sync.
+
+    Returns:
+        Number of indexed entries
+    """
+    if connection.engine is None:
+        connection.init_database()
+
+    with connection.engine.begin() as conn:
+        conn.execute(text("DELETE FROM log_search"))
+        for code, table, ts_column, title, body in SEARCH_SOURCES.values():
+            title = title or "NULL"
+            body = body or "NULL"
+            conn.execute(text(
+                f"INSERT INTO log_search (rowid, title, body, user_id, logged_at) "
+                f"SELECT id * 8 + {code}, {title}, {body}, user_id, {ts_column} FROM {table} "
+                f"WHERE COALESCE({title}, {body}) IS NOT NULL"
+            ))
+        conn.execute(text("INSERT INTO log_search (log_search) VALUES ('optimize')"))
+        return conn.execute(text("SELECT COUNT(*) FROM log_search")).scalar()
@@ -0,0 +1,126 @@
+"""
+Session Leak Detection
+File: src/database/session_debug.py
+
+Debug aid that records where every session was created and reports the
+ones still open after a threshold. Enable with enable_leak_detection() or
+the DB_SESSION_LEAK_SECONDS environment variable; when disabled the only
+cost is one attribute check per session.
+"""
+
+import threading
+import time
+import traceback
+import weakref
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class OpenSession:
+    """A session that has not been closed yet"""
+    age_seconds: float
+    holding_connection: bool
+    thread_name: str
+    created_at: str  # formatted stack of the creation site
+
+
+class _LeakTracker:
+    def __init__(self):
+        self.enabled = False
+        self.threshold = 30.0
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._watchdog = None
+        self._stop = threading.Event()
+
+    def register(self, session):
+        # Skip this frame and Session.__init__ so the caller is last
+        stack = traceback.extract_stack()[:-3]
+        info = (time.monotonic(), threading.current_thread().name,
+                "".join(traceback.format_list(stack[-8:])))
+        with self._lock:
+            self._sessions[session] = info
+
+    def unregister(self, session):
+        with self._lock:
+            self._sessions.pop(session, None)
+
+    def open_sessions(self, older_than: float = 0.0) -> List[OpenSession]:
+        now = time.monotonic()
+        with self._lock:
+            items = list(self._sessions.items())
+        report = [
+            OpenSession(
+                age_seconds=now - created,
+                holding_connection=session.in_transaction(),
+                thread_name=thread_name,
+                created_at=stack,
+            )
+            for session, (created, thread_name, stack) in items
+            if now - created >= older_than
+        ]
+        return sorted(report, key=lambda s: s.age_seconds, reverse=True)
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            for leak in self.open_sessions(self.threshold):
+                print(f"⚠️  Session open for {leak.age_seconds:.0f}s "
+                      f"(thread {leak.thread_name}, "
+                      f"connection {'held' if leak.holding_connection else 'idle'}), "
+                      f"created at:\n{leak.created_at}")
+
+    def start(self, threshold, interval):
+        self.threshold = threshold
+        self.enabled = True
+        if self._watchdog is None or not self._watchdog.is_alive():
+            self._stop.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, args=(interval,), name="db-session-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    def stop(self):
+        self.enabled = False
+        self._stop.set()
+        with self._lock:
+            self._sessions.clear()
+
+
+_tracker = _LeakTracker()
+
+
+class TrackedSession(Session):
+    """Session that registers itself with the leak tracker when enabled"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if _tracker.enabled:
+            _tracker.register(self)
+
+    def close(self):
+        if _tracker.enabled:
+            _tracker.unregister(self)
+        super().close()
+
+
+def enable_leak_detection(threshold_seconds: float = 30.0, interval_seconds: Optional[float] = None):
+    """
+    Start reporting sessions left open longer than threshold_seconds
+
+    A daemon thread prints each offending session with the stack of the
+    code that created it every interval_seconds (defaults to threshold).
+    """
+    _tracker.start(threshold_seconds, interval_seconds or threshold_seconds)
+
+
+def disable_leak_detection():
+    """Stop tracking sessions"""
+    _tracker.stop()
+
+
+def get_open_sessions(older_than: float = 0.0) -> List[OpenSession]:
+    """Sessions created while tracking was enabled and not closed yet"""
+    return _tracker.open_sessions(older_than)
@@ -0,0 +1,347 @@
+"""
+Health Statistics
+File: src/database/stats.py
+
+SQL-side aggregation over HealthRecord. SUM/AVG/MIN/MAX/COUNT for several
+metrics are computed in a single grouped query and returned as small
+dataclasses instead of ORM instances.
+
+Named periods and buckets are calendar days in the user's timezone and
+are looked up on the indexed local_date column: a day or week is an IN
+list of dates, a month a date range.
+
+Device samples compacted by database.retention live in sample_aggregates;
+each query reads that table with the same filters and the two results
+are merged, so statistics do not change when old samples are compacted.
+
+Statements are built once per metric set (and bucket) with bound
+parameters and reused, so repeated dashboard refreshes skip building
+and compiling the SQL.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select
+
+from . import connection
+from .local_dates import get_user_timezone, local_to_utc, utc_to_local
+from .models import HealthRecord, SampleAggregate
+from .retention import AGGREGATE_METRICS
+
+
+# Metric name -> HealthRecord column
+METRICS = {
+    'steps': HealthRecord.steps,
+    'calories_burned': HealthRecord.calories_burned,
+    'distance_km': HealthRecord.distance_km,
+    'heart_rate': HealthRecord.heart_rate,
+    'blood_pressure_systolic': HealthRecord.blood_pressure_systolic,
+    'blood_pressure_diastolic': HealthRecord.blood_pressure_diastolic,
+    'blood_sugar': HealthRecord.blood_sugar,
+    'sleep_hours': HealthRecord.sleep_hours,
+    'water_intake': HealthRecord.water_intake,
+}
+
+PERIODS = ('day', 'week', 'month')
+
+# Bucket label expressions over local_date for grouped queries (weeks start on Monday)
+_BUCKETS = {
+    'day': lambda day: func.date(day),
+    'week': lambda day: func.date(day, 'weekday 0', '-6 days'),
+    'month': lambda day: func.strftime('%Y-%m-01', day),
+}
+
+
+@dataclass(frozen=True)
+class MetricStats:
+    """Aggregates of one metric over a period"""
+    metric: str
+    count: int
+    total: Optional[float]
+    average: Optional[float]
+    minimum: Optional[float]
+    maximum: Optional[float]
+
+
+@dataclass(frozen=True)
+class PeriodStats:
+    """Aggregates of several metrics over [start, end), in the user's local time"""
+    start: datetime
+    end: datetime
+    record_count: int
+    metrics: Dict[str, MetricStats] = field(default_factory=dict)
+
+    def __getitem__(self, metric: str) -> MetricStats:
+        return self.metrics[metric]
+
+    def total(self, metric: str, default=0):
+        """Sum of a metric, or default when there were no values"""
+        value = self.metrics[metric].total
+        return default if value is None else value
+
+
+@dataclass(frozen=True)
+class BucketStats(PeriodStats):
+    """PeriodStats for one bucket of a grouped query"""
+    bucket: str = ""
+
+
+def period_range(period: str, reference: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Get [start, end) of the day, week (Monday based) or month containing reference
+
+    Args:
+        period: 'day', 'week' or 'month'
+        reference: Point in time inside the period, defaults to now
+    """
+    reference = reference or datetime.now()
+    day_start = reference.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if period == 'day':
+        return day_start, day_start + timedelta(days=1)
+    if period == 'week':
+        start = day_start - timedelta(days=day_start.weekday())
+        return start, start + timedelta(days=7)
+    if period == 'month':
+        start = day_start.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month
+
+    raise ValueError(f"Unknown period '{period}', expected one of {PERIODS}")
+
+
+def _resolve_metrics(metrics: Iterable[str]):
+    metrics = tuple(metrics)
+    unknown = [m for m in metrics if m not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metric(s): {', '.join(unknown)}")
+    return metrics
+
+
+def _aggregate_columns(metrics):
+    columns = [func.count().label('record_count')]
+    for name in metrics:
+        column = METRICS[name]
+        columns += [
+            func.count(column).label(f'{name}__count'),
+            func.sum(column).label(f'{name}__total'),
+            func.avg(column).label(f'{name}__average'),
+            func.min(column).label(f'{name}__minimum'),
+            func.max(column).label(f'{name}__maximum'),
+        ]
+    return columns
+
+
+def _tier_columns(metrics):
+    # Same labels as _aggregate_columns(); other metrics are never compacted
+    columns = [func.coalesce(func.sum(SampleAggregate.sample_count), 0).label('record_count')]
+    for name in metrics:
+        if name not in AGGREGATE_METRICS:
+            continue
+        columns += [
+            func.coalesce(func.sum(getattr(SampleAggregate, f'{name}_count')), 0).label(f'{name}__count'),
+            func.sum(getattr(SampleAggregate, f'{name}_sum')).label(f'{name}__total'),
+            func.min(getattr(SampleAggregate, f'{name}_min')).label(f'{name}__minimum'),
+            func.max(getattr(SampleAggregate, f'{name}_max')).label(f'{name}__maximum'),
+        ]
+    return columns
+
+
+# Record filters of one user: UTC timestamp range, list of local days or local day range
+_FILTERS = {
+    'timestamps': (
+        HealthRecord.user_id == bindparam('user_id'),
+        HealthRecord.recorded_at >= bindparam('start'),
+        HealthRecord.recorded_at < bindparam('end'),
+    ),
+    'days': (
+        HealthRecord.user_id == bindparam('user_id'),
+        HealthRecord.local_date.in_(bindparam('days', expanding=True)),
+    ),
+    'day_range': (
+        HealthRecord.user_id == bindparam('user_id'),
+        HealthRecord.local_date >= bindparam('start_date'),
+        HealthRecord.local_date < bindparam('end_date'),
+    ),
+}
+
+
+# The same filters over compacted samples
+_TIER_FILTERS = {
+    'timestamps': (
+        SampleAggregate.user_id == bindparam('user_id'),
+        SampleAggregate.bucket_start >= bindparam('start'),
+        SampleAggregate.bucket_start < bindparam('end'),
+    ),
+    'days': (
+        SampleAggregate.user_id == bindparam('user_id'),
+        SampleAggregate.local_date.in_(bindparam('days', expanding=True)),
+    ),
+    'day_range': (
+        SampleAggregate.user_id == bindparam('user_id'),
+        SampleAggregate.local_date >= bindparam('start_date'),
+        SampleAggregate.local_date < bindparam('end_date'),
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def _period_stmt(metrics, by):
+    return select(*_aggregate_columns(metrics)).where(*_FILTERS[by])
+
+
+@lru_cache(maxsize=64)
+def _tier_period_stmt(metrics, by):
+    return select(*_tier_columns(metrics)).where(*_TIER_FILTERS[by])
+
+
+@lru_cache(maxsize=64)
+def _bucketed_stmt(metrics, bucket):
+    label = _BUCKETS[bucket](HealthRecord.local_date).label('bucket')
+    return (
+        select(label, *_aggregate_columns(metrics))
+        .where(*_FILTERS['day_range'])
+        .group_by(label)
+        .order_by(label)
+    )
+
+
+@lru_cache(maxsize=64)
+def _tier_bucketed_stmt(metrics, bucket):
+    label = _BUCKETS[bucket](SampleAggregate.local_date).label('bucket')
+    return (
+        select(label, *_tier_columns(metrics))
+        .where(*_TIER_FILTERS['day_range'])
+        .group_by(label)
+    )
+
+
+def _local_days(start: datetime, end: datetime) -> Tuple[date, date]:
+    """[first, last) local dates touched by [start, end)"""
+    return start.date(), (end - timedelta(microseconds=1)).date() + timedelta(days=1)
+
+
+def _metric_stats(row, metrics, tier_row=None) -> Dict[str, MetricStats]:
+    """MetricStats from a raw row, merged with the compacted samples' tier_row"""
+    mapping = row._mapping if row is not None else {}
+    tier = tier_row._mapping if tier_row is not None else {}
+    stats = {}
+    for name in metrics:
+        count = mapping.get(f'{name}__count', 0)
+        total = mapping.get(f'{name}__total')
+        average = mapping.get(f'{name}__average')
+        minimum = mapping.get(f'{name}__minimum')
+        maximum = mapping.get(f'{name}__maximum')
+        tier_count = tier.get(f'{name}__count', 0)
+        if tier_count:
+            total = tier[f'{name}__total'] + (total or 0)
+            count += tier_count
+            average = total / count
+            minimum = min(v for v in (minimum, tier[f'{name}__minimum']) if v is not None)
+            maximum = max(v for v in (maximum, tier[f'{name}__maximum']) if v is not None)
+        stats[name] = MetricStats(name, count, total, average, minimum, maximum)
+    return stats
+
+
+def get_period_stats(user_id: int,
+                     metrics: Iterable[str] = ('steps',),
+                     period: str = 'month',
+                     start: Optional[datetime] = None,
+                     end: Optional[datetime] = None,
+                     reference: Optional[datetime] = None) -> PeriodStats:
+    """
+    Aggregate several metrics over one period in a single query
+
+    Pass either a named period ('day', 'week', 'month' of the user's
+    local calendar around reference, a local time defaulting to now) or
+    an explicit custom range with start/end ([start, end) in UTC, like
+    recorded_at). If only one of start/end is given, the other is the
+    bound of the named period, converted from the user's local time.
+
+    The returned PeriodStats.start/end are always the user's local time.
+    """
+    metrics = _resolve_metrics(metrics)
+    if connection.engine is None:
+        connection.init_database()
+
+    with connection.engine.connect() as conn:
+        tz = get_user_timezone(conn, user_id)
+        if start is None or end is None:
+            if reference is None:
+                reference = datetime.now(tz).replace(tzinfo=None)
+            period_start, period_end = period_range(period, reference)
+
+        if start is None and end is None:
+            start, end = period_start, period_end
+            first, last = _local_days(start, end)
+            if period == 'month':
+                by = 'day_range'
+                params = {'user_id': user_id, 'start_date': first, 'end_date': last}
+            else:
+                by = 'days'
+                days = [first + timedelta(days=i) for i in range((last - first).days)]
+                params = {'user_id': user_id, 'days': days}
+        else:
+            if start is None:
+                start = local_to_utc(period_start, tz)
+            if end is None:
+                end = local_to_utc(period_end, tz)
+            by = 'timestamps'
+            params = {'user_id': user_id, 'start': start, 'end': end}
+            start, end = utc_to_local(start, tz), utc_to_local(end, tz)
+
+        row = conn.execute(_period_stmt(metrics, by), params).one()
+        tier_row = conn.execute(_tier_period_stmt(metrics, by), params).one()
+
+    return PeriodStats(
+        start=start,
+        end=end,
+        record_count=row.record_count + tier_row.record_count,
+        metrics=_metric_stats(row, metrics, tier_row)
+    )
+
+
+def get_bucketed_stats(user_id: int,
+                       start: datetime,
+                       end: datetime,
+                       metrics: Iterable[str] = ('steps',),
+                       bucket: str = 'day') -> List[BucketStats]:
+    """
+    Aggregate several metrics per day, week or month over [start, end)
+
+    start and end are local times; records are bucketed by local_date, so
+    every local day the range touches is included in full. Returns one
+    BucketStats per bucket that has records, oldest first. Bucket labels
+    are ISO dates ('2024-05-06') of the bucket start.
+    """
+    metrics = _resolve_metrics(metrics)
+    if bucket not in _BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}', expected one of {PERIODS}")
+
+    if connection.engine is None:
+        connection.init_database()
+    with connection.engine.connect() as conn:
+        first, last = _local_days(start, end)
+        params = {'user_id': user_id, 'start_date': first, 'end_date': last}
+        rows = {row.bucket: row for row in conn.execute(_bucketed_stmt(metrics, bucket), params)}
+        tier_rows = {row.bucket: row for row in conn.execute(_tier_bucketed_stmt(metrics, bucket), params)}
+
+    results = []
+    for label in sorted(rows.keys() | tier_rows.keys()):
+        row, tier_row = rows.get(label), tier_rows.get(label)
+        bucket_start = datetime.fromisoformat(label)
+        results.append(BucketStats(
+            start=max(bucket_start, start),
+            end=min(_bucket_end(bucket_start, bucket), end),
+            record_count=(row.record_count if row else 0) + (tier_row.record_count if tier_row else 0),
+            metrics=_metric_stats(row, metrics, tier_row),
+            bucket=label
+        ))
+    return results
+
+
+def _bucket_end(bucket_start: datetime, bucket: str) -> datetime:
+    return period_range(bucket, bucket_start)[1]
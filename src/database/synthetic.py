@@ -0,0 +1,315 @@
+"""
+Synthetic Data Generator
+File: src/database/synthetic.py
+
+Fills the schema with realistic multi-year data for benchmarking:
+per-minute heart rate with hourly step totals (health_records), weekly
+vitals, three to four meals a day from the food database, workouts,
+nightly sleep, water intake and a few medications per user.
+
+Output is deterministic: the same (users, years, seed, end) always
+produces the same rows, so benchmark runs are comparable.
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert
+
+from . import connection
+from .food_data import FOOD_DATABASE
+from .ingest import ingest_health_samples
+from .models import User, HealthRecord, NutritionLog, ActivityLog, SleepRecord, WaterIntake, Medication
+
+
+DEVICE_ID = "synthetic-watch"
+DEFAULT_END = date(2025, 1, 1)
+
+# Days of minute samples written per ingest call (bounds memory)
+CHUNK_DAYS = 30
+BATCH_SIZE = 5000
+
+MEAL_TIMES = {'breakfast': 7, 'lunch': 12, 'dinner': 19, 'snack': 15}
+
+# activity type -> (duration range in minutes, km per minute, kcal per minute, heart rate)
+ACTIVITIES = {
+    'walking': ((20, 60), 0.08, 4, 100),
+    'running': ((20, 60), 0.17, 11, 150),
+    'cycling': ((30, 90), 0.35, 8, 130),
+    'swimming': ((20, 45), 0.04, 9, 125),
+    'gym': ((40, 75), 0.0, 6, 120),
+    'yoga': ((30, 60), 0.0, 3, 90),
+}
+
+HEALTH_NOTES = [
+    "headache after lunch", "felt energetic", "pusing sedikit", "stress at work",
+    "kurang tidur", "sore muscles", "after fasting", "minum kopi terlalu banyak",
+]
+
+MEDICATIONS = [
+    ("Metformin", "500 mg", "twice daily"),
+    ("Vitamin D", "1000 IU", "daily"),
+    ("Amlodipine", "5 mg", "daily"),
+    ("Omega 3", "1 capsule", "daily"),
+]
+
+
+@dataclass
+class GenerationResult:
+    """Counts of generated rows per table"""
+    user_ids: List[int] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    def add(self, table: str, count: int):
+        self.rows[table] = self.rows.get(table, 0) + count
+
+
+def _foods_by_meal():
+    foods = {meal: [] for meal in MEAL_TIMES}
+    for food in FOOD_DATABASE.values():
+        foods[food['meal_type']].append(food)
+    # The catalog has few dinner dishes; dinner also draws from lunch
+    foods['dinner'] += foods['lunch']
+    return foods
+
+
+class _UserProfile:
+    """Stable per-user traits plus the user's own random stream"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.resting_hr = rng.randint(55, 72)
+        self.daily_steps = rng.randint(4000, 12000)
+        self.weight = rng.uniform(55, 95)
+        self.workout_chance = rng.uniform(0.3, 0.8)
+        self.favourite_activities = rng.sample(sorted(ACTIVITIES), 3)
+        self.bedtime_minutes = rng.randint(22 * 60, 24 * 60)  # minutes after midnight
+        self.sleep_hours = rng.uniform(6.0, 8.0)
+
+
+def _day_plan(profile: _UserProfile, day: datetime):
+    """Workout (start minute, duration, type) or None, and wake-up minute"""
+    rng = profile.rng
+    workout = None
+    if rng.random() < profile.workout_chance:
+        activity = rng.choice(profile.favourite_activities)
+        low, high = ACTIVITIES[activity][0]
+        workout = (rng.choice((6 * 60 + 30, 17 * 60, 18 * 60 + 30)), rng.randint(low, high), activity)
+    wake = int(6 * 60 + rng.gauss(30, 20))
+    return workout, wake
+
+
+def _minute_samples(profile: _UserProfile, day: datetime, workout, wake, interval: int):
+    """Heart rate every interval minutes and step totals at the top of each hour"""
+    rng = profile.rng
+    hourly_steps = [0] * 24
+    awake_hours = range(wake // 60 + 1, 23)
+    for hour in awake_hours:
+        hourly_steps[hour] = int(profile.daily_steps / len(awake_hours) * rng.uniform(0.3, 1.7))
+    if workout and workout[2] in ('walking', 'running'):
+        hourly_steps[workout[0] // 60] += workout[1] * (110 if workout[2] == 'walking' else 160)
+
+    samples = []
+    for minute in range(0, 24 * 60, interval):
+        if minute < wake or minute >= profile.bedtime_minutes:
+            hr = profile.resting_hr - 6 + rng.randint(-3, 3)
+        elif workout and workout[0] <= minute < workout[0] + workout[1]:
+            hr = ACTIVITIES[workout[2]][3] + rng.randint(-10, 15)
+        else:
+            hr = profile.resting_hr + 12 + rng.randint(-8, 18)
+        sample = {'timestamp': day + timedelta(minutes=minute), 'heart_rate': hr}
+        if minute % 60 == 0:
+            steps = hourly_steps[minute // 60]
+            sample['steps'] = steps
+            sample['distance_km'] = round(steps * 0.00075, 3)
+            sample['calories_burned'] = int(steps * 0.04)
+        samples.append(sample)
+    return samples
+
+
+def _vitals(profile: _UserProfile, day: datetime):
+    """Weekly manual weight / blood pressure / blood sugar entry"""
+    rng = profile.rng
+    profile.weight += rng.uniform(-0.6, 0.5)
+    return {
+        'recorded_at': day + timedelta(hours=7, minutes=rng.randint(0, 59)),
+        'weight': round(profile.weight, 1),
+        'blood_pressure_systolic': rng.randint(105, 140),
+        'blood_pressure_diastolic': rng.randint(65, 90),
+        'heart_rate': profile.resting_hr + rng.randint(-3, 5),
+        'blood_sugar': round(rng.uniform(80, 130), 1),
+        'notes': rng.choice(HEALTH_NOTES) if rng.random() < 0.3 else None,
+    }
+
+
+def _meals(profile: _UserProfile, foods, day: datetime):
+    rng = profile.rng
+    meals = ['breakfast', 'lunch', 'dinner'] + (['snack'] if rng.random() < 0.6 else [])
+    rows = []
+    for meal in meals:
+        food = rng.choice(foods[meal])
+        portion = rng.choice((0.75, 1.0, 1.0, 1.25, 1.5))
+        rows.append({
+            'logged_at': day + timedelta(hours=MEAL_TIMES[meal], minutes=rng.randint(0, 59)),
+            'meal_type': meal,
+            'food_name': food['name'],
+            'food_description': food['serving'],
+            'serving_size': f"{portion}x",
+            'calories': round(food['calories'] * portion, 1),
+            'protein': round(food['protein'] * portion, 1),
+            'carbs': round(food['carbs'] * portion, 1),
+            'fats': round(food['fat'] * portion, 1),
+            'fiber': round(food['fiber'] * portion, 1),
+        })
+    return rows
+
+
+def _activity(profile: _UserProfile, day: datetime, workout):
+    start, duration, activity = workout
+    _, km_per_minute, kcal_per_minute, heart_rate = ACTIVITIES[activity]
+    rng = profile.rng
+    return {
+        'activity_date': day + timedelta(minutes=start),
+        'activity_type': activity,
+        'duration_minutes': duration,
+        'distance_km': round(duration * km_per_minute * rng.uniform(0.85, 1.15), 2) or None,
+        'calories_burned': int(duration * kcal_per_minute * rng.uniform(0.9, 1.1)),
+        'avg_heart_rate': heart_rate + rng.randint(-5, 5),
+        'max_heart_rate': heart_rate + rng.randint(15, 30),
+        'steps': duration * 120 if activity in ('walking', 'running') else None,
+        'notes': "felt strong" if rng.random() < 0.05 else None,
+    }
+
+
+def _sleep(profile: _UserProfile, day: datetime, wake: int):
+    """Sleep that ends on this morning"""
+    rng = profile.rng
+    end = day + timedelta(minutes=wake)
+    hours = max(3.0, rng.gauss(profile.sleep_hours, 0.7))
+    deep = hours * rng.uniform(0.15, 0.25)
+    rem = hours * rng.uniform(0.18, 0.25)
+    return {
+        'sleep_start': end - timedelta(hours=hours),
+        'sleep_end': end,
+        'duration_hours': round(hours, 2),
+        'quality_score': rng.randint(55, 95),
+        'deep_sleep_hours': round(deep, 2),
+        'rem_sleep_hours': round(rem, 2),
+        'light_sleep_hours': round(hours - deep - rem, 2),
+        'notes': "woke up at night" if rng.random() < 0.05 else None,
+    }
+
+
+def _water(profile: _UserProfile, day: datetime):
+    rng = profile.rng
+    return [
+        {'logged_at': day + timedelta(hours=hour, minutes=rng.randint(0, 59)),
+         'amount_ml': rng.choice((200, 250, 250, 330, 500))}
+        for hour in sorted(rng.sample(range(7, 22), rng.randint(5, 9)))
+    ]
+
+
+def _insert(model, rows, user_id, result):
+    if not rows:
+        return
+    for row in rows:
+        row['user_id'] = user_id
+    with connection.engine.begin() as conn:
+        for start in range(0, len(rows), BATCH_SIZE):
+            conn.execute(insert(model), rows[start:start + BATCH_SIZE])
+    result.add(model.__tablename__, len(rows))
+
+
+def _generate_user(index: int, seed: int, start: datetime, days: int,
+                   heart_rate_interval: int, foods, result: GenerationResult):
+    rng = random.Random(f"{seed}:{index}")
+    profile = _UserProfile(rng)
+
+    with connection.session_scope() as db:
+        user = User(
+            username=f"synthetic{index}",
+            full_name=f"Synthetic User {index}",
+            email=f"synthetic{index}@example.com",
+            gender=rng.choice(("male", "female")),
+            age=rng.randint(20, 65),
+            height=round(rng.uniform(150, 190), 1),
+            weight=round(profile.weight, 1),
+            created_at=start,
+            updated_at=start,
+        )
+        db.add(user)
+        db.flush()
+        user_id = user.id
+    result.user_ids.append(user_id)
+
+    medications = [
+        {'name': name, 'dosage': dosage, 'frequency': frequency,
+         'start_date': (start + timedelta(days=rng.randint(0, days - 1))).date(),
+         'reminder_time': f"{rng.choice((7, 8, 20)):02d}:00", 'is_active': True}
+        for name, dosage, frequency in rng.sample(MEDICATIONS, rng.randint(0, 2))
+    ]
+    _insert(Medication, medications, user_id, result)
+
+    for chunk_start in range(0, days, CHUNK_DAYS):
+        samples, vitals, meals, activities, sleep, water = [], [], [], [], [], []
+        for offset in range(chunk_start, min(chunk_start + CHUNK_DAYS, days)):
+            day = start + timedelta(days=offset)
+            workout, wake = _day_plan(profile, day)
+            samples += _minute_samples(profile, day, workout, wake, heart_rate_interval)
+            if day.weekday() == 0:
+                vitals.append(_vitals(profile, day))
+            meals += _meals(profile, foods, day)
+            if workout:
+                activities.append(_activity(profile, day, workout))
+            sleep.append(_sleep(profile, day, wake))
+            water += _water(profile, day)
+
+        written = ingest_health_samples(user_id, DEVICE_ID, samples, upsert=False).written
+        result.add('health_records', written)
+        # Manual vitals have no device_id, like entries from the Health page
+        _insert(HealthRecord, vitals, user_id, result)
+        _insert(NutritionLog, meals, user_id, result)
+        _insert(ActivityLog, activities, user_id, result)
+        _insert(SleepRecord, sleep, user_id, result)
+        _insert(WaterIntake, water, user_id, result)
+
+
+def generate_dataset(users: int = 1,
+                     years: float = 1.0,
+                     seed: int = 42,
+                     end: date = DEFAULT_END,
+                     heart_rate_interval: int = 1) -> GenerationResult:
+    """
+    Generate users * years of data ending the day before end
+
+    Args:
+        users: Number of synthetic users to create
+        years: Years of history per user
+        seed: Random seed; same arguments give the same data
+        end: Exclusive last day (fixed by default so runs are reproducible)
+        heart_rate_interval: Minutes between heart rate samples
+
+    Returns:
+        GenerationResult with the new user ids and row counts per table
+    """
+    if connection.engine is None:
+        connection.init_database()
+
+    days = max(1, int(round(years * 365)))
+    start = datetime.combine(end, datetime.min.time()) - timedelta(days=days)
+    foods = _foods_by_meal()
+
+    result = GenerationResult()
+    started = time.perf_counter()
+    for index in range(1, users + 1):
+        _generate_user(index, seed, start, days, heart_rate_interval, foods, result)
+    result.seconds = time.perf_counter() - started
+    return result
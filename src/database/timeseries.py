@@ -0,0 +1,242 @@
+"""
+Time-Series Chunk Store
+File: src/database/timeseries.py
+
+Compact storage for high-frequency smartwatch vitals (per-second heart
+rate, SpO2, per-minute steps). Instead of one health_records row per
+sample, samples are grouped per (user, metric, hour) into a sample_chunks
+row whose payload is a delta-encoded, zlib-compressed array:
+
+    header  <BBBIqq  version, timestamp/value delta dtypes, count,
+                     first timestamp (epoch seconds), first value
+    body    zlib(timestamp deltas + value deltas), each array stored in
+            the narrowest signed integer type that fits
+
+Regular 1 Hz data has a constant timestamp delta and small value deltas,
+so a sample costs well under a byte. Reads and writes take and return
+NumPy arrays: timestamps as datetime64[s] (naive UTC, like the rest of
+the schema) and values as int64.
+"""
+
+import struct
+import zlib
+from datetime import datetime
+from typing import Dict, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import connection
+from .models import SampleChunk
+from .query_stats import query_context
+
+
+# Metric name -> metric_id stored in sample_chunks. Values are integers
+# (bpm, % saturation, steps); never renumber existing entries.
+TIMESERIES_METRICS = {
+    'heart_rate': 1,
+    'spo2': 2,
+    'steps': 3,
+}
+
+CHUNK_SECONDS = 3600  # one chunk per user, metric and UTC hour
+
+PAYLOAD_VERSION = 1
+_HEADER = struct.Struct('<BBBIqq')
+_DTYPES = (np.dtype('<i1'), np.dtype('<i2'), np.dtype('<i4'), np.dtype('<i8'))
+
+CHUNKS_STMT = (
+    select(SampleChunk.chunk_start, SampleChunk.payload)
+    .where(
+        SampleChunk.user_id == bindparam('user_id'),
+        SampleChunk.metric_id == bindparam('metric_id'),
+        SampleChunk.chunk_start > bindparam('after'),
+        SampleChunk.chunk_start < bindparam('before'),
+    )
+    .order_by(SampleChunk.chunk_start)
+)
+
+# Chunks with the given starts, for merging a batch of new samples
+EXISTING_STMT = (
+    select(SampleChunk.chunk_start, SampleChunk.payload)
+    .where(
+        SampleChunk.user_id == bindparam('user_id'),
+        SampleChunk.metric_id == bindparam('metric_id'),
+        SampleChunk.chunk_start.in_(bindparam('starts', expanding=True)),
+    )
+)
+EXISTING_BATCH = 500  # chunk starts per lookup, well under SQLite's variable limit
+
+_upsert = sqlite_insert(SampleChunk)
+UPSERT_STMT = _upsert.on_conflict_do_update(
+    index_elements=['user_id', 'metric_id', 'chunk_start'],
+    set_={'sample_count': _upsert.excluded.sample_count, 'payload': _upsert.excluded.payload},
+)
+
+
+def _metric_id(metric: str) -> int:
+    try:
+        return TIMESERIES_METRICS[metric]
+    except KeyError:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {tuple(TIMESERIES_METRICS)}")
+
+
+def _epoch_seconds(timestamps) -> np.ndarray:
+    """int64 epoch seconds from datetime64 values, datetimes or epoch numbers"""
+    array = np.asarray(timestamps)
+    if array.dtype.kind == 'M':
+        return array.astype('datetime64[s]').astype(np.int64)
+    if array.dtype.kind == 'O':
+        return np.array(array, dtype='datetime64[s]').astype(np.int64)
+    return array.astype(np.int64)
+
+
+def _to_datetime(epoch: int) -> datetime:
+    return np.datetime64(int(epoch), 's').astype(datetime)
+
+
+def _narrowest(deltas: np.ndarray) -> int:
+    if not len(deltas):
+        return 0
+    low, high = deltas.min(), deltas.max()
+    for code, dtype in enumerate(_DTYPES):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return code
+    return len(_DTYPES) - 1
+
+
+def encode_chunk(timestamps: np.ndarray, values: np.ndarray) -> bytes:
+    """Pack sorted int64 epoch seconds and int64 values into a chunk payload"""
+    ts_deltas = np.diff(timestamps)
+    value_deltas = np.diff(values)
+    ts_code = _narrowest(ts_deltas)
+    value_code = _narrowest(value_deltas)
+    header = _HEADER.pack(PAYLOAD_VERSION, ts_code, value_code, len(timestamps),
+                          int(timestamps[0]), int(values[0]))
+    body = (ts_deltas.astype(_DTYPES[ts_code]).tobytes()
+            + value_deltas.astype(_DTYPES[value_code]).tobytes())
+    return header + zlib.compress(body)
+
+
+def decode_chunk(payload: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Unpack a chunk payload into (epoch seconds, values), both int64"""
+    version, ts_code, value_code, count, first_ts, first_value = _HEADER.unpack_from(payload)
+    if version != PAYLOAD_VERSION:
+        raise ValueError(f"Unsupported sample chunk version {version}")
+
+    body = zlib.decompress(payload[_HEADER.size:])
+    ts_dtype, value_dtype = _DTYPES[ts_code], _DTYPES[value_code]
+    split = (count - 1) * ts_dtype.itemsize
+
+    timestamps = np.empty(count, dtype=np.int64)
+    timestamps[0] = first_ts
+    timestamps[1:] = np.frombuffer(body, dtype=ts_dtype, count=count - 1)
+    values = np.empty(count, dtype=np.int64)
+    values[0] = first_value
+    values[1:] = np.frombuffer(body, dtype=value_dtype, count=count - 1, offset=split)
+    return np.cumsum(timestamps), np.cumsum(values)
+
+
+def _merge(existing, timestamps, values):
+    """Union of two sample sets; the new sample wins on equal timestamps"""
+    if existing is not None:
+        timestamps = np.concatenate((timestamps, existing[0]))
+        values = np.concatenate((values, existing[1]))
+    # Stable sort keeps the new sample first within equal timestamps
+    order = np.argsort(timestamps, kind='stable')
+    timestamps, values = timestamps[order], values[order]
+    keep = np.ones(len(timestamps), dtype=bool)
+    keep[1:] = timestamps[1:] != timestamps[:-1]
+    return timestamps[keep], values[keep]
+
+
+def append_samples(user_id: int, metric: str, timestamps, values) -> int:
+    """
+    Add samples of one metric, merging them into existing chunks
+
+    Args:
+        timestamps: datetime64 array, datetimes or epoch seconds (UTC);
+            sub-second precision is truncated
+        values: Integer sample values, same length as timestamps
+
+    A sample with the same timestamp as a stored one replaces it, so
+    re-syncing a window is idempotent.
+
+    Returns:
+        Number of chunks written
+    """
+    metric_id = _metric_id(metric)
+    timestamps = _epoch_seconds(timestamps)
+    values = np.asarray(values, dtype=np.int64)
+    if timestamps.shape != values.shape:
+        raise ValueError("timestamps and values must have the same length")
+    if not len(timestamps):
+        return 0
+
+    if connection.engine is None:
+        connection.init_database()
+
+    starts = timestamps - timestamps % CHUNK_SECONDS
+    order = np.argsort(starts, kind='stable')
+    starts, timestamps, values = starts[order], timestamps[order], values[order]
+    chunk_starts, offsets = np.unique(starts, return_index=True)
+    bounds = list(offsets[1:]) + [len(starts)]
+
+    with query_context("sync"), connection.engine.begin() as conn:
+        # Only the chunks the batch touches, not every chunk between its
+        # oldest and newest sample (a backfill plus a live sample would
+        # otherwise decode the whole gap)
+        existing: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for batch in range(0, len(chunk_starts), EXISTING_BATCH):
+            for row in conn.execute(EXISTING_STMT, {
+                'user_id': user_id, 'metric_id': metric_id,
+                'starts': [_to_datetime(start) for start in chunk_starts[batch:batch + EXISTING_BATCH]],
+            }):
+                start = int(np.datetime64(row.chunk_start, 's').astype(np.int64))
+                existing[start] = decode_chunk(row.payload)
+
+        rows = []
+        for start, begin, end in zip(chunk_starts, offsets, bounds):
+            chunk_ts, chunk_values = _merge(existing.get(int(start)),
+                                            timestamps[begin:end], values[begin:end])
+            rows.append({
+                'user_id': user_id,
+                'metric_id': metric_id,
+                'chunk_start': _to_datetime(start),
+                'sample_count': len(chunk_ts),
+                'payload': encode_chunk(chunk_ts, chunk_values),
+            })
+        conn.execute(UPSERT_STMT, rows)
+    return len(rows)
+
+
+def read_samples(user_id: int, metric: str,
+                 start: datetime, end: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Samples of one metric in [start, end), oldest first
+
+    Returns:
+        (timestamps as datetime64[s] in UTC, values as int64)
+    """
+    metric_id = _metric_id(metric)
+    first, last = _epoch_seconds([start, end])
+    if connection.engine is None:
+        connection.init_database()
+
+    with connection.engine.connect() as conn:
+        payloads = conn.execute(CHUNKS_STMT, {
+            'user_id': user_id, 'metric_id': metric_id,
+            'after': _to_datetime(first - CHUNK_SECONDS),
+            'before': _to_datetime(last),
+        }).all()
+
+    if not payloads:
+        return np.empty(0, dtype='datetime64[s]'), np.empty(0, dtype=np.int64)
+
+    decoded = [decode_chunk(row.payload) for row in payloads]
+    timestamps = np.concatenate([ts for ts, _ in decoded])
+    values = np.concatenate([v for _, v in decoded])
+    mask = (timestamps >= first) & (timestamps < last)
+    return timestamps[mask].astype('datetime64[s]'), values[mask]
@@ -7,6 +7,7 @@ Run: python src/main.py
 
 import sys
 import io
+import time
 from pathlib import Path
 
 # Fix encoding for Windows console
@@ -33,6 +34,10 @@ try:
 except ImportError:
     VEEV_AVAILABLE = False
 
+from database.backup import BackupService, policy_from_env as backup_policy_from_env
+from database.connection import init_database
+from database.retention import CompactionJob, policy_from_env
+
 # Import windows
 from ui.windows.splash_screen import SplashScreen
 from ui.windows.main_window import MainWindow
@@ -75,6 +80,21 @@ def main():
     print(f"[OK] PyQt6 loaded successfully")
     print(f"[OK] Application initialized")
     
+    # Open the database before any page queries it
+    db_start = time.perf_counter()
+    if init_database():
+        print(f"[OK] Database initialized in {(time.perf_counter() - db_start) * 1000:.0f} ms")
+        retention_policy = policy_from_env()
+        if retention_policy is not None:
+            CompactionJob(retention_policy).start()
+            print(f"[INFO] Compacting samples older than {retention_policy.raw_days} days in background")
+        backup_policy = backup_policy_from_env()
+        if backup_policy.interval_hours > 0:
+            BackupService(backup_policy).start()
+            print(f"[INFO] Database backups every {backup_policy.interval_hours:g} hours")
+    else:
+        print("[WARNING] Database unavailable, pages will show empty data")
+    
     # Check if we should show splash screen
     SHOW_SPLASH = True  # Set False untuk skip splash screen saat development
     
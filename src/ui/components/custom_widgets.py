@@ -10,7 +10,7 @@ Description: Collection of reusable UI components for consistent design
 
 from PyQt6.QtWidgets import (QWidget, QFrame, QLabel, QPushButton, QVBoxLayout, 
                             QHBoxLayout, QProgressBar, QLineEdit)
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QPainter, QColor, QPen
 
 
@@ -505,4 +505,71 @@ class Separator(QFrame):
                 background-color: rgba(255, 255, 255, 0.1);
                 max-height: 1px;
             }
-        """)
\ No newline at end of file
+        """)
+
+
+class TablePager(QObject):
+    """
+    Infinite scroll for history tables
+    
+    Features:
+    - Loads the next page when the table is scrolled near the bottom
+    - Keeps the keyset cursor returned by the repository
+    - Fills the viewport on first load so a scrollbar appears
+    - Emits each loaded page's rows
+    
+    fetch_page(cursor) must return a HistoryPage; add_row(row) appends one
+    row to the bottom of the table.
+    """
+    
+    page_loaded = pyqtSignal(list)
+    
+    def __init__(self, table, fetch_page, add_row, parent=None):
+        super().__init__(parent or table)
+        self.table = table
+        self.fetch_page = fetch_page
+        self.add_row = add_row
+        self.cursor = None
+        self.has_more = True
+        self._loading = False
+        
+        table.verticalScrollBar().valueChanged.connect(self.on_scroll)
+    
+    def reset(self):
+        """Clear the table and load the newest page again"""
+        self.table.setRowCount(0)
+        self.cursor = None
+        self.has_more = True
+        self.load_more()
+    
+    def load_more(self):
+        """Append the next page, if any"""
+        if self._loading or not self.has_more:
+            return
+        
+        self._loading = True
+        try:
+            page = self.fetch_page(self.cursor)
+            for row in page.rows:
+                self.add_row(row)
+            self.cursor = page.next_cursor
+            self.has_more = page.has_more
+        finally:
+            self._loading = False
+        
+        self.page_loaded.emit(page.rows)
+        
+        if self.has_more:
+            # Runs after the table has laid out the new rows
+            QTimer.singleShot(0, self.fill_viewport)
+    
+    def fill_viewport(self):
+        """Keep loading until the table can scroll (or history runs out)"""
+        if self.table.verticalScrollBar().maximum() == 0:
+            self.load_more()
+    
+    def on_scroll(self, value):
+        """Load more when less than one screen from the bottom"""
+        bar = self.table.verticalScrollBar()
+        if bar.maximum() - value <= bar.pageStep():
+            self.load_more()
@@ -0,0 +1,56 @@
+"""
+Food Completer
+File: src/ui/components/food_completer.py
+
+Type-ahead suggestions for a food name QLineEdit, ranked by the user's
+own logging history (database.food_autocomplete). Choosing a catalog
+food emits its nutrition so the dialog can fill in the form.
+"""
+
+from PyQt6.QtWidgets import QCompleter, QLineEdit
+from PyQt6.QtCore import Qt, QStringListModel, pyqtSignal
+
+from database.food_autocomplete import DEFAULT_LIMIT, get_autocomplete, load_food_usage
+
+
+class FoodCompleter(QCompleter):
+    """Completer that asks the autocomplete engine on every keystroke"""
+
+    food_selected = pyqtSignal(dict)  # catalog food, database/food_data.py format
+
+    def __init__(self, line_edit: QLineEdit, limit: int = DEFAULT_LIMIT):
+        super().__init__(line_edit)
+        self.limit = limit
+        self.autocomplete = get_autocomplete()
+        try:
+            self.usage = load_food_usage()
+        except Exception as e:
+            print(f"Could not load food history for suggestions: {e}")
+            self.usage = None
+        self._suggestions = {}
+
+        self._model = QStringListModel(self)
+        self.setModel(self._model)
+        self.setMaxVisibleItems(limit)
+        # The engine already matched and ranked (word starts, accents), so
+        # show its results as they are instead of re-filtering by prefix
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+        line_edit.setCompleter(self)
+        line_edit.textEdited.connect(self.update_suggestions)
+        self.activated.connect(self.on_activated)
+
+    def update_suggestions(self, text):
+        suggestions = self.autocomplete.complete(text, self.limit, self.usage)
+        self._suggestions = {suggestion.name: suggestion for suggestion in suggestions}
+        self._model.setStringList(list(self._suggestions))
+        if suggestions:
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def on_activated(self, name):
+        suggestion = self._suggestions.get(name)
+        if suggestion is not None and suggestion.food is not None:
+            self.food_selected.emit(suggestion.food.to_dict())
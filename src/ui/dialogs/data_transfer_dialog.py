@@ -0,0 +1,160 @@
+"""
+Data Transfer Dialog
+Export all data to CSV / JSON Lines / Parquet files, or import an export
+"""
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QComboBox, QFileDialog, QMessageBox)
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFont
+
+from database.export import export_data, import_data, tables_with_data
+
+
+FORMAT_LABELS = {
+    "CSV": "csv",
+    "JSON Lines": "jsonl",
+    "Parquet (columnar)": "parquet",
+}
+
+
+class _TransferWorker(QThread):
+    """Runs an export or import off the UI thread and reports progress"""
+
+    progress = pyqtSignal(str)
+    finished_ok = pyqtSignal(str, int)  # summary, rows skipped by the import
+    failed = pyqtSignal(str)
+
+    def __init__(self, direction, directory, fmt=None, parent=None, mode="new"):
+        super().__init__(parent)
+        self.direction = direction
+        self.directory = directory
+        self.fmt = fmt
+        self.mode = mode
+
+    def report(self, table, rows):
+        self.progress.emit(f"{table}: {rows:,} rows")
+
+    def run(self):
+        try:
+            if self.direction == "export":
+                result = export_data(self.directory, self.fmt, progress=self.report)
+            else:
+                result = import_data(self.directory, progress=self.report, mode=self.mode)
+            self.finished_ok.emit(str(result), result.skipped)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class DataTransferDialog(QDialog):
+    """Dialog for exporting and importing all user data"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize the UI"""
+        self.setWindowTitle("Export / Import Data")
+        self.setMinimumWidth(520)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(25, 25, 25, 25)
+        layout.setSpacing(16)
+
+        title = QLabel("💾 Export / Import Data")
+        title.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
+        title.setStyleSheet("color: #00BFA5;")
+        layout.addWidget(title)
+
+        desc = QLabel("Exports write one file per table into a folder. "
+                      "Imports into a database that already has data can resume an "
+                      "interrupted import or add the export as new users.")
+        desc.setWordWrap(True)
+        desc.setStyleSheet("color: #888888;")
+        layout.addWidget(desc)
+
+        format_row = QHBoxLayout()
+        format_row.addWidget(QLabel("Format:"))
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(FORMAT_LABELS.keys())
+        format_row.addWidget(self.format_combo, 1)
+        layout.addLayout(format_row)
+
+        buttons = QHBoxLayout()
+        self.export_btn = QPushButton("Export…")
+        self.export_btn.clicked.connect(self.start_export)
+        buttons.addWidget(self.export_btn)
+        self.import_btn = QPushButton("Import…")
+        self.import_btn.clicked.connect(self.start_import)
+        buttons.addWidget(self.import_btn)
+        layout.addLayout(buttons)
+
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        self.status_label.setStyleSheet("color: #CCCCCC;")
+        layout.addWidget(self.status_label)
+
+    def start_export(self):
+        directory = QFileDialog.getExistingDirectory(self, "Export to folder")
+        if directory:
+            fmt = FORMAT_LABELS[self.format_combo.currentText()]
+            self.run_worker(_TransferWorker("export", directory, fmt, self))
+
+    def start_import(self):
+        directory = QFileDialog.getExistingDirectory(self, "Import from folder")
+        if not directory:
+            return
+        mode = "new"
+        if tables_with_data():
+            mode = self.ask_import_mode()
+            if mode is None:
+                return
+        self.run_worker(_TransferWorker("import", directory, mode=mode, parent=self))
+
+    def ask_import_mode(self):
+        """'resume' or 'merge' for a database that already has data; None to cancel"""
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Warning)
+        box.setWindowTitle("Import")
+        box.setText("This database already has data.")
+        box.setInformativeText("Resume an interrupted import of this export, or add the "
+                               "export as new users next to the existing data?")
+        resume_btn = box.addButton("Resume", QMessageBox.ButtonRole.AcceptRole)
+        merge_btn = box.addButton("Add as new users", QMessageBox.ButtonRole.AcceptRole)
+        box.addButton(QMessageBox.StandardButton.Cancel)
+        box.exec()
+        return {resume_btn: "resume", merge_btn: "merge"}.get(box.clickedButton())
+
+    def run_worker(self, worker):
+        if self.worker and self.worker.isRunning():
+            return
+        self.worker = worker
+        self.worker.progress.connect(self.status_label.setText)
+        self.worker.finished_ok.connect(self.on_finished)
+        self.worker.failed.connect(self.on_failed)
+        self.set_busy(True)
+        self.status_label.setText("Starting…")
+        self.worker.start()
+
+    def set_busy(self, busy):
+        self.export_btn.setEnabled(not busy)
+        self.import_btn.setEnabled(not busy)
+        self.format_combo.setEnabled(not busy)
+
+    def on_finished(self, summary, skipped):
+        self.set_busy(False)
+        self.status_label.setText(f"✓ {summary}")
+        if skipped:
+            QMessageBox.warning(self, "Import",
+                                f"{skipped:,} rows were already in the database and were not imported.")
+
+    def on_failed(self, message):
+        self.set_busy(False)
+        self.status_label.setText(f"❌ {message}")
+
+    def reject(self):
+        # Keep the dialog open while a transfer is running
+        if self.worker and self.worker.isRunning():
+            return
+        super().reject()
@@ -10,6 +10,8 @@ from PyQt6.QtCore import Qt, QDateTime, pyqtSignal
 from PyQt6.QtGui import QFont, QPixmap
 from datetime import datetime
 
+from ui.components.food_completer import FoodCompleter
+
 class FoodLoggingDialog(QDialog):
     """Dialog for adding or editing food entries"""
     food_logged = pyqtSignal(dict)  # Signal when food is logged
@@ -138,6 +140,8 @@ class FoodLoggingDialog(QDialog):
         name_label.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
         self.food_name = QLineEdit()
         self.food_name.setPlaceholderText("e.g., Grilled Chicken Breast")
+        self.food_completer = FoodCompleter(self.food_name)
+        self.food_completer.food_selected.connect(self.apply_catalog_food)
         
         # Description
         desc_label = QLabel("Description")
@@ -451,6 +455,16 @@ class FoodLoggingDialog(QDialog):
         
         self.accept()
         
+    def apply_catalog_food(self, food):
+        """Fill serving and nutrition from a suggested catalog food"""
+        self.serving_size.setText(food['serving'])
+        self.calories.setValue(int(food['calories']))
+        self.protein.setValue(food['protein'])
+        self.carbs.setValue(food['carbs'])
+        self.fats.setValue(food['fat'])
+        self.fiber.setValue(food['fiber'])
+        self.sugar.setValue(food.get('sugar') or 0)
+        
     def load_food_data(self, data):
         """Load existing food data for editing"""
         if 'datetime' in data:
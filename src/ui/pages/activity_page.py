@@ -18,6 +18,10 @@ from PyQt6.QtCharts import (
     QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
 )
 
+from database.history_repository import HistoryRepository, utc_to_local
+from ui.components.custom_widgets import TablePager
+
+
 class LogActivityDialog(QDialog):
     """Dialog untuk menambah aktivitas baru"""
     def __init__(self, parent=None):
@@ -142,7 +146,10 @@ class LogActivityDialog(QDialog):
 class ActivityPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Riwayat aktivitas dari activity_logs, dimuat per halaman
+        self.repository = HistoryRepository()
         self.init_ui()
+        self.pager.reset()
 
     def init_ui(self):
         # Main layout dengan margin seperti Dashboard/Nutrition
@@ -482,18 +489,12 @@ class ActivityPage(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.table)
         
-        # Add sample data
-        sample_data = [
-            ("08:30", "Running", "45 min", "5.2 km", "450 kcal", "145 bpm"),
-            ("12:15", "Walking", "20 min", "1.8 km", "95 kcal", "98 bpm"),
-            ("17:00", "Gym", "60 min", "-", "320 kcal", "128 bpm"),
-            ("19:15", "Cycling", "30 min", "8.5 km", "280 kcal", "132 bpm"),
-            ("06:00", "Yoga", "40 min", "-", "120 kcal", "85 bpm"),
-            ("20:30", "Swimming", "35 min", "1.2 km", "310 kcal", "118 bpm"),
-        ]
-        
-        for time, activity, duration, distance, calories, hr in sample_data:
-            self.add_table_row(time, activity, duration, distance, calories, hr)
+        # Halaman berikutnya dimuat saat tabel di-scroll ke bawah
+        self.pager = TablePager(
+            self.table,
+            lambda cursor: self.repository.fetch_page('activity', cursor),
+            self.add_activity_row
+        )
         
         return container
 
@@ -527,6 +528,18 @@ class ActivityPage(QWidget):
         
         return container
 
+    def add_activity_row(self, log):
+        """Add one activity_logs row (dict) to the bottom of the table"""
+        when = log["activity_date"]
+        self.add_table_row(
+            utc_to_local(when).strftime("%Y-%m-%d %H:%M") if when else "-",
+            (log["activity_type"] or "-").title(),
+            f"{log['duration_minutes']} min" if log["duration_minutes"] is not None else "-",
+            f"{log['distance_km']:.1f} km" if log["distance_km"] else "-",
+            f"{log['calories_burned']} kcal" if log["calories_burned"] is not None else "-",
+            f"{log['avg_heart_rate']} bpm" if log["avg_heart_rate"] else "-"
+        )
+
     def add_table_row(self, time, activity, duration, distance, calories, hr):
         """Add row to activity table"""
         row = self.table.rowCount()
@@ -543,7 +556,7 @@ class ActivityPage(QWidget):
         dialog = LogActivityDialog(self)
         if dialog.exec():
             from datetime import datetime
-            now = datetime.now().strftime("%H:%M")
+            now = datetime.now().strftime("%Y-%m-%d %H:%M")
             
             act_type = dialog.type_input.currentText()
             dur = f"{dialog.duration_input.value()} min"
@@ -557,4 +570,4 @@ class ActivityPage(QWidget):
             for col, value in enumerate(items):
                 item = QTableWidgetItem(value)
                 item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(0, col, item)
\ No newline at end of file
+                self.table.setItem(0, col, item)
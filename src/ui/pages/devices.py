@@ -2,10 +2,8 @@
 Devices Page - Smartwatch Management
 File: src/ui/pages/devices.py
 
-Notes:
-- Database imports are deferred to runtime in on_device_added() and refresh_devices()
-  to avoid SQLAlchemy typing/circular-import issues during module import.
-- If database access fails, the UI falls back to in-memory sample devices.
+Devices and their sync cursors are stored through DeviceRepository. If
+database access fails, the UI falls back to the in-memory device list.
 """
 
 from typing import Dict, List, Optional
@@ -16,6 +14,9 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
+from database.device_repository import DeviceRepository
+from database.history_repository import utc_to_local
+
 
 class DeviceCard(QFrame):
     """Display card for connected device"""
@@ -120,16 +121,18 @@ class DevicesPage(QWidget):
 
     def __init__(self):
         super().__init__()
-        # in-memory fallback devices until DB can be loaded
-        self.devices: List[Dict] = [
-            {"id": "1", "name": "Mi Band 7", "model": "Xiaomi", "battery": 85, "status": "connected", "last_sync": "5 minutes ago"},
-            {"id": "2", "name": "Fitbit Charge 5", "model": "Fitbit", "battery": 62, "status": "connected", "last_sync": "1 hour ago"},
-        ]
+        # in-memory fallback devices if the database cannot be loaded
+        self.devices: List[Dict] = []
+        try:
+            self.repository = DeviceRepository()
+        except Exception as e:
+            print(f"Could not open device repository: {e}")
+            self.repository = None
         # UI references we will need later
         self._scroll_layout = None  # type: Optional[QVBoxLayout]
         self._scroll_content = None  # type: Optional[QW]
         self.setup_ui()
-        # Try to load real devices from DB at runtime (deferred)
+        # Load real devices from the database
         self.refresh_devices()
 
     def setup_ui(self):
@@ -209,27 +212,23 @@ class DevicesPage(QWidget):
         """
         Slot called when AddDeviceDialog emits device_added.
 
-        Defer database imports and operations to runtime to avoid SQLAlchemy typing
-        errors at module import time. If DB operations fail, fall back to the in-memory list
-        and update UI so user sees the newly added device.
+        If DB operations fail, fall back to the in-memory list and update UI so
+        user sees the newly added device.
         """
         # Defensive check
         if not isinstance(device_info, dict):
             print("on_device_added: invalid payload, expected dict")
             return
 
-        # Attempt to add to DB (deferred import)
+        # Attempt to add to DB; the stored row carries the generated id
         added_to_db = False
         try:
-            # Import inside function to avoid SQLAlchemy typing/circular imports at module import
-            from ...database.device_repository import DeviceRepository  # adjust path if needed
-            repo = DeviceRepository()
-            # expected repository method; adjust to your actual signature
-            repo.add_device(device_info)
-            added_to_db = True
+            if self.repository is not None:
+                device_info = self.repository.add_device(device_info)
+                added_to_db = True
         except Exception as e:
             # Log and continue with fallback
-            print(f"DB add device failed (deferred import): {e}")
+            print(f"DB add device failed: {e}")
 
         # Update UI (always)
         try:
@@ -255,17 +254,16 @@ class DevicesPage(QWidget):
 
     def refresh_devices(self):
         """
-        Load devices from the database (deferred import). If DB fails, use in-memory fallback.
+        Load devices from the database. If DB fails, use in-memory fallback.
         Rebuilds the devices list in the UI.
         """
         devices_to_show = self.devices
         try:
-            from ...database.device_repository import DeviceRepository  # adjust path if needed
-            repo = DeviceRepository()
-            devices_to_show = repo.list_devices()  # expected to return list[dict]
+            if self.repository is not None:
+                devices_to_show = self.repository.list_devices()
         except Exception as e:
             # Log and use fallback
-            print(f"Could not load devices from DB (deferred import): {e}")
+            print(f"Could not load devices from DB: {e}")
             devices_to_show = self.devices
 
         # Rebuild UI list
@@ -288,8 +286,18 @@ class DevicesPage(QWidget):
 
     def sync_device(self, device_id: str):
         """Sync specific device"""
-        print(f"Syncing device: {device_id}")
-        # TODO: Implement actual sync wiring to SyncManager / device connectors
+        since = None
+        if self.repository is not None:
+            try:
+                since = self.repository.sync_since(device_id)
+            except Exception as e:
+                print(f"Could not read sync cursor for {device_id}: {e}")
+        if since is None:
+            print(f"Syncing device: {device_id} (full history)")
+        else:
+            print(f"Syncing device: {device_id} (samples after {utc_to_local(since):%Y-%m-%d %H:%M})")
+        # TODO: Implement actual sync wiring to SyncManager / device connectors;
+        # fetch after `since`, ingest, then repository.save_sync_state()
 
     @staticmethod
     def _clear_layout(layout):
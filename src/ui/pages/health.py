@@ -4,15 +4,12 @@ Health Page
 Fitur:
 - Form input data kesehatan (berat, tekanan darah, detak jantung, gula darah, catatan)
 - Validasi input
-- Simpan ke database SQLite (tabel health_entries lokal)
-- Riwayat data (tabel)
+- Simpan ke health_records lewat HealthRepository (koneksi persisten)
+- Riwayat data (tabel, halaman berikutnya dimuat saat di-scroll)
 - Grafik tren sederhana (berat)
 """
 
-from datetime import datetime
-from pathlib import Path
 from typing import List, Dict, Any
-import sqlite3
 
 from PyQt6.QtWidgets import (
     QWidget,
@@ -35,19 +32,20 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QColor, QPainter
 from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
 
+from database.health_repository import HealthRepository
+from ui.components.custom_widgets import TablePager
+
 
 class HealthPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        # DB path (pakai file healthtrack.db yang sudah ada)
-        self.db_path = (
-            Path(__file__).parent.parent.parent.parent / "data" / "healthtrack.db"
-        )
-        self.init_db()
+        # Satu repository (dan koneksi) selama halaman hidup
+        self.repository = HealthRepository()
         self.records: List[Dict[str, Any]] = []
         self.series = QLineSeries()
         self.axis_x = None
         self.axis_y = None
+        self.weight_range = None  # (min, max) berat di grafik
         self.setup_ui()
         self.load_data()
 
@@ -366,63 +364,43 @@ class HealthPage(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeMode.Stretch
         )
+        self.table.setMinimumHeight(400)
         layout.addWidget(self.table)
+
+        # Riwayat lama dimuat per halaman (keyset) saat tabel di-scroll ke bawah
+        self.pager = TablePager(self.table, self.repository.vitals_page, self.append_table_row)
+        self.pager.page_loaded.connect(self.records.extend)
         return card
 
     # ------------------------------------------------------------------ Data
-    def init_db(self):
-        """Pastikan tabel health_entries ada."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        try:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS health_entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    recorded_at TEXT NOT NULL,
-                    weight REAL NOT NULL,
-                    systolic INTEGER NOT NULL,
-                    diastolic INTEGER NOT NULL,
-                    heart_rate INTEGER NOT NULL,
-                    blood_sugar REAL NOT NULL,
-                    notes TEXT
-                )
-                """
-            )
-            conn.commit()
-        finally:
-            conn.close()
-
     def load_data(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            rows = conn.execute(
-                "SELECT * FROM health_entries ORDER BY datetime(recorded_at) DESC LIMIT 50"
-            ).fetchall()
-            self.records = [dict(r) for r in rows]
-        finally:
-            conn.close()
-        self.populate_table()
-        self.update_chart()
-
-    def populate_table(self):
-        self.table.setRowCount(0)
-        for record in self.records:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            values = [
-                record["recorded_at"],
-                f"{record['weight']:.1f}",
-                f"{record['systolic']} / {record['diastolic']}",
-                record["heart_rate"],
-                f"{record['blood_sugar']:.1f}",
-                record.get("notes") or "-",
-            ]
-            for col, val in enumerate(values):
-                item = QTableWidgetItem(str(val))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, col, item)
+        self.records.clear()
+        self.pager.reset()  # halaman pertama (terbaru)
+        self.update_chart()  # grafik hanya dari halaman terbaru
+
+    def append_table_row(self, record: Dict[str, Any]):
+        """Tambah satu baris lama di paling bawah tabel."""
+        self.insert_table_row(record, self.table.rowCount())
+
+    def insert_table_row(self, record: Dict[str, Any], row: int = 0):
+        """Tambah satu baris di posisi row (default paling atas, terbaru di atas)."""
+        self.table.insertRow(row)
+        values = [
+            record["recorded_at"],
+            self.format_number(record["weight"]),
+            f"{record['systolic'] or '-'} / {record['diastolic'] or '-'}",
+            record["heart_rate"] or "-",
+            self.format_number(record["blood_sugar"]),
+            record.get("notes") or "-",
+        ]
+        for col, val in enumerate(values):
+            item = QTableWidgetItem(str(val))
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.table.setItem(row, col, item)
+
+    @staticmethod
+    def format_number(value) -> str:
+        return "-" if value is None else f"{value:.1f}"
 
     def create_weight_chart(self):
         chart = QChart()
@@ -459,20 +437,25 @@ class HealthPage(QWidget):
 
     def update_chart(self):
         self.series.clear()
-        if not self.records:
+        self.weight_range = None
+        for rec in reversed(self.records):  # oldest to newest
+            self.append_chart_point(rec)
+
+    def append_chart_point(self, record: Dict[str, Any]):
+        """Tambah satu titik berat di ujung grafik dan sesuaikan sumbu."""
+        if record["weight"] is None:
             return
-        weights = []
-        for idx, rec in enumerate(reversed(self.records)):  # oldest to newest
-            w = float(rec["weight"])
-            self.series.append(idx, w)
-            weights.append(w)
-        if weights:
-            min_w = min(weights)
-            max_w = max(weights)
-            span = max(max_w - min_w, 5)
-            if self.axis_x and self.axis_y:
-                self.axis_x.setRange(0, len(weights) - 1)
-                self.axis_y.setRange(min_w - 1, min_w + span + 1)
+        w = float(record["weight"])
+        self.series.append(self.series.count(), w)
+        if self.weight_range is None:
+            self.weight_range = (w, w)
+        else:
+            self.weight_range = (min(self.weight_range[0], w), max(self.weight_range[1], w))
+        min_w, max_w = self.weight_range
+        span = max(max_w - min_w, 5)
+        if self.axis_x and self.axis_y:
+            self.axis_x.setRange(0, max(self.series.count() - 1, 1))
+            self.axis_y.setRange(min_w - 1, min_w + span + 1)
 
     def get_latest_values(self):
         """Return latest record dict or defaults if none."""
@@ -497,32 +480,22 @@ class HealthPage(QWidget):
             QMessageBox.warning(self, "Validasi", "Berat harus lebih dari 0.")
             return
 
-        conn = sqlite3.connect(self.db_path)
         try:
-            now_str = datetime.now().strftime("%Y-%m-%d %H:%M")
             note = self.notes.text().strip() or None
-            conn.execute(
-                """
-                INSERT INTO health_entries
-                (recorded_at, weight, systolic, diastolic, heart_rate, blood_sugar, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    now_str,
-                    weight,
-                    self.sys.value(),
-                    self.dia.value(),
-                    self.hr.value(),
-                    self.sugar.value(),
-                    note,
-                ),
+            record = self.repository.add_vitals(
+                weight=weight,
+                systolic=self.sys.value(),
+                diastolic=self.dia.value(),
+                heart_rate=self.hr.value(),
+                blood_sugar=self.sugar.value(),
+                notes=note,
             )
-            conn.commit()
-            self.load_data()
-            self.notes.clear()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Gagal menyimpan data: {e}")
-        finally:
-            conn.close()
-
+            return
 
+        # Tambahkan satu baris baru saja, tanpa memuat ulang semua data
+        self.records.insert(0, record)
+        self.insert_table_row(record)
+        self.append_chart_point(record)
+        self.notes.clear()
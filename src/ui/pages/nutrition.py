@@ -26,6 +26,8 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(src_path))
 
+from ui.components.food_completer import FoodCompleter
+
 
 class FoodCard(QFrame):
     """Card displaying a food entry"""
@@ -231,6 +233,8 @@ class AddFoodDialog(QDialog):
         
         self.food_input = QLineEdit()
         self.food_input.setPlaceholderText("e.g., Nasi Goreng")
+        self.food_completer = FoodCompleter(self.food_input)
+        self.food_completer.food_selected.connect(self.apply_catalog_food)
         layout.addWidget(self.food_input)
         
         # Nutrition info
@@ -320,6 +324,13 @@ class AddFoodDialog(QDialog):
         
         layout.addLayout(button_layout)
     
+    def apply_catalog_food(self, food):
+        """Fill nutrition from a suggested catalog food"""
+        self.calories_input.setValue(int(food["calories"]))
+        self.protein_input.setValue(food["protein"])
+        self.carbs_input.setValue(food["carbs"])
+        self.fat_input.setValue(food["fat"])
+    
     def get_food_data(self):
         """Get entered food data"""
         return {
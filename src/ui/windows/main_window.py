@@ -11,7 +11,9 @@ Description: Main application window with sidebar navigation and page management
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                               QStackedWidget, QPushButton, QLabel, QFrame)
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QAction
+
+from database.query_stats import set_query_context
 
 # Import pages with proper error handling
 try:
@@ -43,6 +45,13 @@ except ImportError as e:
     print(f"⚠️  Warning: Health page not available - {e}")
     HEALTH_AVAILABLE = False
 
+try:
+    from ui.pages.devices import DevicesPage
+    DEVICES_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  Warning: Devices page not available - {e}")
+    DEVICES_AVAILABLE = False
+
 try:
     from ui.pages.ai_assistant import AIAssistantPage
     AI_ASSISTANT_AVAILABLE = True
@@ -307,6 +316,22 @@ class MainWindow(QMainWindow):
         
         # Load all pages
         self.add_pages()
+        
+        # Menu bar
+        self.setup_menu()
+    
+    def setup_menu(self):
+        """Setup the File menu (data export/import)"""
+        file_menu = self.menuBar().addMenu("File")
+        
+        transfer_action = QAction("Export / Import Data…", self)
+        transfer_action.triggered.connect(self.open_data_transfer)
+        file_menu.addAction(transfer_action)
+    
+    def open_data_transfer(self):
+        """Open the export/import dialog"""
+        from ui.dialogs.data_transfer_dialog import DataTransferDialog
+        DataTransferDialog(self).exec()
     
     def add_pages(self):
         """
@@ -326,6 +351,7 @@ class MainWindow(QMainWindow):
         # Page 0: Dashboard
         if DASHBOARD_AVAILABLE:
             try:
+                set_query_context("Dashboard")
                 self.dashboard_page = DashboardPage()
                 self.content_stack.addWidget(self.dashboard_page)
                 print("✓ Dashboard page loaded")
@@ -338,6 +364,7 @@ class MainWindow(QMainWindow):
         # Page 1: Nutrition
         if NUTRITION_AVAILABLE:
             try:
+                set_query_context("Nutrition")
                 self.nutrition_page = NutritionPage()
                 self.content_stack.addWidget(self.nutrition_page)
                 print("✓ Nutrition page loaded")
@@ -350,6 +377,7 @@ class MainWindow(QMainWindow):
         # Page 2: Activity
         if ACTIVITY_AVAILABLE:
             try:
+                set_query_context("Activity")
                 self.activity_page = ActivityPage()
                 self.content_stack.addWidget(self.activity_page)
                 print("✓ Activity page loaded")
@@ -362,6 +390,7 @@ class MainWindow(QMainWindow):
         # Page 3: Health
         if HEALTH_AVAILABLE:
             try:
+                set_query_context("Health")
                 self.health_page = HealthPage()
                 self.content_stack.addWidget(self.health_page)
                 print("✓ Health page loaded")
@@ -375,7 +404,8 @@ class MainWindow(QMainWindow):
         placeholder_pages = [
             # Index 4: AI Assistant (if available)
             None,
-            "Devices",       # Smartwatch integration
+            # Index 5: Devices (if available)
+            None,
             "Reports",       # Health reports and analytics
             "Settings"       # App settings and preferences
         ]
@@ -383,6 +413,7 @@ class MainWindow(QMainWindow):
         # Page 4: AI Assistant
         if AI_ASSISTANT_AVAILABLE:
             try:
+                set_query_context("AI Assistant")
                 self.ai_page = AIAssistantPage()
                 self.content_stack.addWidget(self.ai_page)
                 print("✓ AI Assistant page loaded")
@@ -392,11 +423,26 @@ class MainWindow(QMainWindow):
         else:
             self.content_stack.addWidget(PlaceholderPage("AI Assistant"))
         
-        # Remaining placeholders (Devices, Reports, Settings)
-        for page_title in placeholder_pages[1:]:
+        # Page 5: Devices
+        if DEVICES_AVAILABLE:
+            try:
+                set_query_context("Devices")
+                self.devices_page = DevicesPage()
+                self.content_stack.addWidget(self.devices_page)
+                print("✓ Devices page loaded")
+            except Exception as e:
+                print(f"✗ Devices error: {e}")
+                self.content_stack.addWidget(PlaceholderPage("Devices"))
+        else:
+            self.content_stack.addWidget(PlaceholderPage("Devices"))
+        
+        # Remaining placeholders (Reports, Settings)
+        for page_title in placeholder_pages[2:]:
             page = PlaceholderPage(page_title)
             self.content_stack.addWidget(page)
         
+        set_query_context("Dashboard")  # default page
+        
         print("="*60)
         print(f"✓ {self.content_stack.count()} pages loaded successfully")
         print("="*60 + "\n")
@@ -423,10 +469,25 @@ class MainWindow(QMainWindow):
         
         if index < len(page_names):
             print(f"→ Navigating to: {page_names[index]}")
+            # Attribute DB statements to the visible page (query_stats)
+            set_query_context(page_names[index])
         
         # Simple page switch (stable and fast)
         self.content_stack.setCurrentIndex(index)
     
+    def closeEvent(self, event):
+        """
+        Return the pages' pooled database connections before quitting
+
+        Pages in the stack never get a closeEvent of their own, so each
+        page's repository is closed here.
+        """
+        for index in range(self.content_stack.count()):
+            repository = getattr(self.content_stack.widget(index), "repository", None)
+            if repository is not None:
+                repository.close()
+        super().closeEvent(event)
+
     def apply_styles(self):
         """Apply global application styles"""
         self.setStyleSheet("""
@@ -0,0 +1,57 @@
+"""
+Backup naming and restore
+File: tests/test_backup.py
+
+Run: python -m pytest tests -q
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database.backup import BackupPolicy, create_backup, list_backups, restore_backup  # noqa: E402
+
+
+def _database(path: Path, value: str) -> Path:
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS notes (value TEXT)")
+        conn.execute("DELETE FROM notes")
+        conn.execute("INSERT INTO notes VALUES (?)", (value,))
+    conn.close()
+    return path
+
+
+def _value(path: Path) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT value FROM notes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_backups_in_the_same_second_get_their_own_files(tmp_path):
+    database = _database(tmp_path / "health.db", "first")
+    policy = BackupPolicy(directory=tmp_path / "backups", step_sleep_seconds=0)
+
+    backups = [create_backup(policy, database) for _ in range(3)]
+
+    assert len({backup.path for backup in backups}) == 3
+    assert [b.path for b in list_backups(policy, database)] == [b.path for b in reversed(backups)]
+    assert not list(policy.backup_dir().glob("*.partial"))
+
+
+def test_restore_right_after_backup(tmp_path):
+    database = _database(tmp_path / "health.db", "backed up")
+    policy = BackupPolicy(directory=tmp_path / "backups", step_sleep_seconds=0)
+    backup = create_backup(policy, database)
+    _database(database, "changed")
+
+    safety = restore_backup(backup.path, database, policy)
+
+    assert safety.path != backup.path
+    assert _value(backup.path) == "backed up"
+    assert _value(safety.path) == "changed"
+    assert _value(database) == "backed up"
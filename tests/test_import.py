@@ -0,0 +1,71 @@
+"""
+Importing an export into a database that already has data
+File: tests/test_import.py
+
+Run: python -m pytest tests -q
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database import connection  # noqa: E402
+from database.export import export_data, import_data  # noqa: E402
+
+
+def _execute(sql, **params):
+    with connection.engine.begin() as conn:
+        result = conn.execute(text(sql), params)
+        return result.all() if result.returns_rows else None
+
+
+def _add_user(name, records):
+    _execute("INSERT INTO users (full_name, username) VALUES (:name, :name)", name=name)
+    user_id = _execute("SELECT id FROM users WHERE username = :name", name=name)[0][0]
+    for day in range(1, records + 1):
+        _execute("INSERT INTO health_records (user_id, recorded_at, steps) "
+                 "VALUES (:user_id, :recorded_at, 1000)",
+                 user_id=user_id, recorded_at=f"2024-01-{day:02d} 10:00:00.000000")
+
+
+@pytest.fixture
+def export(tmp_path):
+    connection.init_database(f"sqlite:///{tmp_path / 'source.db'}")
+    _add_user("alice", 3)
+    export_data(tmp_path / "export")
+    connection.engine.dispose()
+    connection.init_database(f"sqlite:///{tmp_path / 'target.db'}")
+    _add_user("bob", 2)
+    yield tmp_path / "export"
+    connection.engine.dispose()
+
+
+def _records_per_user():
+    return dict(_execute("SELECT u.username, COUNT(*) FROM health_records h "
+                         "JOIN users u ON u.id = h.user_id GROUP BY u.username"))
+
+
+def test_import_refuses_a_database_with_data(export):
+    with pytest.raises(ValueError, match="already has data"):
+        import_data(export)
+    assert _records_per_user() == {"bob": 2}
+
+
+def test_resume_needs_the_exported_users(export):
+    with pytest.raises(ValueError, match="not in the database"):
+        import_data(export, mode="resume")
+
+
+def test_merge_adds_the_export_as_new_users(export):
+    result = import_data(export, mode="merge")
+
+    assert result.skipped == 0
+    assert _records_per_user() == {"alice": 3, "bob": 2}
+    # Merging the same export again would duplicate alice; nothing is written
+    with pytest.raises(ValueError, match="UNIQUE"):
+        import_data(export, mode="merge")
+    assert _records_per_user() == {"alice": 3, "bob": 2}